@@ -4,7 +4,8 @@ import attr
 import random
 import ipaddress
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from Common.BitMatrix.BitMatrix import BitMatrix
 
 
 @attr.s
@@ -16,13 +17,13 @@ class AbstractHelper:
     _intervals = {0: [0, 12], 1: [12, 32], 2: [32, 48], 3: [48, 64], 4: [64, 65]}
 
     # Helper structure which contains a number of prefixes on organisation levels for trie traversal generating process
-    distribution_plan = [
+    distribution_plan = attr.ib(factory=lambda: [
         {'interval': [0, 12], 'generated_info': {}},
         {'interval': [12, 32], 'generated_info': {}},
         {'interval': [32, 48], 'generated_info': {}},
         {'interval': [48, 64], 'generated_info': {}},
         {'interval': [64, 65], 'generated_info': {}}
-    ]
+    ], type=List[Dict])
 
     def create_distributing_plan(self) -> None:
         """Abstract method which should be implemented by subclasses.
@@ -60,64 +61,39 @@ class AbstractHelper:
         return statistic
 
     @staticmethod
-    def generate_new_bits(current_prefix_depth: int, new_prefix_depth: int) -> str:
+    def generate_new_bits(current_prefix_depth: int, new_prefix_depth: int, rng=random) -> int:
         """Generate new random bits for current prefix.
 
         :param current_prefix_depth: integer; current prefix len in trie
         :param new_prefix_depth: integer; new prefix len which is needed
-        :return: string; new generated bits (0 and 1) in string form
+        :param rng: random generator; random module or Common.Random.RandomStream object
+        :return: integer; new generated bits. Value contains new_prefix_depth - current_prefix_depth bits
         """
-        generate_num = new_prefix_depth - current_prefix_depth
-
-        generated_sequence = random.getrandbits(generate_num)
-
-        binary_rep = ("{0:b}".format(generated_sequence))
-
-        if len(binary_rep) < generate_num:
-            additional_bits = generate_num - len(binary_rep)
-
-            for i in range(additional_bits):
-                binary_rep = '0' + binary_rep
-
-        return binary_rep
+        return rng.getrandbits(new_prefix_depth - current_prefix_depth)
 
     @staticmethod
-    def get_binary_prefix(prefix_string: str) -> str:
-        """Convert hexadecimal prefix representation to binary representation.
+    def get_prefix_value(prefix_string: str) -> Tuple[int, int]:
+        """Convert hexadecimal prefix representation to integer representation.
 
         :param prefix_string: string; string contains hexadecimal representation of prefix
-        :return: string; binary representation of current prefix without additional 0 at the end
+        :return: tuple; integer value of first prefix_len bits of the address and prefix len
         """
-        parsed_address = {'prefix': prefix_string[:prefix_string.find('/')],
-                          'length': int(prefix_string[prefix_string.find('/') + 1:])}
+        address, prefix_len = prefix_string.split('/')
+        prefix_len = int(prefix_len)
 
-        hex_prefix = ipaddress.IPv6Address(parsed_address['prefix'])
+        hex_prefix = ipaddress.IPv6Address(address)
 
-        binary_prefix = "".join(format(x, '08b') for x in bytearray(hex_prefix.packed))
-
-        return binary_prefix[:parsed_address['length']]
+        return int(hex_prefix) >> (ipaddress.IPV6LENGTH - prefix_len), prefix_len
 
     @staticmethod
     def get_bit_position(bit_value: str, prefixes: List) -> Dict:
         """
         Additional method which was used for analysis of bit distribution. This statistic wasn't used in final version
-        of paper. However using this method is possible to get this statistic and analyze how generating algorithm works
+        of paper. However using this method is possible to get this statistic and analyze how generating algorithm works.
+        Bits are counted by Common.BitMatrix.BitMatrix
         :param bit_value: bit value for analyse
-        :param prefixes: prefixes dataset for analyze
+        :param prefixes: prefixes dataset for analyze; list of (prefix value, prefix len) tuples
         :return: dictionary contains how often (in %) bit could be found on particular position. Based on input dataset
         """
-        result = {key: 0 for key in range(0, 64)}
-
-        for prefix in prefixes:
-            positions = [pos for pos, char in enumerate(prefix) if char == bit_value]
-            for position in positions:
-                result[position] += 1
-
-        convert_to_percent = {key: 0 for key in range(0, 64)}
-
-        for i in range(len(convert_to_percent)):
-            number_of_prefixes = result[i]
-            convert_to_percent[i] = number_of_prefixes / len(prefixes) * 100
-
-        return convert_to_percent
+        return dict(enumerate(BitMatrix.create(prefixes).get_position_frequency(int(bit_value)).tolist()))
 
@@ -1,15 +1,23 @@
 # was developed by Utkin Kirill
 
 import attr
+import copy
+import random
 
-from typing import List, Dict, Optional
+from array import array
+from bisect import bisect_left, insort
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 from Common.Trie.Node.Node import Node
-from Common.Exceptions.Exceptions import MaximumLevelException
+from Common.Trie.Compact.CompactNode import CompactNode
+from Common.Trie.Compact.NodeStorage import NodeStorage
+from Common.Trie.Compact.Snapshot import Snapshot
+from Common.Exceptions.Exceptions import MaximumLevelException, NoFreePrefixException, PrefixAlreadyExists
+from Common.Metrics.Metrics import Metrics
 
 
 @attr.s
 class AbstractTrie:
-    root_node = attr.ib(default=Node(None, 0), type=Node)
+    root_node = attr.ib(factory=lambda: Node(None, 0), type=Node)
     max_possible_level = attr.ib(default=7, type=int)
 
     _max_trie_level = attr.ib(default=0, type=int)
@@ -17,6 +25,30 @@ class AbstractTrie:
     _trie_depth = attr.ib(default=0, type=int)
     _prefix_leaf_nodes = attr.ib(factory=dict, type=dict)
     _prefix_nodes = attr.ib(factory=dict, type=dict)
+    # number of prefix nodes by level. Is updated together with levels of prefix nodes
+    _level_nodes = attr.ib(factory=dict, type=dict)
+
+    # Save nodes in parallel arrays (NodeStorage) instead of separate Node objects
+    compact = attr.ib(default=False, type=bool)
+    _storage = attr.ib(default=None, type=Optional[NodeStorage])
+
+    # Create one node per edge (path compressed trie) instead of one node per bit
+    path_compression = attr.ib(default=False, type=bool)
+
+    # random generator which is used for generating new prefixes: random module or Common.Random.RandomStream
+    rng = attr.ib(default=random)
+
+    # counters of allocated nodes and failed attempts to add prefix. Generator sets own metrics object
+    metrics = attr.ib(factory=Metrics, type=Metrics)
+
+    # sorted values of prefix nodes by prefix len. Is created on the first use and updated by insert_node
+    _occupied_prefixes = attr.ib(default=None, type=Optional[Dict[int, List[int]]])
+
+    def __attrs_post_init__(self) -> None:
+        if self.compact:
+            # edge of path compressed trie could contain up to 64 bits
+            self._storage = NodeStorage(value=array('Q')) if self.path_compression else NodeStorage()
+            self.root_node = self._storage.root
 
     @property
     def trie_level(self) -> int:
@@ -44,299 +76,987 @@ class AbstractTrie:
     def full_prefix_nodes(self) -> Dict:
         return self._prefix_nodes
 
-    def add_node(self, node_value: str, parent_node: Optional[Node] = None, creating_phase: bool = True) -> Node:
-        raise NotImplementedError
+    @property
+    def prefix_leaf_nodes(self) -> Dict:
+        """Return number of leaf nodes by depth.
+        Automatically updated when nodes are added to or deleted from trie.
 
-    def generate_prefixes(self, node: Node) -> None:
+        :return: dictionary; dict in format {depth: num. leaf nodes}
+        """
+        return self._prefix_leaf_nodes
+
+    @property
+    def level_nodes(self) -> Dict:
+        """Return number of prefix nodes by level.
+        Automatically updated when prefix nodes are added or their levels are recalculated.
+
+        :return: dictionary; dict in format {level: num. prefix nodes}
+        """
+        return {key: value for key, value in sorted(self._level_nodes.items()) if value > 0}
+
+    @property
+    def storage(self) -> Optional[NodeStorage]:
+        return self._storage
+
+    def add_node(self, node_value: int, node_len: int, parent_node: Optional[Node] = None,
+                 creating_phase: bool = True) -> Node:
         raise NotImplementedError
 
-    def get_depths(self, level) -> List:
-        return [key for key in self._prefix_leaf_nodes.keys() if key < level]
+    def register_prefix(self, node: Node, creating_phase: bool = True) -> None:
+        """Update generator specific information about new prefix node. Is called for every added prefix node.
 
-    def calculate_level(self, node: Node) -> None:
+        :param node: new prefix node
+        :param creating_phase: boolean; signalize phase of generator when node is added while binary trie is
+                               initializing
+        :return: None
         """
-        Recalculate level of prefix node if it is needed
-        :param node: pointer to the prefix node object which was added to binary trie
-        :raises MaximumLevelException: indicate if new added node has a level greater than maximum possible level
+        raise NotImplementedError
+
+    def bulk_load(self, prefixes: List[Tuple[int, int]]) -> None:
+        """Construct binary trie from seed prefixes.
+
+        Trie structure is created first, prefixes are walked in address order, so every node is created from the path
+        to the previous prefix. Levels, maximum child levels, prefix parent links and leaf nodes are computed after that
+        by one post-order sweep, so every node is processed just once. Level of prefix node is the height of this node
+        in the tree of prefix nodes, which is the same value as if seed prefixes sorted by length were added one by one.
+        Prefixes are added one by one by add_node if trie isn't empty.
+
+        :raises MaximumLevelException in case if level of some prefix node is greater than max possible value
+
+        :param prefixes: list; unique (prefix value, prefix len) tuples sorted by length and value. Prefix nodes are
+                         registered in the same order
         :return: None
         """
-        full_path = AbstractTrie.get_just_prefix_path(node)
-        new_level = 0
+        root_node = self.root_node
 
-        if node.left_child or node.right_child:
-            node_level = self.get_maximum_child_level(node)
+        if root_node.left_child or root_node.right_child or root_node.prefix_flag:
+            for prefix in prefixes:
+                self.add_node(*prefix)
 
-            if node_level + 1 > self.max_possible_level:
-                raise MaximumLevelException
+            return
 
-            new_level = node_level + 1
+        prefix_nodes = [None] * len(prefixes)
 
-        if not self.is_possible_recalculate_parent_level(full_path, new_level):
-            raise MaximumLevelException
+        # prefix flags are set directly, occupied prefixes are collected again on the next use
+        self._occupied_prefixes = None
 
-        if node.left_child or node.right_child:
-            node.level = new_level + 1
+        # leaf nodes are counted by the sweep
+        for depth in self._prefix_leaf_nodes:
+            self._prefix_leaf_nodes[depth] = 0
 
-        if self.is_recalculate_level(prefix_path=full_path, new_level=new_level):
-            self.recalculate_level(full_path, new_level)
+        # prefixes are added in address order, so just the path to the previous prefix has to be kept. New prefix
+        # shares with previous prefix nodes up to the length of their common part
+        address_order = sorted(range(len(prefixes)), key=lambda index: AbstractTrie.get_address_key(prefixes[index]))
+        current_path = [root_node]
+        previous_value, previous_len = 0, 0
 
-        if node.level > self.trie_level:
-            self._max_trie_level = node.level
+        for index in address_order:
+            node_value, node_len = prefixes[index]
+
+            common_len = AbstractTrie.get_prefixes_common_len(node_value, node_len, previous_value, previous_len)
 
-    def is_possible_recalculate_parent_level(self, parents_nodes: List[Node], new_level_value) -> bool:
-        """Check if parent nodes level could be recalculated and new prefix could be added.
-        :param parents_nodes: list of parent nodes
-        :param new_level_value: level of child node
-        :return: True in case that new level is possible, False otherwise
+            while current_path[-1].depth > common_len:
+                current_path.pop()
+
+            start_node = current_path[-1]
+            remaining_len = node_len - start_node.depth
+
+            node = self.create_path(start_node, node_value & ((1 << remaining_len) - 1), remaining_len)
+
+            path_end = len(current_path)
+            path_node = node
+
+            while path_node.depth > start_node.depth:
+                current_path.insert(path_end, path_node)
+                path_node = path_node.path
+
+            previous_value, previous_len = node_value, node_len
+
+            if not node.prefix_flag:
+                node.prefix_flag = True
+                prefix_nodes[index] = node
+
+        if self._storage is not None:
+            max_level = self._storage.sweep_levels(self._prefix_leaf_nodes)
+
+            if max_level > self.max_possible_level:
+                raise MaximumLevelException
+
+            self._max_trie_level = max(self._max_trie_level, max_level)
+
+        else:
+            self._sweep_levels()
+
+        for node in prefix_nodes:
+            if node is not None:
+                self._level_nodes[node.level] = self._level_nodes.get(node.level, 0) + 1
+                self.register_prefix(node)
+
+    def _sweep_levels(self) -> None:
+        """Compute levels, maximum child levels and prefix parent links of all nodes after bulk construction.
+
+        :raises MaximumLevelException in case if level of some prefix node is greater than max possible value
+        :return: None
         """
-        for counter in range(len(parents_nodes)):
+        # pre-order walk, nearest parent prefix node is passed down to every node
+        sweep_order = list()
+        node_stack = [(self.root_node, None)]
+
+        while node_stack:
+            node, prefix_parent = node_stack.pop()
+            sweep_order.append(node)
+
+            if node.prefix_flag:
+                node.prefix_parent = prefix_parent
+                prefix_parent = node
+
+            for child in (node.right_child, node.left_child):
+                if child is not None:
+                    node_stack.append((child, prefix_parent))
 
-            if parents_nodes[counter].level < new_level_value + counter + 1:
-                if new_level_value + counter + 1 > self.max_possible_level:
-                    return False
+        # post-order sweep, all children are processed before the parent node
+        for node in reversed(sweep_order):
+            left_child = node.left_child
+            right_child = node.right_child
+            max_child_level = -1
 
-        return True
+            if left_child is None and right_child is None:
+                self._prefix_leaf_nodes[node.depth] += 1
 
-    def is_recalculate_level(self, prefix_path: List[Node], new_level) -> bool:
-        """Check if recalculation process is required.
+            for child in (left_child, right_child):
+                if child is not None:
+                    child_level = child.level if child.prefix_flag else child.max_child_level
 
-        :param prefix_path: list with all parent prefix nodes
-        :param new_level: new value of level
-        :return: true is case if recalculating is required, false otherwise
+                    if child_level > max_child_level:
+                        max_child_level = child_level
+
+            node.max_child_level = max_child_level
+
+            if node.prefix_flag:
+                node.level = max_child_level + 1
+
+                if node.level > self.max_possible_level:
+                    raise MaximumLevelException
+
+                if node.level > self._max_trie_level:
+                    self._max_trie_level = node.level
+
+    def restore_prefix(self, node: Node) -> None:
+        """Restore generator specific information about seed prefix node which was loaded from snapshot. Depth
+        distribution of prefix nodes and trie depth are saved in snapshot, so they aren't updated.
+
+        :param node: seed prefix node
+        :return: None
         """
-        for counter in range(len(prefix_path)):
-            if prefix_path[counter].level < counter + new_level + 1:
-                    return True
+        pass
+
+    def save_snapshot(self, path: str, prefixes: List[Tuple[int, int]]) -> None:
+        """Save constructed seed trie to the snapshot file. Used just for compact trie.
 
-        return False
+        :raises ValueError in case if trie isn't compact
 
-    def recalculate_level(self, prefix_path, new_level) -> None:
+        :param path: string; path to the snapshot file
+        :param prefixes: list; seed prefixes which were used for bulk_load, in the same order
+        :return: None
         """
-        Provide algorithm for recalculating level of nodes in path for selected node
-        :param prefix_path: path that contains all prefix nodes
-        :param new_level: level value of inserted node
-        :raises MaximumLevelException in case if recalculating isn't possible. This is just a additional check
+        if self._storage is None:
+            raise ValueError("Snapshot could be created just for compact trie")
+
+        prefix_order = array('i', (AbstractTrie.find_node(self.root_node, *prefix).index for prefix in prefixes))
+
+        Snapshot(
+            storage=self._storage,
+            path_compression=self.path_compression,
+            trie_level=self._max_trie_level,
+            trie_depth=self._trie_depth,
+            prefix_nodes=self._prefix_nodes,
+            leaf_nodes=self._prefix_leaf_nodes,
+            prefix_order=prefix_order
+        ).save(path)
+
+    def load_snapshot(self, path: str, memory_map: bool = False) -> None:
+        """Replace trie by seed trie from the snapshot file. Used just for compact trie.
+
+        :raises ValueError in case if trie isn't compact or snapshot contains other type of trie
+
+        :param path: string; path to the snapshot file
+        :param memory_map: boolean; use seed nodes directly from the file mapped to memory. Changes and new nodes are
+                           saved just in memory of current process
         :return: None
         """
-        for counter in range(len(prefix_path)):
+        if self._storage is None:
+            raise ValueError("Snapshot could be loaded just to compact trie")
+
+        snapshot = Snapshot.load(path, memory_map)
+
+        if snapshot.path_compression != self.path_compression:
+            raise ValueError(f"Snapshot {path} contains other type of trie")
+
+        self._storage = snapshot.storage
+        self._occupied_prefixes = None
+        self.root_node = self._storage.root
+        self._max_trie_level = snapshot.trie_level
+        self._trie_depth = snapshot.trie_depth
+        self._prefix_nodes.update(snapshot.prefix_nodes)
+        self._prefix_leaf_nodes.update(snapshot.leaf_nodes)
+        self._level_nodes = dict()
+
+        for index in snapshot.prefix_order:
+            node = self._storage.node(index)
+            self._level_nodes[node.level] = self._level_nodes.get(node.level, 0) + 1
+            self.restore_prefix(node)
+
+    def clone(self) -> 'AbstractTrie':
+        """Create independent copy of the trie, so prefixes could be generated several times from one constructed seed
+        trie in one process. Storage arrays of compact trie are copied at once, nodes of other tries are copied one by
+        one.
+
+        :return: trie object of the same class
+        """
+        trie = copy.copy(self)
+        trie._generated_prefixes = list(self._generated_prefixes)
+        trie._prefix_leaf_nodes = dict(self._prefix_leaf_nodes)
+        trie._prefix_nodes = dict(self._prefix_nodes)
+        trie._level_nodes = dict(self._level_nodes)
 
-            if prefix_path[counter].level < new_level + counter + 1:
-                prefix_path[counter].level = new_level + counter + 1
+        if self._occupied_prefixes is not None:
+            trie._occupied_prefixes = {prefix_len: list(values) for prefix_len, values in self._occupied_prefixes.items()}
+
+        if self._storage is not None:
+            trie._storage = self._storage.copy()
+            trie.root_node = trie._storage.root
+
+            self.copy_state(trie, lambda node: trie._storage.node(node.index))
+
+        else:
+            copied_nodes = AbstractTrie.copy_nodes(self.root_node)
+            trie.root_node = copied_nodes[id(self.root_node)]
+
+            self.copy_state(trie, lambda node: copied_nodes[id(node)])
 
-            if prefix_path[counter].level > self.trie_level:
-                self._max_trie_level = prefix_path[counter].level
+        return trie
+
+    def copy_state(self, trie: 'AbstractTrie', get_copied_node: Callable[[Node], Node]) -> None:
+        """Copy generator specific information to the clone of this trie.
+
+        :param trie: clone of this trie
+        :param get_copied_node: function which returns node of :param trie for node of this trie
+        :return: None
+        """
+        pass
 
     @staticmethod
-    def get_just_prefix_path(node: Node) -> List[Node]:
-        """Return full prefix nodes path for :param Node current node.
+    def copy_nodes(root_node: Node) -> Dict[int, Node]:
+        """Copy all nodes of the trie. Parent nodes are copied before child nodes, so all links are set to copied nodes.
 
-        Method is used for creating prefix path for current :param node. Result list contains all previous prefix nodes.
-        Result list could be used for change levels all of this nodes
-        :param node: Node; node object from binary trie
-        :param include_current: boolean; Signalize if current node will be added to full prefix nodes path.
-        :return: list; list with all previous (and current if include flag is set as True) prefix nodes for :param node
+        :param root_node: root node of the trie
+        :return: dictionary; id of original node: copied node
         """
-        full_path = list()
-        current_node = node
+        copied_nodes = dict()
+        node_stack = [root_node]
 
-        while current_node.path:
+        while node_stack:
+            node = node_stack.pop()
+            copied_node = copy.copy(node)
+            copied_nodes[id(node)] = copied_node
 
-            if current_node.prefix_flag:
-                full_path.append(current_node)
+            if node.path is not None:
+                copied_node.path = copied_nodes[id(node.path)]
 
-            current_node = current_node.path
+                if node.path.left_child is node:
+                    copied_node.path.left_child = copied_node
+                else:
+                    copied_node.path.right_child = copied_node
 
-        return full_path
+            if node.prefix_parent is not None:
+                copied_node.prefix_parent = copied_nodes[id(node.prefix_parent)]
 
-    @staticmethod
-    def get_path_to_previous_prefix(node: Node) -> List[Node]:
+            for child in (node.right_child, node.left_child):
+                if child is not None:
+                    node_stack.append(child)
+
+        return copied_nodes
+
+    def merge_nodes(self, start: int, new_nodes: Dict, indexes, changed_nodes: Dict, prefix_nodes: Dict,
+                    trie_depth: int, trie_level: int) -> None:
+        """Merge nodes which were generated by other copy of this trie (e.g. in worker process). Used just for compact
+        trie. See NodeStorage.merge_nodes.
+
+        :raises ValueError in case if trie isn't compact
+
+        :param start: int; index of the first new node in other trie
+        :param new_nodes: dictionary; storage array name: values of new nodes
+        :param indexes: numpy array; indexes of nodes which were changed in other trie
+        :param changed_nodes: dictionary; storage array name: values of changed nodes
+        :param prefix_nodes: dictionary; number of new prefix nodes by depth
+        :param trie_depth: int; depth of other trie
+        :param trie_level: int; level of other trie
+        :return: None
         """
-        Get all nodes before the inserted node :param node
-        :param node: last node in the path
-        :return: list of all nodes in the path from the :param node
+        if self._storage is None:
+            raise ValueError("Nodes could be merged just to compact trie")
+
+        self._storage.merge_nodes(start, new_nodes, indexes, changed_nodes)
+
+        # prefixes are added directly to storage, occupied prefixes are collected again on the next use
+        self._occupied_prefixes = None
+
+        for depth, nodes_num in prefix_nodes.items():
+            self._prefix_nodes[depth] = self._prefix_nodes.get(depth, 0) + nodes_num
+
+        self._trie_depth = max(self._trie_depth, trie_depth)
+        self._max_trie_level = max(self._max_trie_level, trie_level)
+
+    def count_nodes(self) -> None:
+        """Count leaf nodes by depth and prefix nodes by level again, e.g. after nodes were changed directly in node
+        storage. Arrays of compact trie are counted at once, other tries are traversed.
+
+        :return: None
         """
-        full_path = list()
-        current_node = node
+        for depth in self._prefix_leaf_nodes:
+            self._prefix_leaf_nodes[depth] = 0
 
-        while current_node.path:
-            full_path.append(current_node)
-            current_node = current_node.path
+        self._level_nodes = dict()
 
-            if current_node.prefix_flag:
-                full_path.append(current_node)
+        if self._storage is not None:
+            self._storage.count_nodes(self._prefix_leaf_nodes, self._level_nodes)
+            return
+
+        node_stack = [self.root_node]
+
+        while node_stack:
+            node = node_stack.pop()
+
+            if not node.left_child and not node.right_child:
+                self._prefix_leaf_nodes[node.depth] += 1
+
+            if node.prefix_flag:
+                self._level_nodes[node.level] = self._level_nodes.get(node.level, 0) + 1
+
+            for child in (node.right_child, node.left_child):
+                if child is not None:
+                    node_stack.append(child)
+
+    def create_node(self, node_value: int, parent_node: Node, node_len: int = 1) -> Node:
+        """Create new child node for :param parent_node. Node is created in node storage if trie is compact.
+
+        :param node_value: integer; bits of the edge between parent node and new node
+        :param parent_node: parent node for new node
+        :param node_len: integer; number of bits in :param node_value. Always 1 if trie isn't path compressed
+        :return: constructed node object
+        """
+        self.metrics.nodes_allocated += 1
+
+        if self._storage is not None:
+            index = self._storage.allocate(node_value, parent_node.depth + node_len, parent_node.index)
+
+            return self._storage.node(index)
+
+        new_node = Node(node_value, parent_node.depth + node_len)
+        new_node.path = parent_node
+
+        return new_node
+
+    def insert_node(self, node_value: int, node_len: int, parent_node: Optional[Node] = None,
+                    creating_phase: bool = True) -> Node:
+        """Find or create node for new prefix, recalculate levels of prefix nodes and mark node as prefix node.
+
+        Path is walked just once. Existence of the prefix and new levels are checked before any node is created, so
+        nothing has to be removed from the trie if prefix can't be added.
+
+        :raises  PrefixAlreadyExists in case if new node already exists in binary trie. Method isn't called in
+                    creating phase
+        :raises  MaximumLevelException in case if after adding a new node to binary trie level changes and greater
+                    than max possible value. Trie isn't changed
+
+        :param node_value: integer; integer representation of node
+        :param node_len: integer; number of bits in :param node_value
+        :param parent_node None or Node; node object which represent the parent for added node
+        :param creating_phase boolean; signalize phase of generator when node is added while binary trie is initializing
+        :return: node object for new prefix
+        """
+        if not parent_node:
+            current_node = self.root_node
+        else:
+            current_node = parent_node
+
+        if current_node.prefix_flag and current_node.path is not None:
+            prefix_parent = current_node
+        else:
+            prefix_parent = AbstractTrie.get_prefix_parent(current_node)
+
+        # walk existing part of the path
+        child = None
+
+        while node_len > 0:
+            bit = (node_value >> (node_len - 1)) & 1
+            child = current_node.right_child if bit else current_node.left_child
+
+            if child is None:
                 break
 
-        return full_path
+            edge_len = child.depth - current_node.depth
 
-    def get_maximum_child_level(self, root: Node) -> Optional[int]:
-        """Get maximum level of all child prefix nodes.
+            if edge_len > node_len or (node_value >> (node_len - edge_len)) != child.node_value:
+                break
 
-        :param root: node which contain child nodes
-        :return: value of maximum level
+            current_node = child
+            node_len -= edge_len
+            node_value &= (1 << node_len) - 1
+
+            if node_len and current_node.prefix_flag:
+                prefix_parent = current_node
+
+        prefix_path = AbstractTrie.get_just_prefix_path(prefix_parent) if prefix_parent else list()
+
+        if node_len == 0:
+            # node already exists in the trie
+            if not creating_phase and current_node.prefix_flag:
+                raise PrefixAlreadyExists
+
+            child_level = self.get_maximum_child_level(current_node)
+
+        elif child is not None and AbstractTrie.get_common_len(child, current_node, node_value, node_len) == node_len:
+            # new node splits an edge of path compressed trie, child of the edge will be the child of new node
+            child_level = child.level if child.prefix_flag else child.max_child_level
+
+        else:
+            child_level = None
+
+        self.get_new_level(child_level, prefix_path)
+
+        if node_len:
+            if current_node.left_child is None and current_node.right_child is None:
+                self._prefix_leaf_nodes[current_node.depth] -= 1
+
+            current_node = self.create_path(current_node, node_value, node_len)
+
+            if current_node.left_child is None and current_node.right_child is None:
+                self._prefix_leaf_nodes[current_node.depth] = self._prefix_leaf_nodes.get(current_node.depth, 0) + 1
+
+        if current_node.prefix_flag:
+            self._level_nodes[current_node.level] -= 1
+
+        self.calculate_level(current_node, prefix_path)
+        self._level_nodes[current_node.level] = self._level_nodes.get(current_node.level, 0) + 1
+
+        if self._occupied_prefixes is not None and not current_node.prefix_flag:
+            self.add_occupied_prefix(current_node)
+
+        current_node.prefix_flag = True
+        current_node.prefix_parent = prefix_parent
+
+        if current_node.left_child or current_node.right_child:
+            AbstractTrie.update_prefix_parent(current_node)
+
+        return current_node
+
+    def get_occupied_prefixes(self, prefix_len: int) -> List[int]:
+        """Return sorted values of all prefix nodes with :param prefix_len. Values of all prefix nodes are collected by
+        one traversal on the first call, after that they are updated by insert_node.
+
+        :param prefix_len: int; prefix len
+        :return: list; sorted prefix values
         """
-        if not root:
-            return
+        if self._occupied_prefixes is None:
+            self._occupied_prefixes = dict()
+
+            for node_value, node_len in AbstractTrie.iterate_prefixes(self.root_node):
+                if node_len or self.root_node.prefix_flag:
+                    self._occupied_prefixes.setdefault(node_len, list()).append(node_value)
+
+        return self._occupied_prefixes.setdefault(prefix_len, list())
+
+    def add_occupied_prefix(self, node: Node) -> None:
+        """Add new prefix node to the sorted values of prefix nodes.
+
+        :param node: node which becomes prefix node
+        :return: None
+        """
+        path = list()
+
+        while node is not None:
+            path.append(node)
+            node = node.path
 
-        selected_root = True
+        node_value, node_len = AbstractTrie.construct_prefix(reversed(path))
 
-        nodeStack = []
-        nodeStack.append(root)
-        first_childs = list()
+        insort(self._occupied_prefixes.setdefault(node_len, list()), node_value)
 
-        while nodeStack:
+    def sample_free_prefix(self, prefix_value: int, prefix_len: int, new_len: int, rng=random) -> int:
+        """Select uniformly random prefix with :param new_len under prefix (:param prefix_value, :param prefix_len)
+        which isn't a prefix node yet. Random bits are used directly if they give free prefix (same as
+        generate_new_bits), otherwise random free prefix is found by binary search in occupied prefixes, so prefix is
+        selected without repeating.
 
-            node = nodeStack.pop()
+        :raises NoFreePrefixException in case if all prefixes with :param new_len already exist
+
+        :param prefix_value: int; value of the prefix under which new prefix is selected
+        :param prefix_len: int; len of the prefix under which new prefix is selected
+        :param new_len: int; len of new prefix
+        :param rng: random generator; random module or Common.Random.RandomStream object
+        :return: int; value of new prefix
+        """
+        start = prefix_value << (new_len - prefix_len)
+        end = start + (1 << (new_len - prefix_len))
 
-            if not selected_root and node.prefix_flag:
-                first_childs.append(node)
+        occupied = self.get_occupied_prefixes(new_len)
+        first = bisect_left(occupied, start)
+        last = bisect_left(occupied, end, first)
+        free_num = end - start - (last - first)
 
-            if not node.prefix_flag or selected_root:
-                selected_root = False
+        if not free_num:
+            raise NoFreePrefixException
 
-                if node.right_child is not None:
-                    nodeStack.append(node.right_child)
+        new_value = start | rng.getrandbits(new_len - prefix_len)
+        index = bisect_left(occupied, new_value, first, last)
 
-                if node.left_child is not None:
-                    nodeStack.append(node.left_child)
+        if index == last or occupied[index] != new_value:
+            return new_value
 
-        max_child_level = max(node.level for node in first_childs)
-        return max_child_level
+        # k-th free prefix is placed after all occupied prefixes which have at most k free prefixes before them
+        free_index = rng.randint(0, free_num - 1)
+        low, high = first, last
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if occupied[middle] - start - (middle - first) <= free_index:
+                low = middle + 1
+            else:
+                high = middle
+
+        return start + free_index + low - first
+
+    def create_path(self, current_node: Node, node_value: int, node_len: int) -> Node:
+        """Find or create node for :param node_value under :param current_node. Levels and prefix flags aren't changed.
+
+        :param current_node: node which is used as start point
+        :param node_value: integer; integer representation of node
+        :param node_len: integer; number of bits in :param node_value
+        :return: node object for :param node_value
+        """
+        if self.path_compression:
+            return self._insert_compressed(current_node, node_value, node_len)
+
+        for shift in range(node_len - 1, -1, -1):
+            bit = (node_value >> shift) & 1
+            child = current_node.right_child if bit else current_node.left_child
+
+            if child is None:
+                child = self.create_node(bit, current_node)
+                AbstractTrie.set_child(current_node, child, bit)
+
+            current_node = child
+
+        return current_node
 
     @staticmethod
-    def construct_binary_representation(nodes) -> str:
-        """Construct binary representation of prefix using saved nodes.
+    def get_common_len(child: Node, parent_node: Node, node_value: int, node_len: int) -> int:
+        """Get number of same bits on the edge between :param parent_node and :param child and in :param node_value.
+
+        :param child: child node of :param parent_node
+        :param parent_node: node where the edge starts
+        :param node_value: integer; bits which are compared with edge bits
+        :param node_len: integer; number of bits in :param node_value
+        :return: integer; number of same first bits
+        """
+        edge_len = child.depth - parent_node.depth
 
-        :param nodes: list of nodes that represents the path from root node to prefix node
-        :param nodes: list of nodes that represents the path from root node to prefix node
-        :return: string which represents binary representation of prefix in trie
+        return AbstractTrie.get_prefixes_common_len(child.node_value, edge_len, node_value, node_len)
+
+    @staticmethod
+    def get_prefixes_common_len(first_value: int, first_len: int, second_value: int, second_len: int) -> int:
+        """Get number of same first bits of two prefixes.
+
+        :param first_value: integer; value of the first prefix
+        :param first_len: integer; number of bits in :param first_value
+        :param second_value: integer; value of the second prefix
+        :param second_len: integer; number of bits in :param second_value
+        :return: integer; length of the common part of prefixes
         """
-        return ''.join([node.node_value for node in nodes if node.node_value])
+        compared_len = min(first_len, second_len)
+        different_bits = (first_value >> (first_len - compared_len)) ^ (second_value >> (second_len - compared_len))
+
+        return compared_len - different_bits.bit_length()
 
     @staticmethod
-    def get_prefix_nodes(node: Node) -> Optional[list]:
-        """Get trie prefix nodes in binary form.
+    def get_address_key(prefix: Tuple[int, int]) -> Tuple[int, int]:
+        """Get sorting key which orders prefixes by address. Shorter prefix is placed before longer prefixes it covers.
 
-        :param node: start node in binary trie
-        :return: list of node's values if node exists. None otherwise
+        :param prefix: tuple; prefix value and prefix len
+        :return: tuple; prefix value aligned to 128 bits and prefix len
         """
-        prefix_nodes = []
+        value, prefix_len = prefix
 
-        if node is None:
+        return value << (128 - prefix_len), prefix_len
+
+    def _insert_compressed(self, current_node: Node, node_value: int, node_len: int) -> Node:
+        """Find or create node for new prefix in path compressed trie. Edge is split if new node is placed inside it.
+
+        :param current_node: node which is used as start point
+        :param node_value: integer; integer representation of node
+        :param node_len: integer; number of bits in :param node_value
+        :return: node object for new prefix
+        """
+        while node_len > 0:
+            bit = (node_value >> (node_len - 1)) & 1
+            child = current_node.right_child if bit else current_node.left_child
+
+            if child is None:
+                new_node = self.create_node(node_value, current_node, node_len)
+                AbstractTrie.set_child(current_node, new_node, bit)
+
+                return new_node
+
+            edge_len = child.depth - current_node.depth
+            edge_value = child.node_value
+            common_len = AbstractTrie.get_common_len(child, current_node, node_value, node_len)
+
+            if common_len < edge_len:
+                # split the edge on the position where edge bits and new bits are different
+                split_node = self.create_node(edge_value >> (edge_len - common_len), current_node, common_len)
+
+                child_len = edge_len - common_len
+                child.node_value = edge_value & ((1 << child_len) - 1)
+                child.path = split_node
+
+                AbstractTrie.set_child(split_node, child, child.node_value >> (child_len - 1))
+                AbstractTrie.set_child(current_node, split_node, bit)
+
+                split_node.max_child_level = child.level if child.prefix_flag else child.max_child_level
+
+                child = split_node
+                edge_len = common_len
+
+            current_node = child
+            node_len -= edge_len
+            node_value &= (1 << node_len) - 1
+
+        return current_node
+
+    @staticmethod
+    def set_child(parent_node: Node, node: Node, bit: int) -> None:
+        if bit:
+            parent_node.right_child = node
+        else:
+            parent_node.left_child = node
+
+    @staticmethod
+    def release_node(node: Node) -> None:
+        """Return removed node back to node storage. Used just for nodes in compact trie.
+
+        :param node: node which was removed from the trie
+        :return: None
+        """
+        if isinstance(node, CompactNode):
+            node.storage.release(node.index)
+
+    @staticmethod
+    def compress_node(node: Node) -> None:
+        """Merge non-prefix node which has just one child with this child. Used just for path compressed trie.
+
+        :param node: node which should be merged with child node
+        :return: None
+        """
+        parent = node.path
+
+        if parent is None or node.prefix_flag or (node.left_child and node.right_child):
             return
 
-        current_path = list()
-        current_path.append(node)
+        child = node.left_child or node.right_child
 
-        current_child = node.left_child
+        if child is None:
+            return
 
-        while current_path:
-            while current_child:
-                current_path.append(current_child)
-                current_child = current_child.left_child
+        child.node_value = (node.node_value << (child.depth - node.depth)) | child.node_value
+        child.path = parent
 
-            top = current_path[-1]
+        if parent.right_child == node:
+            parent.right_child = child
 
-            if top.prefix_flag:
-                prefix_nodes.append(AbstractTrie.construct_binary_representation(current_path))
+        else:
+            parent.left_child = child
 
-            if not top.is_visited:
-                top.is_visited = True
-                current_child = top.right_child
+        AbstractTrie.release_node(node)
 
-                if current_child is None and top.right_child is None and top.left_child is None:
-                    prefix_nodes.append(AbstractTrie.construct_binary_representation(current_path))
-                    current_path.pop()
-            else:
-                current_path.pop()
+    def generate_prefixes(self, node: Node) -> None:
+        raise NotImplementedError
+
+    def calculate_level(self, node: Node, prefix_path: Optional[List[Node]] = None) -> None:
+        """
+        Recalculate level of prefix node if it is needed. Maximum level of child prefix nodes is saved in every node,
+        so sub-trie under the new prefix node isn't traversed
+        :param node: pointer to the prefix node object which was added to binary trie
+        :param prefix_path: all parent prefix nodes of :param node. Is found if it isn't set
+        :raises MaximumLevelException: indicate if new added node has a level greater than maximum possible level
+        :return: None
+        """
+        if prefix_path is None:
+            prefix_path = AbstractTrie.get_just_prefix_path(node)
+
+        child_level = self.get_maximum_child_level(node)
+        new_level = self.get_new_level(child_level, prefix_path)
+
+        self.recalculate_level(prefix_path, new_level)
+
+        if child_level is not None:
+            node.level = new_level
+
+        if node.level > self.trie_level:
+            self._max_trie_level = node.level
+
+        AbstractTrie.update_max_child_level(node)
+
+    def get_new_level(self, child_level: Optional[int], prefix_path: List[Node]) -> int:
+        """
+        Check if new prefix node could be added to the trie and return value, which is used for recalculating levels
+        :param child_level: maximum level of child prefix nodes of new node. None if node doesn't have child nodes
+        :param prefix_path: all parent prefix nodes of new node
+        :raises MaximumLevelException: indicate if new added node has a level greater than maximum possible level
+        :return: level value of inserted node
+        """
+        new_level = 0
+
+        if child_level is not None:
+
+            if child_level + 1 > self.max_possible_level:
+                raise MaximumLevelException
+
+            new_level = child_level + 1
+
+        for counter in range(len(prefix_path)):
+
+            if prefix_path[counter].level < new_level + counter + 1:
+
+                if new_level + counter + 1 > self.max_possible_level:
+                    raise MaximumLevelException
 
-        return prefix_nodes
+        return new_level
+
+    def recalculate_level(self, prefix_path: List[Node], new_level: int) -> None:
+        """
+        Provide algorithm for recalculating level of nodes in path for selected node. All nodes in path are checked
+        before any level is changed
+        :param prefix_path: path that contains all prefix nodes
+        :param new_level: level value of inserted node
+        :raises MaximumLevelException in case if recalculating isn't possible
+        :return: None
+        """
+        recalculated_nodes = list()
+
+        for counter in range(len(prefix_path)):
+
+            if prefix_path[counter].level < new_level + counter + 1:
+
+                if new_level + counter + 1 > self.max_possible_level:
+                    raise MaximumLevelException
+
+                recalculated_nodes.append((prefix_path[counter], new_level + counter + 1))
+
+        for prefix_node, level in recalculated_nodes:
+            self._level_nodes[prefix_node.level] -= 1
+            self._level_nodes[level] = self._level_nodes.get(level, 0) + 1
+            prefix_node.level = level
+
+            if level > self.trie_level:
+                self._max_trie_level = level
 
     @staticmethod
-    def delete_node_from_trie(node: Node) -> None:
-        """Delete node and all unused internal nodes.
-        :param node: pointer to the node which should be removed from binary trie
+    def update_max_child_level(node: Node) -> None:
+        """Update maximum level of child prefix nodes for all nodes on the path from :param node to the root node.
+
+        :param node: prefix node which was added to binary trie or whose level was changed
         :return: None
         """
-        path = AbstractTrie.get_path_to_previous_prefix(node)
-        child = path[0]
+        if isinstance(node, CompactNode):
+            node.storage.update_child_level(node.index)
 
-        for count in range(len(path)):
-            if (child is node) or (not child.prefix_flag and not child.left_child and not child.right_child):
-                parent = path[count + 1]
+            return
 
-                if parent.right_child == child:
-                    parent.right_child = None
+        child_level = node.level
+        current_node = node.path
 
-                else:
-                    parent.left_child = None
+        while current_node is not None:
+
+            if current_node.max_child_level < child_level:
+                current_node.max_child_level = child_level
+
+            if current_node.prefix_flag:
+                child_level = current_node.level
+
+            current_node = current_node.path
+
+    @staticmethod
+    def get_prefix_parent(node: Node) -> Optional[Node]:
+        """Return the nearest prefix node above :param node. Root node isn't used as prefix parent.
+
+        :param node: Node; node object from binary trie
+        :return: nearest parent prefix node or None if node doesn't have any parent prefix node
+        """
+        if isinstance(node, CompactNode):
+            index = node.storage.nearest_prefix_parent(node.index)
+
+            return node.storage.node(index) if index != node.storage.NO_NODE else None
+
+        current_node = node.path
+
+        while current_node is not None and current_node.path is not None:
+
+            if current_node.prefix_flag:
+                return current_node
+
+            current_node = current_node.path
+
+        return None
+
+    @staticmethod
+    def update_prefix_parent(node: Node) -> None:
+        """Set :param node as prefix parent for all nearest child prefix nodes. Is used when new prefix node is placed
+        above existing prefix nodes.
+
+        :param node: new prefix node
+        :return: None
+        """
+        node_stack = [node.left_child, node.right_child]
 
-                child = parent
+        while node_stack:
+            current_node = node_stack.pop()
 
+            if current_node is None:
                 continue
 
-            break
+            if current_node.prefix_flag:
+                current_node.prefix_parent = node
+                continue
 
+            node_stack.append(current_node.right_child)
+            node_stack.append(current_node.left_child)
 
     @staticmethod
-    def is_exist(parent_node: Node, node_value: str) -> bool:
-        """Check if current value is already exists in binary trie.
-        :param parent_node: parent node for added value
-        :param node_value: str representation of node
-        :return: False if node not exists in binary trie, True otherwise
+    def get_just_prefix_path(node: Node) -> List[Node]:
+        """Return full prefix nodes path for :param Node current node.
+
+        Method is used for creating prefix path for current :param node. Result list contains all previous prefix nodes.
+        Result list could be used for change levels all of this nodes. Every prefix node contains link to the nearest
+        parent prefix node, so internal nodes are skipped
+        :param node: Node; node object from binary trie
+        :return: list; list with all previous (and current if node is prefix node) prefix nodes for :param node
         """
-        current_node = parent_node
+        if isinstance(node, CompactNode):
+            return [node.storage.node(index) for index in node.storage.prefix_path(node.index)]
 
-        for curr_len, bit in enumerate(node_value, 1):
+        full_path = list()
 
-            if bit == '0':
-                # add node to trie as a left child
-                if curr_len == len(node_value) and current_node.left_child and current_node.left_child.prefix_flag:
-                    return True
+        if node.prefix_flag and node.path is not None:
+            current_node = node
+        else:
+            current_node = AbstractTrie.get_prefix_parent(node)
 
-                if curr_len < len(node_value) and not current_node.left_child:
-                    return False
+        while current_node is not None:
+            full_path.append(current_node)
+            current_node = current_node.prefix_parent
 
-                current_node = current_node.left_child
+        return full_path
 
-            else:
-                # add node to trie as a right child
-                if curr_len == len(node_value) and current_node.right_child and current_node.right_child.prefix_flag:
-                    return True
+    def get_maximum_child_level(self, root: Node) -> Optional[int]:
+        """Get maximum level of all child prefix nodes.
+
+        :param root: node which contain child nodes
+        :return: value of maximum level. None if node doesn't have child prefix nodes
+        """
+        if not root or root.max_child_level < 0:
+            return
+
+        return root.max_child_level
+
+    @staticmethod
+    def construct_prefix(nodes) -> Tuple[int, int]:
+        """Construct integer representation of prefix using saved nodes.
+
+        :param nodes: list of nodes that represents the path from root node to prefix node
+        :return: tuple which contains prefix value and prefix len
+        """
+        value = 0
+        prefix_len = 0
 
-                if curr_len < len(node_value) and not current_node.right_child:
-                    return False
+        for node in nodes:
+            if node.node_value is not None:
+                edge_len = node.depth - node.path.depth
 
-                current_node = current_node.right_child
+                value = (value << edge_len) | node.node_value
+                prefix_len += edge_len
 
-        return False
+        return value, prefix_len
 
     @staticmethod
-    def level_stats(node) -> Optional[Dict]:
-        """Return level statistic for nodes in trie structure
+    def iterate_prefixes(node: Node) -> Iterator[Tuple[int, int]]:
+        """Iterate over prefix nodes of sub-trie in address order. Prefix is yielded before all longer prefixes which
+        it covers. Trie isn't changed, so iterator could be created any number of times.
 
-        :param node: pointer to the root node or node which is root for the particular sub-trie
-        :return: information about how many nodes have particular value of level
+        :param node: start node in binary trie
+        :return: iterator of (prefix value, prefix len) tuples. Prefix len is counted from the parent of :param node,
+                 so bits of the edge to :param node are included. Prefixes of root node are full prefixes
         """
-        if not node:
+        if node is None:
             return
 
-        node_path = list()
-        levels = {key: 0 for key in range(7)}
-        node_path.append(node)
+        if isinstance(node, CompactNode):
+            yield from node.storage.iter_prefixes(node.index)
+            return
 
-        while node_path:
+        start_depth = node.depth if node.node_value is None else node.path.depth
+        node_stack = [(node, node.node_value or 0)]
 
-            node = node_path.pop()
+        while node_stack:
+            node, prefix_value = node_stack.pop()
+            left_child = node.left_child
+            right_child = node.right_child
 
-            if node.prefix_flag:
-                levels[node.level] += 1
+            if node.prefix_flag or (left_child is None and right_child is None):
+                yield prefix_value, node.depth - start_depth
+
+            # right child is pushed first, so left sub-trie is processed first
+            for child in (right_child, left_child):
+                if child is not None:
+                    node_stack.append((child, (prefix_value << (child.depth - node.depth)) | child.node_value))
+
+    @staticmethod
+    def get_prefix_nodes(node: Node) -> Optional[list]:
+        """Get trie prefix nodes in integer form.
+
+        :param node: start node in binary trie
+        :return: list of (prefix value, prefix len) tuples in address order if node exists. None otherwise
+        """
+        if node is None:
+            return
+
+        return list(AbstractTrie.iterate_prefixes(node))
+
+    @staticmethod
+    def find_node(parent_node: Node, node_value: int, node_len: int) -> Optional[Node]:
+        """Find node for :param node_value under :param parent_node. Works for both binary and path compressed trie.
+        :param parent_node: node which is used as start point
+        :param node_value: integer representation of node
+        :param node_len: number of bits in :param node_value
+        :return: node object if node exists in binary trie, None otherwise
+        """
+        current_node = parent_node
+
+        while node_len > 0:
+            bit = (node_value >> (node_len - 1)) & 1
+            child = current_node.right_child if bit else current_node.left_child
 
-            if node.right_child:
-                node_path.append(node.right_child)
+            if child is None:
+                return None
 
-            if node.left_child:
-                node_path.append(node.left_child)
+            edge_len = child.depth - current_node.depth
 
-        return levels
+            if edge_len > node_len or (node_value >> (node_len - edge_len)) != child.node_value:
+                return None
 
+            current_node = child
+            node_len -= edge_len
+            node_value &= (1 << node_len) - 1
 
+        return current_node
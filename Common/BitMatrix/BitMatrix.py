@@ -0,0 +1,121 @@
+# was developed by Utkin Kirill
+
+import attr
+import numpy as np
+
+from typing import Iterable, Tuple
+
+
+@attr.s
+class BitMatrix:
+    """
+    Prefix set packed to bit array: one row of 8 bytes per prefix, prefix bits are aligned to the most significant bit
+    and bits after prefix len are zero. Number of ones on every bit position is counted by prefix depth in one pass
+    over the array, so bit frequencies of whole dataset are computed by array operations
+    """
+    POSITIONS = 64
+    DEPTHS = POSITIONS + 1
+
+    # number of prefixes which bits are unpacked at once
+    CHUNK_SIZE = 65536
+
+    # packed prefix bits, array of shape (prefixes num, 8)
+    bits = attr.ib(type=np.ndarray)
+    prefix_lens = attr.ib(type=np.ndarray)
+
+    # number of ones on bit position by prefix depth, array of shape (65, 64)
+    ones_by_depth = attr.ib(type=np.ndarray)
+    # number of prefixes by depth
+    prefixes_by_depth = attr.ib(type=np.ndarray)
+
+    @staticmethod
+    def create(prefixes: Iterable[Tuple[int, int]]) -> 'BitMatrix':
+        """Pack prefixes to bit array and count ones on bit positions by prefix depth.
+
+        :raises ValueError in case if prefix is longer than 64 bits
+        :param prefixes: iterable of (prefix value, prefix len) tuples
+        :return: BitMatrix object
+        """
+        prefix_array = np.array(list(prefixes), dtype=np.uint64).reshape(-1, 2)
+
+        return BitMatrix.from_arrays(prefix_array[:, 0], prefix_array[:, 1])
+
+    @staticmethod
+    def from_arrays(prefix_values: np.ndarray, prefix_lens: np.ndarray) -> 'BitMatrix':
+        """Pack prefixes which are given by arrays of values and lengths to bit array and count ones on bit positions by
+        prefix depth.
+
+        :raises ValueError in case if prefix is longer than 64 bits
+        :param prefix_values: array of prefix values
+        :param prefix_lens: array of prefix lengths
+        :return: BitMatrix object
+        """
+        prefix_values = np.asarray(prefix_values, dtype=np.uint64)
+        prefix_lens = np.asarray(prefix_lens).astype(np.int64)
+
+        if len(prefix_lens) and prefix_lens.max() > BitMatrix.POSITIONS:
+            raise ValueError(f"Prefix len is greater than {BitMatrix.POSITIONS}")
+
+        # shift by 64 bits isn't defined, prefix with zero len doesn't have any bit
+        shifts = np.where(prefix_lens > 0, BitMatrix.POSITIONS - prefix_lens, 0).astype(np.uint64)
+        aligned_values = np.where(prefix_lens > 0, prefix_values << shifts, np.uint64(0))
+        bits = aligned_values.astype('>u8').view(np.uint8).reshape(-1, 8)
+
+        ones_by_depth, prefixes_by_depth = BitMatrix.count_bits(bits, prefix_lens)
+
+        return BitMatrix(bits, prefix_lens, ones_by_depth, prefixes_by_depth)
+
+    @staticmethod
+    def count_bits(bits: np.ndarray, prefix_lens: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Count ones on every bit position by prefix depth. Bits are unpacked by chunks, ones of chunk are summed by
+        depth as product of depth indicator matrix and bit matrix.
+
+        :param bits: packed prefix bits
+        :param prefix_lens: array of prefix lengths
+        :return: tuple; number of ones on bit position by depth and number of prefixes by depth
+        """
+        ones_by_depth = np.zeros((BitMatrix.DEPTHS, BitMatrix.POSITIONS), dtype=np.int64)
+        depths = np.arange(BitMatrix.DEPTHS)[:, np.newaxis]
+
+        for start in range(0, len(prefix_lens), BitMatrix.CHUNK_SIZE):
+            chunk_bits = np.unpackbits(bits[start:start + BitMatrix.CHUNK_SIZE], axis=1).astype(np.float32)
+            depth_indicator = (prefix_lens[np.newaxis, start:start + BitMatrix.CHUNK_SIZE] == depths)
+
+            # sums of chunk are smaller than 2^24, so they are exact in float32
+            ones_by_depth += np.rint(depth_indicator.astype(np.float32) @ chunk_bits).astype(np.int64)
+
+        return ones_by_depth, np.bincount(prefix_lens, minlength=BitMatrix.DEPTHS).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.prefix_lens)
+
+    def get_position_frequency(self, bit_value: int) -> np.ndarray:
+        """Calculate how often (in %) :param bit_value could be found on particular bit position of all prefixes.
+        Position is counted from the most significant bit of the prefix, just bits inside prefix len are counted.
+
+        :param bit_value: int; analysing bit value
+        :return: array of 64 values; frequency of bit value by bit position
+        """
+        ones = self.ones_by_depth.sum(axis=0)
+
+        if bit_value == 0:
+            # number of prefixes which are longer than bit position
+            ones = self.prefixes_by_depth[::-1].cumsum()[::-1][1:] - ones
+
+        if not len(self):
+            return ones.astype(np.float64)
+
+        return ones / len(self) * 100
+
+    def get_depth_frequency(self) -> np.ndarray:
+        """Calculate probability of one on bit position conditioned by prefix depth. Probability is zero for positions
+        outside of prefix and for depths without prefixes.
+
+        :return: array of shape (65, 64); probability of one by prefix depth and bit position
+        """
+        frequency = np.zeros(self.ones_by_depth.shape, dtype=np.float64)
+        prefixes_by_depth = self.prefixes_by_depth[:, np.newaxis]
+
+        np.divide(self.ones_by_depth, prefixes_by_depth, out=frequency, where=prefixes_by_depth > 0)
+
+        return frequency
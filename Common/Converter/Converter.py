@@ -1,54 +1,213 @@
 # was developed by Utkin Kirill
 
 import ipaddress
+import itertools
 import attr
+import numpy as np
 
-from typing import Dict, List
+from typing import Iterable, Iterator, List, TextIO, Tuple
 
 
 @attr.s
 class Converter:
     """Convert all output prefixes to hexadecimal representation"""
 
-    binary_prefixes = attr.ib(factory=list, type=list)
+    # number of prefixes which are written to the output file at once
+    WRITE_BUFFER_SIZE = 4096
 
-    def _normalize_prefix(self, prefix) -> Dict[str, str]:
-        """Normalize prefix length to 128 bits if needed.
+    # number of 16 bits groups in IPv6 address
+    HEXTETS_NUM = 8
 
-        :param prefix: string; binary prefix representation of prefix for normalization
-        :return: dictionary; binary representation of prefix has a len as 128 bits / previous prefix len
+    # hexadecimal representation of all 16 bits values. Is created just when batch conversion is used first time
+    _hextet_table = None
+
+    # list or any other iterable object (e.g. trie prefix iterator) with (prefix value, prefix len) tuples
+    prefixes = attr.ib(factory=list, type=Iterable)
+
+    @staticmethod
+    def split_prefixes(prefixes: Iterable[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Normalize prefixes to 128 bits addresses and split addresses to two 64 bits parts.
+
+        :param prefixes: iterable object with (prefix value, prefix len) tuples
+        :return: tuple of numpy arrays; high 64 bits of addresses, low 64 bits of addresses, prefix lens
+        """
+        high_bits = list()
+        low_bits = list()
+        prefix_lens = list()
+
+        for value, prefix_len in prefixes:
+            address = value << (ipaddress.IPV6LENGTH - prefix_len)
+
+            high_bits.append(address >> 64)
+            low_bits.append(address & 0xFFFFFFFFFFFFFFFF)
+            prefix_lens.append(prefix_len)
+
+        return (np.array(high_bits, dtype=np.uint64), np.array(low_bits, dtype=np.uint64),
+                np.array(prefix_lens, dtype=np.uint8))
+
+    @staticmethod
+    def split_prefix_arrays(prefix_values: np.ndarray, prefix_lens: np.ndarray) -> Tuple[np.ndarray, np.ndarray,
+                                                                                        np.ndarray]:
+        """Normalize prefixes which are given by arrays to 128 bits addresses and split addresses to two 64 bits parts.
+        Prefixes are at most 64 bits long, so low 64 bits of addresses are zero.
+
+        :param prefix_values: numpy array of prefix values
+        :param prefix_lens: numpy array of prefix lens
+        :return: tuple of numpy arrays; high 64 bits of addresses, low 64 bits of addresses, prefix lens
         """
-        prefix_len = len(prefix)
-        expected_len = ipaddress.IPV6LENGTH
+        prefix_values = np.asarray(prefix_values, dtype=np.uint64)
+        prefix_lens = np.asarray(prefix_lens).astype(np.uint8)
 
-        if prefix_len != expected_len:
-            additional_bits = expected_len - prefix_len
-            normalized = prefix + ''.join(['0' for _ in range(additional_bits)])
+        # shift by 64 bits isn't defined, prefix with zero len is zero address
+        shifts = np.where(prefix_lens > 0, 64 - prefix_lens.astype(np.int64), 0).astype(np.uint64)
+        high_bits = np.where(prefix_lens > 0, prefix_values << shifts, np.uint64(0))
 
-            return {"prefix": normalized, "prefix_len": prefix_len}
+        return high_bits, np.zeros(len(prefix_lens), dtype=np.uint64), prefix_lens
 
-        return {"prefix": prefix, "prefix_len": prefix_len}
+    @staticmethod
+    def iterate_converted_arrays(prefix_values: np.ndarray, prefix_lens: np.ndarray,
+                                 chunk_size: int = WRITE_BUFFER_SIZE) -> Iterator[str]:
+        """Convert prefixes which are given by arrays by chunks, so just one chunk of converted prefixes is saved in
+        memory.
 
-    def _get_hex_repr(self, prefix) -> str:
-        """Convert binary representation of prefix to hexadecimal representation.
+        :param prefix_values: numpy array of prefix values
+        :param prefix_lens: numpy array of prefix lens
+        :param chunk_size: int; number of prefixes which are converted at once
+        :return: iterator of converted prefixes
+        """
+        for start in range(0, len(prefix_lens), chunk_size):
+            yield from Converter.format_addresses(*Converter.split_prefix_arrays(
+                prefix_values[start:start + chunk_size], prefix_lens[start:start + chunk_size]))
+
+    @classmethod
+    def get_hextet_table(cls) -> np.ndarray:
+        """Return table with hexadecimal representation of all 16 bits values.
 
-        :param prefix: string; binary representation of prefix
-        :return: string; converted prefix to hexadecimal which has a format prefix/prefix_len
+        :return: numpy array of strings, value is used as index
         """
-        normalized_prefix = self._normalize_prefix(prefix)
-        hex_repr = ipaddress.IPv6Address(int(normalized_prefix['prefix'], 2))
+        if cls._hextet_table is None:
+            cls._hextet_table = np.array(['%x' % value for value in range(1 << 16)], dtype=object)
+
+        return cls._hextet_table
+
+    @staticmethod
+    def get_format(start: int, length: int) -> str:
+        """Create format string for the address whose longest run of zero hextets has been found. Hextets are compressed
+        the same way as in ipaddress module: just the first longest run which is longer than one hextet is replaced by
+        '::'.
+
+        :param start: int; index of first zero hextet in the run
+        :param length: int; number of zero hextets in the run. Zero if address isn't compressed
+        :return: string; format string which expects not compressed hextets and prefix len
+        """
+        hextets = ['%s'] * Converter.HEXTETS_NUM
+
+        if length:
+            if start + length == Converter.HEXTETS_NUM:
+                hextets.append('')
+
+            hextets[start:start + length] = ['']
+
+            if start == 0:
+                hextets.insert(0, '')
+
+        return ':'.join(hextets) + '/%d'
+
+    @staticmethod
+    def format_addresses(high_bits: np.ndarray, low_bits: np.ndarray, prefix_lens: np.ndarray) -> List[str]:
+        """Convert batch of normalized prefixes to compressed hexadecimal representation. Result is the same as for
+        ipaddress.IPv6Address, but hextets, zero runs and compression are computed for all prefixes at once.
+
+        :param high_bits: numpy array; high 64 bits of addresses
+        :param low_bits: numpy array; low 64 bits of addresses
+        :param prefix_lens: numpy array; prefix lens
+        :return: list; converted prefixes which has a format prefix/prefix_len
+        """
+        prefixes_num = len(prefix_lens)
+        hextets_num = Converter.HEXTETS_NUM
+
+        hextets = np.empty((prefixes_num, hextets_num), dtype=np.uint16)
 
-        return f"{hex_repr}/{normalized_prefix['prefix_len']}"
+        for position in range(hextets_num // 2):
+            shift = np.uint64(48 - 16 * position)
+
+            hextets[:, position] = (high_bits >> shift) & np.uint64(0xFFFF)
+            hextets[:, position + hextets_num // 2] = (low_bits >> shift) & np.uint64(0xFFFF)
+
+        # length of zero run which ends in every hextet
+        zero_runs = np.zeros((prefixes_num, hextets_num), dtype=np.int8)
+        current_run = np.zeros(prefixes_num, dtype=np.int8)
+
+        for position in range(hextets_num):
+            current_run = np.where(hextets[:, position] == 0, current_run + 1, 0).astype(np.int8)
+            zero_runs[:, position] = current_run
+
+        # argmax returns the first maximum, so the first longest run is compressed
+        run_end = zero_runs.argmax(axis=1)
+        run_len = zero_runs[np.arange(prefixes_num), run_end].astype(np.int64)
+        run_len[run_len < 2] = 0
+        run_start = np.where(run_len > 0, run_end - run_len + 1, 0)
+
+        hextet_strings = Converter.get_hextet_table()[hextets]
+        patterns = run_start * (hextets_num + 1) + run_len
+
+        converted_prefixes = np.empty(prefixes_num, dtype=object)
+
+        for pattern in np.unique(patterns):
+            start, length = divmod(int(pattern), hextets_num + 1)
+            prefix_format = Converter.get_format(start, length)
+
+            indexes = np.nonzero(patterns == pattern)[0]
+            columns = [column for column in range(hextets_num) if not start <= column < start + length]
+
+            rows = hextet_strings[indexes][:, columns].tolist()
+            lens = prefix_lens[indexes].tolist()
+
+            converted_prefixes[indexes] = [prefix_format % (*row, prefix_len) for row, prefix_len in zip(rows, lens)]
+
+        return converted_prefixes.tolist()
+
+    def iterate_converted_prefixes(self) -> Iterator[str]:
+        """Convert prefixes by chunks, so just one chunk of converted prefixes is saved in memory.
+
+        :return: iterator of converted prefixes
+        """
+        prefixes = iter(self.prefixes)
+
+        while True:
+            chunk = list(itertools.islice(prefixes, self.WRITE_BUFFER_SIZE))
+
+            if not chunk:
+                break
+
+            yield from self.format_addresses(*self.split_prefixes(chunk))
 
     def convert_prefixes(self) -> List[str]:
         """Converting all prefixes after generating process to hexadecimal representation.
 
         :return: list; list with converted prefixes
         """
-        converted_prefixes = []
+        return self.format_addresses(*self.split_prefixes(self.prefixes))
+
+    @staticmethod
+    def write_prefixes(prefixes: Iterable[str], file: TextIO, buffer_size: int = WRITE_BUFFER_SIZE) -> int:
+        """Write converted prefixes to the file. Prefixes are written by chunks, so just one chunk is saved in memory.
+
+        :param prefixes: iterable object with converted prefixes
+        :param file: opened output file or standard output
+        :param buffer_size: int; number of prefixes in one chunk
+        :return: int; number of written prefixes
+        """
+        prefixes = iter(prefixes)
+        written_prefixes = 0
+
+        while True:
+            chunk = list(itertools.islice(prefixes, buffer_size))
+
+            if not chunk:
+                break
 
-        for prefix in self.binary_prefixes:
-            converted_prefix = self._get_hex_repr(prefix)
-            converted_prefixes.append(converted_prefix)
+            file.write('\n'.join(chunk) + '\n')
+            written_prefixes += len(chunk)
 
-        return converted_prefixes
+        return written_prefixes
@@ -10,3 +10,7 @@ class MaximumLevelException(Exception):
 
 class CannotGenerateDueMaximumLevel(Exception):
     pass
+
+
+class NoFreePrefixException(Exception):
+    pass
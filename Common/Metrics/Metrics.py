@@ -0,0 +1,105 @@
+# was developed by Utkin Kirill
+
+import attr
+import json
+import time
+
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+@attr.s
+class Metrics:
+    """
+    Metrics of one generator run: wall and CPU time of every phase, number of allocated trie nodes, number of failed
+    attempts to add new prefix by exception, organisation level and prefix length, and number of parent nodes which
+    couldn't be used for generating anymore by organisation level
+    """
+    # phase: {'wall_time': seconds, 'cpu_time': seconds}
+    phases = attr.ib(factory=dict, type=Dict[str, Dict[str, float]])
+    nodes_allocated = attr.ib(default=0, type=int)
+    # (exception name, organisation level, prefix len): number of exceptions
+    exceptions = attr.ib(factory=Counter, type=Counter)
+    # organisation level of parent nodes: number of exhausted parent nodes
+    exhausted_parents = attr.ib(factory=Counter, type=Counter)
+
+    _start_wall_time = attr.ib(factory=time.perf_counter, type=float)
+    _start_cpu_time = attr.ib(factory=time.process_time, type=float)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Add wall and CPU time of the block to the time of :param phase.
+
+        :param phase: string; name of the phase
+        :return: context manager
+        """
+        wall_time = time.perf_counter()
+        cpu_time = time.process_time()
+
+        try:
+            yield
+
+        finally:
+            phase_time = self.phases.setdefault(phase, {'wall_time': 0.0, 'cpu_time': 0.0})
+            phase_time['wall_time'] += time.perf_counter() - wall_time
+            phase_time['cpu_time'] += time.process_time() - cpu_time
+
+    def count_exception(self, exc: Exception, org_level: int, prefix_len: int, exceptions_num: int = 1) -> None:
+        """Count exception which stopped adding of new prefix.
+
+        :param exc: exception object
+        :param org_level: int; organisation level of new prefix
+        :param prefix_len: int; length of new prefix
+        :param exceptions_num: int; number of prefixes which weren't added due to the same exception (e.g. in batch)
+        :return: None
+        """
+        self.exceptions[(type(exc).__name__, org_level, prefix_len)] += exceptions_num
+
+    def merge(self, metrics: 'Metrics') -> None:
+        """Add counters of :param metrics (e.g. metrics of worker process) to this metrics. Time of phases isn't added,
+        phases of worker processes are measured by the main process.
+
+        :param metrics: Metrics object
+        :return: None
+        """
+        self.nodes_allocated += metrics.nodes_allocated
+        self.exceptions.update(metrics.exceptions)
+        self.exhausted_parents.update(metrics.exhausted_parents)
+
+    def get_wall_time(self) -> float:
+        """Return wall time since metrics were created, so total time of the run.
+
+        :return: float; seconds
+        """
+        return time.perf_counter() - self._start_wall_time
+
+    def to_dict(self) -> Dict:
+        """Convert metrics to JSON serializable dictionary. Exceptions are grouped by name, organisation level and
+        prefix length.
+
+        :return: dictionary with metrics
+        """
+        exceptions = dict()
+
+        for (name, org_level, prefix_len), exceptions_num in sorted(self.exceptions.items()):
+            exceptions.setdefault(name, dict()).setdefault(str(org_level), dict())[str(prefix_len)] = exceptions_num
+
+        return {
+            'wall_time': self.get_wall_time(),
+            'cpu_time': time.process_time() - self._start_cpu_time,
+            'phases': self.phases,
+            'nodes_allocated': self.nodes_allocated,
+            'exceptions': exceptions,
+            'exhausted_parents': {str(org_level): parents_num
+                                  for org_level, parents_num in sorted(self.exhausted_parents.items())},
+        }
+
+    def save(self, path: str) -> None:
+        """Write metrics to JSON file.
+
+        :param path: string; path to the output file
+        :return: None
+        """
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=4)
@@ -0,0 +1,102 @@
+# was developed by Utkin Kirill
+
+import attr
+import random
+import numpy as np
+
+from typing import List, Optional, Tuple
+
+
+@attr.s
+class RandomStream:
+    """
+    Counter-based random generator (Philox) with the same interface as methods of random module which are used by
+    generators. Every stream is identified by seed and key, so independent stream could be created for every
+    generating phase or work unit (e.g. block of address space) and generated again without other streams
+    """
+    # keys of generating phases
+    RANDOM_PHASE = 0
+    TRAVERSAL_PHASE = 1
+
+    # number of 64 bit words which are generated at once
+    BUFFER_SIZE = 1024
+
+    seed = attr.ib(type=int)
+    key = attr.ib(factory=tuple, type=Tuple[int, ...])
+
+    _bit_generator = attr.ib(default=None, type=Optional[np.random.Philox])
+    _buffer = attr.ib(factory=list, type=List[int])
+
+    def __attrs_post_init__(self) -> None:
+        self._bit_generator = np.random.Philox(np.random.SeedSequence(self.seed, spawn_key=self.key))
+
+    @staticmethod
+    def create(seed: Optional[int], *key: int):
+        """Create stream for generating phase. Random module is used if seed isn't set.
+
+        :param seed: int; seed of the generator or None
+        :param key: keys which identify the stream
+        :return: RandomStream object or random module
+        """
+        if seed is None:
+            return random
+
+        return RandomStream(seed, key)
+
+    def spawn(self, *key: int) -> 'RandomStream':
+        """Create independent child stream. Child stream doesn't depend on number of values which were taken from this
+        stream.
+
+        :param key: keys which identify the child stream
+        :return: RandomStream object
+        """
+        return RandomStream(self.seed, self.key + key)
+
+    def get_generator(self) -> np.random.Generator:
+        """Create numpy generator of this stream for sampling arrays of values. Values don't depend on number of values
+        which were taken from this stream.
+
+        :return: numpy Generator object
+        """
+        return np.random.Generator(np.random.Philox(np.random.SeedSequence(self.seed, spawn_key=self.key)))
+
+    def _get_word(self) -> int:
+        if not self._buffer:
+            self._buffer = self._bit_generator.random_raw(self.BUFFER_SIZE).tolist()
+            self._buffer.reverse()
+
+        return self._buffer.pop()
+
+    def getrandbits(self, bits_num: int) -> int:
+        """Return integer with :param bits_num random bits.
+
+        :param bits_num: int; number of bits
+        :return: int; random value
+        """
+        value = 0
+
+        for _ in range((bits_num + 63) // 64):
+            value = (value << 64) | self._get_word()
+
+        return value >> (-bits_num % 64)
+
+    def randint(self, start: int, end: int) -> int:
+        """Return random integer from interval [start, end]. Value is selected uniformly (without modulo bias).
+
+        :param start: int; start of the interval
+        :param end: int; end of the interval, is included
+        :return: int; random value
+        """
+        values_num = end - start + 1
+
+        if values_num == 1:
+            return start
+
+        # bits of the greatest value, so no value is rejected if number of values is a power of two
+        bits_num = (values_num - 1).bit_length()
+        value = self.getrandbits(bits_num)
+
+        while value >= values_num:
+            value = self.getrandbits(bits_num)
+
+        return start + value
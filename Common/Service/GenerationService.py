@@ -0,0 +1,402 @@
+# was developed by Utkin Kirill
+
+import asyncio
+import attr
+import gc
+import json
+import os
+import signal
+import socket
+
+from typing import Dict, Iterator, Optional, TextIO, Tuple
+from Common.Abstract.AbstractTrie import AbstractTrie
+from Common.Converter.Converter import Converter
+from Common.Validator.Validator import InputArgumentsValidator
+from IPv6Gene.Generator.Helper import Helper as IPv6GeneHelper
+from IPv6Gene.Generator.v6Generator import V6Generator as IPv6GeneGenerator
+from IPv6Gene.Trie.Trie import Trie as IPv6GeneTrie
+from V6Gene.Generator.v6Generator import V6Generator as V6GeneGenerator
+from V6Gene.Trie.Trie import Trie as V6GeneTrie
+
+
+@attr.s
+class GenerationService:
+    """
+    Long-running generating service. Seed tries are constructed once and kept in memory. Every job is generated in
+    forked process which gets copy-on-write copy of the warm seed trie, so job doesn't parse seed file and doesn't
+    construct the trie again. Number of concurrently generated jobs is limited by number of workers.
+
+    Job is one JSON line sent to the Unix socket. Response starts with JSON status line, generated prefixes follow
+    line by line if status is ok and JSON end line finishes the response, so client can tell finished job from job
+    which failed while prefixes were sent.
+    """
+    GENERATORS = ('v6gene', 'ipv6gene')
+
+    # number of bytes which are read from job process and sent to client at once
+    CHUNK_SIZE = 65536
+
+    socket_path = attr.ib(type=str)
+    workers = attr.ib(default=1, type=int)
+    stats = attr.ib(default=False, type=bool)
+
+    # futures of constructed seed tries by generator, seed file path and its modification time
+    _seed_tries = attr.ib(factory=dict, type=Dict)
+    # seed tries which are constructed by executor threads, also tries of previous seed file versions
+    _constructions = attr.ib(factory=set, type=set)
+    _workers_semaphore = attr.ib(default=None, type=Optional[asyncio.Semaphore])
+
+    def start(self, seed_files: Tuple[str, ...] = ()) -> None:
+        """Start the service and serve jobs until the process is stopped.
+
+        :param seed_files: seed files which tries are constructed before first job is accepted
+        :return: None
+        """
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(self.serve(seed_files))
+
+    async def serve(self, seed_files: Tuple[str, ...] = ()) -> None:
+        """Construct seed tries of :param seed_files and accept jobs on the service socket.
+
+        :param seed_files: seed files which tries are constructed before first job is accepted
+        :return: None
+        """
+        self._workers_semaphore = asyncio.Semaphore(self.workers)
+
+        for seed_file in seed_files:
+            for generator in self.GENERATORS:
+                await self.get_seed_trie(generator, seed_file)
+
+        server = await asyncio.start_unix_server(self.handle_job, path=self.socket_path)
+
+        if self.stats:
+            print(f"[SERVICE]: Listening on {self.socket_path} with {self.workers} workers")
+
+        try:
+            # server accepts jobs until it is closed
+            await server.wait_closed()
+
+        finally:
+            server.close()
+
+    async def get_seed_trie(self, generator: str, seed_file: str) -> AbstractTrie:
+        """Get warm seed trie of :param seed_file. Trie is constructed just once, also for concurrent jobs, and is
+        constructed again if seed file is modified, trie of previous version of the file is released.
+
+        :raises ValueError in case if generator is unknown
+        :raises OSError in case if seed file doesn't exist or is not readable
+        :param generator: string; v6gene or ipv6gene
+        :param seed_file: string; path to seed prefix file
+        :return: seed trie
+        """
+        if generator not in self.GENERATORS:
+            raise ValueError(f"Unknown generator {generator}. Possible values are {', '.join(self.GENERATORS)}")
+
+        seed_file = os.path.realpath(seed_file)
+        key = (generator, seed_file, os.stat(seed_file).st_mtime_ns)
+
+        if key not in self._seed_tries:
+            # tries of previous versions of the seed file aren't used anymore. Jobs which already got them keep them
+            # until they end
+            for old_key in [old_key for old_key in self._seed_tries if old_key[:2] == key[:2]]:
+                del self._seed_tries[old_key]
+
+            loop = asyncio.get_event_loop()
+            construction = loop.run_in_executor(None, self.construct_seed_trie, generator, seed_file)
+
+            self._seed_tries[key] = construction
+            self._constructions.add(construction)
+            construction.add_done_callback(self._constructions.discard)
+
+            if self.stats:
+                print(f"[SERVICE]: Construct {generator} seed trie of {seed_file}")
+
+        try:
+            return await self._seed_tries[key]
+
+        except Exception:
+            # failed construction isn't cached
+            self._seed_tries.pop(key, None)
+            raise
+
+    async def wait_constructions(self) -> None:
+        """Wait until no seed trie is constructed. Job process is forked just by the thread of event loop, so it
+        doesn't get copy of lock which is held by executor thread constructing the trie.
+
+        :return: None
+        """
+        while self._constructions:
+            await asyncio.wait(list(self._constructions))
+
+    @staticmethod
+    def construct_seed_trie(generator: str, seed_file: str) -> AbstractTrie:
+        """Construct compact seed trie. Arrays of compact trie stay shared with job processes until they are changed.
+
+        :param generator: string; v6gene or ipv6gene
+        :param seed_file: string; path to seed prefix file
+        :return: seed trie
+        """
+        if generator == 'ipv6gene':
+            binary_trie = IPv6GeneTrie(Help=IPv6GeneHelper(), compact=True)
+
+        else:
+            binary_trie = V6GeneTrie(compact=True)
+
+        binary_trie.bulk_load(InputArgumentsValidator.read_seed_file(seed_file))
+
+        return binary_trie
+
+    async def handle_job(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read job from the client, generate it and stream generated prefixes back.
+
+        :param reader: client stream reader
+        :param writer: client stream writer
+        :return: None
+        """
+        try:
+            try:
+                job = json.loads(await reader.readline())
+                seed_trie = await self.get_seed_trie(job['generator'], job['input'])
+
+            except Exception as exc:
+                writer.write(self.get_status_line(exc))
+                await writer.drain()
+                return
+
+            async with self._workers_semaphore:
+                await self.run_job(job, seed_trie, writer)
+
+        except ConnectionError:
+            # client closed the connection before whole output was sent
+            pass
+
+        finally:
+            writer.close()
+
+    async def run_job(self, job: Dict, seed_trie: AbstractTrie, writer: asyncio.StreamWriter) -> None:
+        """Generate job in forked process and send its output to the client.
+
+        :param job: dictionary; job parameters
+        :param seed_trie: warm seed trie
+        :param writer: client stream writer
+        :return: None
+        """
+        loop = asyncio.get_event_loop()
+
+        # nothing is awaited between the wait and the fork, so no construction is started meanwhile
+        await self.wait_constructions()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:
+            exit_code = 0
+
+            try:
+                # objects of the service (seed tries, tasks of other jobs) are never collected in job process, so
+                # their pages stay shared and their finalizers aren't called. gc.freeze is available since Python 3.7,
+                # job process is short-lived, so garbage collection is just disabled on older versions
+                if hasattr(gc, 'freeze'):
+                    gc.freeze()
+
+                else:
+                    gc.disable()
+                os.close(read_fd)
+                # sockets of other clients are closed, otherwise their connections aren't closed until this job ends
+                os.closerange(3, write_fd)
+                os.closerange(write_fd + 1, os.sysconf('SC_OPEN_MAX'))
+                self.generate(job, seed_trie, write_fd)
+
+            except BaseException:
+                exit_code = 1
+
+            finally:
+                os._exit(exit_code)
+
+        os.close(write_fd)
+        pipe_reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(pipe_reader),
+                                                    os.fdopen(read_fd, 'rb'))
+
+        if self.stats:
+            print(f"[SERVICE]: Generate {job['generator']} job in process {pid}")
+
+        # output of job process which was killed could end inside of the line
+        line_ended = True
+
+        try:
+            while True:
+                chunk = await pipe_reader.read(self.CHUNK_SIZE)
+
+                if not chunk:
+                    break
+
+                writer.write(chunk)
+                await writer.drain()
+                line_ended = chunk.endswith(b'\n')
+
+        except ConnectionError:
+            os.kill(pid, signal.SIGKILL)
+            raise
+
+        finally:
+            transport.close()
+            _, status = await loop.run_in_executor(None, os.waitpid, pid, 0)
+
+        if status:
+            # job process didn't finish the response, so the service finishes it by error line
+            if os.WIFSIGNALED(status):
+                exc = ChildProcessError(f"Job process was killed by signal {os.WTERMSIG(status)}")
+
+            else:
+                exc = ChildProcessError(f"Job process failed with exit code {os.WEXITSTATUS(status)}")
+
+            writer.write((b'' if line_ended else b'\n') + self.get_status_line(exc))
+            await writer.drain()
+
+    @staticmethod
+    def generate(job: Dict, seed_trie: AbstractTrie, write_fd: int) -> None:
+        """Generate job and write status line, generated prefixes and end line to :param write_fd. Is called in job
+        process.
+
+        :param job: dictionary; job parameters
+        :param seed_trie: warm seed trie
+        :param write_fd: int; file descriptor of the pipe to the service process
+        :return: None
+        """
+        with os.fdopen(write_fd, 'w') as file:
+            try:
+                new_prefixes = GenerationService.create_generator(job, seed_trie).stream_generating()
+
+            except Exception as exc:
+                file.write(GenerationService.get_status_line(exc).decode())
+                return
+
+            file.write(GenerationService.get_status_line().decode())
+
+            try:
+                prefixes_num = Converter.write_prefixes(new_prefixes, file)
+
+            except Exception as exc:
+                # whole chunks of prefixes are written, so the error line starts on new line
+                file.write(GenerationService.get_status_line(exc).decode())
+                return
+
+            file.write(GenerationService.get_end_line(prefixes_num).decode())
+
+    @staticmethod
+    def create_generator(job: Dict, seed_trie: AbstractTrie):
+        """Create generator of the job. Seed trie is cloned by generator.
+
+        :raises ValueError, KeyError in case if job parameters aren't correct
+        :param job: dictionary; job parameters
+        :param seed_trie: warm seed trie
+        :return: V6Gene or IPv6Gene generator
+        """
+        if 'depth_distribution_path' in job:
+            depth_distribution = InputArgumentsValidator.parse_depth_distribution_file(job['depth_distribution_path'])
+
+        else:
+            depth_distribution = GenerationService.get_distribution(job['depth_distribution'], 65)
+
+        prefix_quantity = InputArgumentsValidator.validate_prefix_quantity(job['prefix_quantity'])
+        seed = None if job.get('seed') is None else InputArgumentsValidator.validate_seed(job['seed'])
+
+        if job['generator'] == 'ipv6gene':
+            return IPv6GeneGenerator(prefix_quantity=prefix_quantity, depth_distribution=depth_distribution,
+                                     max_level=InputArgumentsValidator.parse_level_distribution(job['max_level']),
+                                     seed_trie=seed_trie, seed=seed, bulk=bool(job.get('bulk', False)))
+
+        return V6GeneGenerator(prefix_quantity=prefix_quantity, rgr=float(job['rgr']),
+                               depth_distribution=depth_distribution,
+                               level_distribution=GenerationService.get_distribution(job['level_distribution'], 6),
+                               seed_trie=seed_trie, seed=seed)
+
+    @staticmethod
+    def get_distribution(distribution: Dict, size: int) -> Dict[int, int]:
+        """Convert distribution from JSON object (keys are strings) to dictionary with integer keys. Missing depths or
+        levels have zero prefixes, the same as in distributions parsed from input arguments.
+
+        :param distribution: dictionary; depth or level: number of prefixes
+        :param size: int; number of depths or levels
+        :return: dictionary; depth or level: number of prefixes
+        """
+        result = {key: 0 for key in range(size)}
+        result.update((int(key), int(value)) for key, value in distribution.items())
+
+        return result
+
+    @staticmethod
+    def get_status_line(exc: Optional[Exception] = None) -> bytes:
+        """Create status line of the response.
+
+        :param exc: exception which stopped the job or None if job was generated
+        :return: bytes; JSON status line
+        """
+        if exc is None:
+            status = {'status': 'ok'}
+
+        elif isinstance(exc, KeyError):
+            status = {'status': 'error', 'message': f"Job parameter {exc} is required"}
+
+        else:
+            status = {'status': 'error', 'message': str(exc) or type(exc).__name__}
+
+        return (json.dumps(status) + '\n').encode()
+
+    @staticmethod
+    def get_end_line(prefixes_num: int) -> bytes:
+        """Create end line of the response of generated job.
+
+        :param prefixes_num: int; number of generated prefixes
+        :return: bytes; JSON end line
+        """
+        return (json.dumps({'status': 'done', 'prefixes': prefixes_num}) + '\n').encode()
+
+    @staticmethod
+    def read_response(response: TextIO) -> Iterator[str]:
+        """Iterate over generated prefixes of the response. Lines of prefixes never start with '{', so status line
+        which follows prefixes is the end line or the error of the job.
+
+        :raises ValueError in case if job couldn't be generated or response isn't finished
+        :param response: text stream of the response
+        :return: iterator over generated prefixes
+        """
+        status = json.loads(response.readline() or '{"status": "error", "message": "Connection closed"}')
+
+        if status['status'] != 'ok':
+            raise ValueError(status['message'])
+
+        prefixes_num = 0
+
+        for line in response:
+            if line.startswith('{'):
+                status = json.loads(line)
+
+                if status['status'] != 'done':
+                    raise ValueError(status['message'])
+
+                if status['prefixes'] != prefixes_num:
+                    raise ValueError(f"Job generated {status['prefixes']} prefixes, {prefixes_num} were received")
+
+                return
+
+            prefixes_num += 1
+            yield line.rstrip('\n')
+
+        raise ValueError("Connection closed before the job was finished")
+
+    @staticmethod
+    def request(socket_path: str, job: Dict) -> Iterator[str]:
+        """Send job to the running service and iterate over generated prefixes.
+
+        :raises ValueError in case if job couldn't be generated or connection was closed before the job was finished
+        :param socket_path: string; path to the service socket
+        :param job: dictionary; job parameters
+        :return: iterator over generated prefixes
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            client.sendall((json.dumps(job) + '\n').encode())
+
+            with client.makefile('r') as response:
+                yield from GenerationService.read_response(response)
@@ -0,0 +1,134 @@
+# was developed by Utkin Kirill
+
+from typing import Optional
+
+
+class CompactNode:
+    """
+    Lightweight handle for the node saved in NodeStorage. Provides the same attributes as Common.Trie.Node.Node, so
+    all trie algorithms could work with both representations. Handle objects are created on demand and could be
+    dropped at any time, all data are saved in storage arrays
+    """
+    __slots__ = ('storage', 'index')
+
+    def __init__(self, storage, index: int) -> None:
+        self.storage = storage
+        self.index = index
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CompactNode) and other.storage is self.storage and other.index == self.index
+
+    def __hash__(self) -> int:
+        return self.index
+
+    def __repr__(self) -> str:
+        return f"CompactNode(index={self.index}, depth={self.depth}, level={self.level}, prefix={self.prefix_flag})"
+
+    def _get_index(self, node: Optional['CompactNode']) -> int:
+        if node is None:
+            return self.storage.NO_NODE
+
+        return node.index
+
+    @property
+    def node_value(self) -> Optional[int]:
+        if self.index == self.storage.ROOT:
+            return None
+
+        return self.storage.value[self.index]
+
+    @node_value.setter
+    def node_value(self, value: int) -> None:
+        self.storage.value[self.index] = value
+
+    @property
+    def depth(self) -> int:
+        return self.storage.depth[self.index]
+
+    @property
+    def level(self) -> int:
+        return self.storage.level[self.index]
+
+    @level.setter
+    def level(self, value: int) -> None:
+        self.storage.level[self.index] = value
+
+    @property
+    def max_child_level(self) -> int:
+        return self.storage.child_level[self.index]
+
+    @max_child_level.setter
+    def max_child_level(self, value: int) -> None:
+        self.storage.child_level[self.index] = value
+
+    @property
+    def left_child(self) -> Optional['CompactNode']:
+        index = self.storage.left[self.index]
+
+        return CompactNode(self.storage, index) if index >= 0 else None
+
+    @left_child.setter
+    def left_child(self, node: Optional['CompactNode']) -> None:
+        self.storage.left[self.index] = self._get_index(node)
+
+    @property
+    def right_child(self) -> Optional['CompactNode']:
+        index = self.storage.right[self.index]
+
+        return CompactNode(self.storage, index) if index >= 0 else None
+
+    @right_child.setter
+    def right_child(self, node: Optional['CompactNode']) -> None:
+        self.storage.right[self.index] = self._get_index(node)
+
+    @property
+    def path(self) -> Optional['CompactNode']:
+        index = self.storage.parent[self.index]
+
+        return CompactNode(self.storage, index) if index >= 0 else None
+
+    @path.setter
+    def path(self, node: Optional['CompactNode']) -> None:
+        self.storage.parent[self.index] = self._get_index(node)
+
+    @property
+    def prefix_parent(self) -> Optional['CompactNode']:
+        index = self.storage.prefix_parent[self.index]
+
+        return CompactNode(self.storage, index) if index >= 0 else None
+
+    @prefix_parent.setter
+    def prefix_parent(self, node: Optional['CompactNode']) -> None:
+        self.storage.prefix_parent[self.index] = self._get_index(node)
+
+    @property
+    def prefix_flag(self) -> bool:
+        return bool(self.storage.flags[self.index] & self.storage.PREFIX)
+
+    @prefix_flag.setter
+    def prefix_flag(self, value: bool) -> None:
+        self.storage.set_flag(self.index, self.storage.PREFIX, value)
+
+    @property
+    def is_visited(self) -> bool:
+        return bool(self.storage.flags[self.index] & self.storage.VISITED)
+
+    @is_visited.setter
+    def is_visited(self, value: bool) -> None:
+        self.storage.set_flag(self.index, self.storage.VISITED, value)
+
+    @property
+    def allow_generate(self) -> bool:
+        return bool(self.storage.flags[self.index] & self.storage.ALLOW_GENERATE)
+
+    @allow_generate.setter
+    def allow_generate(self, value: bool) -> None:
+        self.storage.set_flag(self.index, self.storage.ALLOW_GENERATE, value)
+
+    @property
+    def generated(self) -> bool:
+        return bool(self.storage.flags[self.index] & self.storage.GENERATED)
+
+    @generated.setter
+    def generated(self, value: bool) -> None:
+        self.storage.set_flag(self.index, self.storage.GENERATED, value)
@@ -0,0 +1,422 @@
+# was developed by Utkin Kirill
+
+import attr
+import copy
+import numpy as np
+
+from array import array
+from typing import Dict, Iterator, List, Tuple
+from Common.Trie.Compact.CompactNode import CompactNode
+
+
+@attr.s
+class NodeStorage:
+    """
+    Struct-of-arrays storage for binary trie nodes. Every node is identified by integer index and all node attributes
+    are saved in parallel typed arrays instead of separate python objects
+    """
+    NO_NODE = -1
+    ROOT = 0
+
+    # bit masks for flags array
+    PREFIX = 1
+    VISITED = 2
+    ALLOW_GENERATE = 4
+    GENERATED = 8
+
+    value = attr.ib(factory=lambda: array('B'), type=array)
+    depth = attr.ib(factory=lambda: array('B'), type=array)
+    level = attr.ib(factory=lambda: array('B'), type=array)
+    child_level = attr.ib(factory=lambda: array('b'), type=array)
+    flags = attr.ib(factory=lambda: array('B'), type=array)
+    left = attr.ib(factory=lambda: array('i'), type=array)
+    right = attr.ib(factory=lambda: array('i'), type=array)
+    parent = attr.ib(factory=lambda: array('i'), type=array)
+    prefix_parent = attr.ib(factory=lambda: array('i'), type=array)
+
+    _free_nodes = attr.ib(factory=list, type=List[int])
+
+    # names of storage arrays, order is used by snapshot files
+    COLUMNS = ('value', 'depth', 'level', 'child_level', 'flags', 'left', 'right', 'parent', 'prefix_parent')
+
+    # arrays which contain indexes of other nodes
+    LINK_COLUMNS = ('left', 'right', 'parent', 'prefix_parent')
+
+    def __attrs_post_init__(self) -> None:
+        if not len(self.depth):
+            self.allocate(0, 0, self.NO_NODE)
+
+    @property
+    def columns(self) -> List[array]:
+        return [getattr(self, name) for name in self.COLUMNS]
+
+    @property
+    def free_nodes(self) -> List[int]:
+        return self._free_nodes
+
+    @property
+    def root(self) -> CompactNode:
+        return self.node(self.ROOT)
+
+    @property
+    def nodes_num(self) -> int:
+        """Return number of nodes which are currently used in the trie.
+
+        :return: int; number of allocated nodes without released ones
+        """
+        return len(self.depth) - len(self._free_nodes)
+
+    def copy(self) -> 'NodeStorage':
+        """Create independent copy of the storage. Arrays are copied at once, node objects aren't created.
+
+        :return: NodeStorage object
+        """
+        columns = {name: copy.copy(column) for name, column in zip(self.COLUMNS, self.columns)}
+
+        return NodeStorage(free_nodes=list(self._free_nodes), **columns)
+
+    def node(self, index: int) -> CompactNode:
+        """Return node object for node with :param index.
+
+        :param index: int; index of node in storage arrays
+        :return: CompactNode object which works with storage arrays
+        """
+        return CompactNode(self, index)
+
+    def allocate(self, node_value: int, node_depth: int, parent_index: int) -> int:
+        """Allocate new node in storage. Released node indexes are used before arrays are extended.
+
+        :param node_value: int; bits of the edge between parent node and the node
+        :param node_depth: int; depth of new node in binary trie
+        :param parent_index: int; index of the parent node
+        :return: int; index of new node
+        """
+        if self._free_nodes:
+            index = self._free_nodes.pop()
+
+            self.value[index] = node_value
+            self.depth[index] = node_depth
+            self.level[index] = 0
+            self.child_level[index] = -1
+            self.flags[index] = self.ALLOW_GENERATE
+            self.left[index] = self.NO_NODE
+            self.right[index] = self.NO_NODE
+            self.parent[index] = parent_index
+            self.prefix_parent[index] = self.NO_NODE
+
+            return index
+
+        self.value.append(node_value)
+        self.depth.append(node_depth)
+        self.level.append(0)
+        self.child_level.append(-1)
+        self.flags.append(self.ALLOW_GENERATE)
+        self.left.append(self.NO_NODE)
+        self.right.append(self.NO_NODE)
+        self.parent.append(parent_index)
+        self.prefix_parent.append(self.NO_NODE)
+
+        return len(self.depth) - 1
+
+    def release(self, index: int) -> None:
+        """Return node with :param index back to storage. Index will be used for next allocated node.
+
+        :param index: int; index of the node which was removed from trie
+        :return: None
+        """
+        if index == self.ROOT:
+            return
+
+        self._free_nodes.append(index)
+
+    def prefix_path(self, index: int) -> List[int]:
+        """Return indexes of all prefix nodes on the path from node with :param index to the root node. Same as
+        AbstractTrie.get_just_prefix_path, but works directly with storage arrays.
+
+        :param index: int; index of the start node
+        :return: list; indexes of prefix nodes, start node is first if it is a prefix node. Root node isn't included
+        """
+        full_path = list()
+        parent = self.parent
+        flags = self.flags
+
+        if not flags[index] & self.PREFIX:
+            index = parent[index]
+
+            while index != self.NO_NODE and not flags[index] & self.PREFIX:
+                index = parent[index]
+
+        while index != self.NO_NODE and parent[index] != self.NO_NODE:
+            full_path.append(index)
+            index = self.prefix_parent[index]
+
+        return full_path
+
+    def nearest_prefix_parent(self, index: int) -> int:
+        """Return index of the nearest prefix node above node with :param index. Root node isn't used as prefix parent.
+
+        :param index: int; index of the node
+        :return: int; index of prefix parent or NO_NODE
+        """
+        parent = self.parent
+        flags = self.flags
+        index = parent[index]
+
+        while index != self.NO_NODE and parent[index] != self.NO_NODE:
+
+            if flags[index] & self.PREFIX:
+                return index
+
+            index = parent[index]
+
+        return self.NO_NODE
+
+    def update_child_level(self, index: int) -> None:
+        """Update maximum level of child prefix nodes for all nodes above node with :param index. Same as
+        AbstractTrie.update_max_child_level, but works directly with storage arrays.
+
+        :param index: int; index of prefix node which was added or whose level was changed
+        :return: None
+        """
+        parent = self.parent
+        flags = self.flags
+        level = self.level
+        child_levels = self.child_level
+
+        child_level = level[index]
+        index = parent[index]
+
+        while index != self.NO_NODE:
+
+            if child_levels[index] < child_level:
+                child_levels[index] = child_level
+
+            if flags[index] & self.PREFIX:
+                child_level = level[index]
+
+            index = parent[index]
+
+    def sweep_levels(self, leaf_nodes: Dict[int, int]) -> int:
+        """Compute levels, maximum child levels and prefix parent links of all nodes at once. Same as the sweep in
+        AbstractTrie.bulk_load, but works directly with storage arrays.
+
+        :param leaf_nodes: dictionary; number of leaf nodes by depth, is updated by found leaf nodes
+        :return: int; maximum level of prefix nodes
+        """
+        left = self.left
+        right = self.right
+        flags = self.flags
+        level = self.level
+        child_levels = self.child_level
+        prefix_parents = self.prefix_parent
+        max_level = 0
+
+        # pre-order walk, nearest parent prefix node is passed down to every node
+        sweep_order = list()
+        node_stack = [(self.ROOT, self.NO_NODE)]
+
+        while node_stack:
+            index, prefix_parent = node_stack.pop()
+            sweep_order.append(index)
+
+            if flags[index] & self.PREFIX:
+                prefix_parents[index] = prefix_parent
+                prefix_parent = index
+
+            for child in (right[index], left[index]):
+                if child != self.NO_NODE:
+                    node_stack.append((child, prefix_parent))
+
+        # post-order sweep, all children are processed before the parent node
+        for index in reversed(sweep_order):
+            max_child_level = -1
+
+            for child in (left[index], right[index]):
+                if child != self.NO_NODE:
+                    child_level = level[child] if flags[child] & self.PREFIX else child_levels[child]
+
+                    if child_level > max_child_level:
+                        max_child_level = child_level
+
+            if left[index] == self.NO_NODE and right[index] == self.NO_NODE:
+                leaf_nodes[self.depth[index]] += 1
+
+            child_levels[index] = max_child_level
+
+            if flags[index] & self.PREFIX:
+                level[index] = max_child_level + 1
+
+                if max_child_level + 1 > max_level:
+                    max_level = max_child_level + 1
+
+        return max_level
+
+    def count_nodes(self, leaf_nodes: Dict[int, int], level_nodes: Dict[int, int]) -> None:
+        """Count leaf nodes by depth and prefix nodes by level with array operations. Released nodes aren't counted.
+
+        :param leaf_nodes: dictionary; number of leaf nodes by depth, is updated by found leaf nodes
+        :param level_nodes: dictionary; number of prefix nodes by level, is updated by found prefix nodes
+        :return: None
+        """
+        used_nodes = np.ones(len(self.depth), dtype=bool)
+        used_nodes[self._free_nodes] = False
+
+        depth = np.array(self.depth, dtype=np.uint8)
+        level = np.array(self.level, dtype=np.uint8)
+        leaf_mask = used_nodes & (np.array(self.left, dtype=np.int32) == self.NO_NODE) & \
+            (np.array(self.right, dtype=np.int32) == self.NO_NODE)
+        prefix_mask = used_nodes & (np.array(self.flags, dtype=np.uint8) & self.PREFIX > 0)
+
+        for depth_value, nodes_num in enumerate(np.bincount(depth[leaf_mask]).tolist()):
+            if nodes_num:
+                leaf_nodes[depth_value] = leaf_nodes.get(depth_value, 0) + nodes_num
+
+        for level_value, nodes_num in enumerate(np.bincount(level[prefix_mask]).tolist()):
+            if nodes_num:
+                level_nodes[level_value] = level_nodes.get(level_value, 0) + nodes_num
+
+    def iter_prefixes(self, index: int) -> Iterator[Tuple[int, int]]:
+        """Iterate over all prefix nodes and leaf nodes in sub-trie with root :param index in address order. Trie isn't
+        changed, so method could be called repeatedly.
+
+        :param index: int; index of the sub-trie root
+        :return: iterator of prefixes as (prefix value, prefix len) tuples. Prefix len is counted from the parent of
+                 the sub-trie root, same as in AbstractTrie.iterate_prefixes
+        """
+        left = self.left
+        right = self.right
+        flags = self.flags
+        depth = self.depth
+        value = self.value
+
+        if index == self.ROOT:
+            start_depth = 0
+            node_stack = [(index, 0)]
+        else:
+            start_depth = depth[self.parent[index]]
+            node_stack = [(index, value[index])]
+
+        while node_stack:
+            index, prefix_value = node_stack.pop()
+
+            if flags[index] & self.PREFIX or (left[index] == self.NO_NODE and right[index] == self.NO_NODE):
+                yield prefix_value, depth[index] - start_depth
+
+            for child in (right[index], left[index]):
+                if child != self.NO_NODE:
+                    node_stack.append((child, (prefix_value << (depth[child] - depth[index])) | value[child]))
+
+    def get_blocks(self, block_len: int) -> np.ndarray:
+        """Split nodes to blocks by first :param block_len bits of their prefixes. Nodes in different blocks are placed
+        in disjoint sub-tries.
+
+        :param block_len: int; number of bits which identify the block
+        :return: numpy array; block of every node, -1 for nodes which are placed above blocks
+        """
+        left = self.left
+        right = self.right
+        depth = self.depth
+        value = self.value
+
+        blocks = np.full(len(depth), -1, dtype=np.int64)
+        node_stack = [(self.ROOT, 0)]
+
+        while node_stack:
+            index, prefix_value = node_stack.pop()
+
+            if depth[index] >= block_len:
+                blocks[index] = prefix_value >> (depth[index] - block_len)
+
+            for child in (right[index], left[index]):
+                if child != self.NO_NODE:
+                    node_stack.append((child, (prefix_value << (depth[child] - depth[index])) | value[child]))
+
+        return blocks
+
+    def get_columns_data(self, indexes: np.ndarray) -> Dict[str, np.ndarray]:
+        """Get values of all arrays for nodes with :param indexes.
+
+        :param indexes: numpy array; node indexes
+        :return: dictionary; array name: values
+        """
+        return {name: np.frombuffer(column, dtype=column.typecode)[indexes].copy()
+                for name, column in zip(self.COLUMNS, self.columns)}
+
+    def merge_nodes(self, start: int, new_nodes: Dict[str, np.ndarray], indexes: np.ndarray,
+                    changed_nodes: Dict[str, np.ndarray]) -> None:
+        """Merge nodes which were added and changed by other copy of this storage (e.g. in worker process).
+
+        New nodes had indexes from :param start in other storage, they are appended to the end of this storage and
+        links to them are moved. Changed nodes replace nodes with the same :param indexes.
+
+        :param start: int; index of the first new node in other storage
+        :param new_nodes: dictionary; array name: values of new nodes
+        :param indexes: numpy array; indexes of changed nodes
+        :param changed_nodes: dictionary; array name: values of changed nodes
+        :return: None
+        """
+        offset = len(self.depth) - start
+
+        for name in self.LINK_COLUMNS:
+            for values in (new_nodes[name], changed_nodes[name]):
+                values[values >= start] += offset
+
+        for name, column in zip(self.COLUMNS, self.columns):
+            column_view = np.frombuffer(column, dtype=column.typecode)
+            column_view[indexes] = changed_nodes[name]
+
+            # array can't be extended while numpy view exists
+            del column_view
+            column.frombytes(new_nodes[name].astype(column.typecode).tobytes())
+
+    def update_top_levels(self, block_len: int) -> None:
+        """Update levels and maximum child levels of nodes which are placed above blocks (see get_blocks). Is used after
+        merging nodes of all blocks.
+
+        :param block_len: int; number of bits which identify the block
+        :return: None
+        """
+        left = self.left
+        right = self.right
+        flags = self.flags
+        level = self.level
+        child_levels = self.child_level
+
+        top_nodes = list()
+        node_stack = [self.ROOT]
+
+        while node_stack:
+            index = node_stack.pop()
+            top_nodes.append(index)
+
+            for child in (right[index], left[index]):
+                if child != self.NO_NODE and self.depth[child] < block_len:
+                    node_stack.append(child)
+
+        for index in reversed(top_nodes):
+            max_child_level = -1
+
+            for child in (left[index], right[index]):
+                if child != self.NO_NODE:
+                    child_level = level[child] if flags[child] & self.PREFIX else child_levels[child]
+
+                    if child_level > max_child_level:
+                        max_child_level = child_level
+
+            child_levels[index] = max_child_level
+
+            if flags[index] & self.PREFIX and level[index] < max_child_level + 1:
+                level[index] = max_child_level + 1
+
+    def set_flag(self, index: int, flag: int, value: bool) -> None:
+        if value:
+            self.flags[index] |= flag
+        else:
+            self.flags[index] &= ~flag & 0xFF
+
+    def memory_usage(self) -> int:
+        """Return number of bytes used by storage arrays.
+
+        :return: int; size of all arrays in bytes
+        """
+        return sum(len(column) * column.itemsize for column in self.columns)
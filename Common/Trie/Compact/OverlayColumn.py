@@ -0,0 +1,57 @@
+# was developed by Utkin Kirill
+
+from array import array
+
+
+class OverlayColumn:
+    """
+    Storage array which consists of read-only part mapped from the snapshot file and small private array for nodes
+    which were added after snapshot was loaded. Supports the same operations as array, which are used by NodeStorage.
+    Snapshot file is mapped in copy-on-write mode, so changed values of seed nodes are saved just in the memory
+    pages of current process and file stays the same for all other processes
+    """
+    __slots__ = ('base', 'overlay', 'base_len', 'typecode', 'itemsize')
+
+    def __init__(self, base: memoryview, typecode: str) -> None:
+        self.base = base
+        self.overlay = array(typecode)
+        self.base_len = len(base)
+        self.typecode = typecode
+        self.itemsize = self.overlay.itemsize
+
+    def __len__(self) -> int:
+        return self.base_len + len(self.overlay)
+
+    def __getitem__(self, index: int) -> int:
+        if index < self.base_len:
+            return self.base[index]
+
+        return self.overlay[index - self.base_len]
+
+    def __setitem__(self, index: int, value: int) -> None:
+        if index < self.base_len:
+            self.base[index] = value
+        else:
+            self.overlay[index - self.base_len] = value
+
+    def __iter__(self):
+        yield from self.base
+        yield from self.overlay
+
+    def append(self, value: int) -> None:
+        self.overlay.append(value)
+
+    def __copy__(self) -> array:
+        """Return private copy of all values as array.
+
+        :return: array; values of mapped and private part
+        """
+        values = array(self.typecode)
+        values.frombytes(self.base.cast('B'))
+        values.extend(self.overlay)
+
+        return values
+
+    def tofile(self, file) -> None:
+        file.write(self.base)
+        self.overlay.tofile(file)
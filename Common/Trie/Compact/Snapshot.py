@@ -0,0 +1,154 @@
+# was developed by Utkin Kirill
+
+import attr
+import hashlib
+import mmap
+import os
+import struct
+
+from array import array
+from typing import Dict
+from Common.Trie.Compact.NodeStorage import NodeStorage
+from Common.Trie.Compact.OverlayColumn import OverlayColumn
+
+
+@attr.s
+class Snapshot:
+    """
+    Binary snapshot of the seed trie saved in NodeStorage. Contains all storage arrays, trie level and depth, depth
+    distribution of prefix nodes, leaf nodes and order in which seed prefix nodes were added. Whole file is read at once
+    and arrays are created directly from the file data. Snapshot could be also mapped to memory, then all processes
+    which use the same snapshot share one copy of seed trie
+    """
+    MAGIC = b'V6TRIE'
+    VERSION = 2
+
+    # every array starts at offset aligned to this value, so arrays could be used directly in mapped file
+    ALIGNMENT = 8
+
+    # magic, version, path compression, trie level, trie depth, column typecodes, number of nodes, number of released
+    # nodes, number of seed prefix nodes
+    HEADER = struct.Struct('=6sHBBB9sIII')
+
+    # depth histograms contain values for depth 0 - 64
+    HISTOGRAM = struct.Struct('=65I')
+
+    storage = attr.ib(type=NodeStorage)
+    path_compression = attr.ib(default=False, type=bool)
+    trie_level = attr.ib(default=0, type=int)
+    trie_depth = attr.ib(default=0, type=int)
+    prefix_nodes = attr.ib(factory=dict, type=Dict)
+    leaf_nodes = attr.ib(factory=dict, type=Dict)
+    prefix_order = attr.ib(factory=lambda: array('i'), type=array)
+
+    @staticmethod
+    def get_snapshot_path(cache_dir: str, seed_file: str, path_compression: bool) -> str:
+        """Get path to the snapshot of seed trie. Snapshot is identified by hash of seed file content, so snapshot is
+        created again just when seed file is changed.
+
+        :param cache_dir: string; folder with snapshot files
+        :param seed_file: string; path to the seed file
+        :param path_compression: boolean; signalize that snapshot contains path compressed trie
+        :return: string; path to the snapshot file
+        """
+        seed_hash = hashlib.sha256()
+
+        with open(seed_file, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                seed_hash.update(chunk)
+
+        trie_type = 'patricia' if path_compression else 'binary'
+
+        return os.path.join(cache_dir, f"{seed_hash.hexdigest()}.{trie_type}.v{Snapshot.VERSION}.trie")
+
+    def save(self, path: str) -> None:
+        """Write snapshot to the file. File is written to temporary file first, so parallel jobs never read
+        incomplete snapshot.
+
+        :param path: string; path to the snapshot file
+        :return: None
+        """
+        columns = self.storage.columns
+        free_nodes = array('i', self.storage.free_nodes)
+
+        header = self.HEADER.pack(
+            self.MAGIC, self.VERSION, self.path_compression, self.trie_level, self.trie_depth,
+            ''.join(column.typecode for column in columns).encode(), len(self.storage.depth), len(free_nodes),
+            len(self.prefix_order)
+        )
+
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+
+        with open(temporary_path, 'wb') as file:
+            file.write(header)
+            file.write(self.HISTOGRAM.pack(*(self.prefix_nodes.get(depth, 0) for depth in range(65))))
+            file.write(self.HISTOGRAM.pack(*(self.leaf_nodes.get(depth, 0) for depth in range(65))))
+
+            for column in columns + [free_nodes, self.prefix_order]:
+                file.write(bytes(-file.tell() % self.ALIGNMENT))
+                column.tofile(file)
+
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def load(path: str, memory_map: bool = False) -> 'Snapshot':
+        """Read snapshot from the file.
+
+        If :param memory_map is set, file is mapped to memory in copy-on-write mode instead of reading. Storage arrays
+        of seed nodes are used directly in mapped pages, which are shared by all processes that map the same file.
+        Nodes which are added later are saved in private arrays (see OverlayColumn).
+
+        :raises ValueError in case if file isn't a snapshot or was created by other version of snapshot format
+
+        :param path: string; path to the snapshot file
+        :param memory_map: boolean; map file to memory instead of reading
+        :return: Snapshot object
+        """
+        with open(path, 'rb') as file:
+            if memory_map:
+                data = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY))
+            else:
+                data = memoryview(file.read())
+
+        magic, version, path_compression, trie_level, trie_depth, typecodes, nodes_num, free_num, prefixes_num = \
+            Snapshot.HEADER.unpack_from(data)
+
+        if magic != Snapshot.MAGIC or version != Snapshot.VERSION:
+            raise ValueError(f"File {path} isn't a seed trie snapshot of version {Snapshot.VERSION}")
+
+        offset = Snapshot.HEADER.size
+        prefix_nodes = dict(enumerate(Snapshot.HISTOGRAM.unpack_from(data, offset)))
+        offset += Snapshot.HISTOGRAM.size
+        leaf_nodes = dict(enumerate(Snapshot.HISTOGRAM.unpack_from(data, offset)))
+        offset += Snapshot.HISTOGRAM.size
+
+        def read_array(typecode: str, length: int, mapped: bool = False):
+            nonlocal offset
+
+            offset += -offset % Snapshot.ALIGNMENT
+            size = length * array(typecode).itemsize
+            column_data = data[offset:offset + size]
+            offset += size
+
+            if mapped:
+                return OverlayColumn(column_data.cast(typecode), typecode)
+
+            values = array(typecode)
+            values.frombytes(column_data)
+
+            return values
+
+        columns = {name: read_array(chr(typecode), nodes_num, memory_map)
+                   for name, typecode in zip(NodeStorage.COLUMNS, typecodes)}
+        free_nodes = read_array('i', free_num).tolist()
+        prefix_order = read_array('i', prefixes_num)
+
+        return Snapshot(
+            storage=NodeStorage(free_nodes=free_nodes, **columns),
+            path_compression=bool(path_compression),
+            trie_level=trie_level,
+            trie_depth=trie_depth,
+            prefix_nodes=prefix_nodes,
+            leaf_nodes=leaf_nodes,
+            prefix_order=prefix_order
+        )
@@ -18,7 +18,11 @@ class Node:
     right_child = attr.ib(default=None)
     prefix_flag = attr.ib(default=False, type=bool)
     level = attr.ib(default=0, type=int)
+    # maximum level of the nearest child prefix nodes, -1 if node doesn't have any child prefix nodes
+    max_child_level = attr.ib(default=-1, type=int)
     path = attr.ib(default=None)
+    # the nearest parent prefix node, is set just for prefix nodes
+    prefix_parent = attr.ib(default=None)
     is_visited = attr.ib(default=False, type=bool)
     allow_generate = attr.ib(default=True, type=bool)
 
@@ -27,6 +31,6 @@ class Node:
 
     @node_value.validator
     def node_value_validator(self, attribute, value):
-        if value not in (None, '0', '1'):
-            raise ValueError(f"node value has to be 0, 1 or None value. Get {value} ")
+        if value is not None and (not isinstance(value, int) or value < 0):
+            raise ValueError(f"node value has to be non-negative integer or None value. Get {value} ")
 
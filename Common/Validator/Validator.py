@@ -2,13 +2,20 @@
 
 
 import argparse
-import ipaddress
+import multiprocessing
+import socket
+import numpy as np
 
-from Common.Abstract.AbstractHelper import AbstractHelper
-from typing import List
+from typing import List, Tuple
 
 
 class InputArgumentsValidator:
+    # approximate number of bytes of seed file which are parsed at once
+    SEED_CHUNK_SIZE = 1 << 20
+
+    # allowed prefix lens (via allocation policy)
+    MIN_SEED_PREFIX_LEN = 12
+    MAX_SEED_PREFIX_LEN = 64
 
     @staticmethod
     def validate_file(path, modifier) -> bool:
@@ -96,37 +103,105 @@ class InputArgumentsValidator:
             raise
 
     @staticmethod
-    def read_seed_file(seed_file) -> List[str]:
+    def validate_workers(value) -> int:
+        """
+        Validate number of worker processes
+        :raises ArgumentTypeError in case if value of argument is not correct
+        :param value: number of worker processes
+        :return: converted value
+        """
+        value = int(value)
+
+        if value < 1:
+            raise argparse.ArgumentTypeError("Number of workers should be a positive number")
+
+        return value
+
+    @staticmethod
+    def validate_seed(value) -> int:
+        """
+        Validate seed of random generator
+        :raises ArgumentTypeError in case if value of argument is not correct
+        :param value: seed of random generator
+        :return: converted value
+        """
+        value = int(value)
+
+        if value < 0:
+            raise argparse.ArgumentTypeError("Seed of random generator can't be a negative number")
+
+        return value
+
+    @staticmethod
+    def parse_seed_lines(lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Parse chunk of seed file lines. Addresses are converted to packed bytes by inet_pton, all packed addresses of
+        the chunk are converted to integer array at once. Invalid addresses and prefixes with not allowed length are
+        pruned
+        :param lines: lines of seed file
+        :return: tuple of numpy arrays; prefix values and prefix lens
+        """
+        packed_addresses = bytearray()
+        prefix_lens = list()
+
+        for line in lines:
+            address, _, prefix_len = line.rstrip('\n').partition('/')
+
+            try:
+                packed_address = socket.inet_pton(socket.AF_INET6, address)
+
+            # Prune invalid prefixes
+            except (OSError, ValueError):
+                continue
+
+            prefix_len = int(prefix_len)
+
+            # prefix value belongs to the interval <12, 64>
+            if prefix_len < InputArgumentsValidator.MIN_SEED_PREFIX_LEN or \
+                    prefix_len > InputArgumentsValidator.MAX_SEED_PREFIX_LEN:
+                continue
+
+            packed_addresses += packed_address
+            prefix_lens.append(prefix_len)
+
+        # just first 64 bits are used, because prefix len isn't greater than 64
+        high_bits = np.frombuffer(bytes(packed_addresses), dtype='>u8')[::2].astype(np.uint64)
+        prefix_lens = np.array(prefix_lens, dtype=np.uint64)
+
+        return high_bits >> (np.uint64(64) - prefix_lens), prefix_lens
+
+    @staticmethod
+    def read_seed_file(seed_file, workers: int = 1) -> List[Tuple[int, int]]:
         """
         Read input prefix seed file. During the reading check if prefix is valid (has a prefix len greater than 12
-        (via allocation policy) and less than 64 (via allocation policy)). After that convert prefix to binary form (use
-        string for end representation of binary form) and save converted prefix to set.
+        (via allocation policy) and less than 64 (via allocation policy)). File is read and converted to integer form
+        (prefix value and prefix len) by chunks, duplicate prefixes are removed after all chunks are parsed.
         :param seed_file: sed file with prefixes
-        :return: filtered list with all prefixes in string format sorted by length
+        :param workers: number of processes which parse chunks of seed file
+        :return: filtered list with all prefixes as (prefix value, prefix len) tuples sorted by length and value
         """
-        verified_addresses = set()
-
         with open(seed_file, 'r') as fp:
-            # read file line by line
-            for line in fp:
-                address = line.rstrip('\n')
+            chunks = iter(lambda: fp.readlines(InputArgumentsValidator.SEED_CHUNK_SIZE), [])
+
+            if workers > 1:
+                with multiprocessing.Pool(workers) as pool:
+                    parsed_chunks = pool.map(InputArgumentsValidator.parse_seed_lines, chunks)
 
-                # separate line to list which contains address and prefix length
-                separated_line = address.split('/')
+            else:
+                parsed_chunks = [InputArgumentsValidator.parse_seed_lines(chunk) for chunk in chunks]
 
-                try:
-                    _ = ipaddress.IPv6Address(separated_line[0])
-                    prefix_len = int(separated_line[1])
+        if not parsed_chunks:
+            return list()
 
-                    # prefix value belongs to the interval <0, 64>
-                    if prefix_len < 12 or prefix_len > 64:
-                        continue
+        values = np.concatenate([chunk[0] for chunk in parsed_chunks])
+        prefix_lens = np.concatenate([chunk[1] for chunk in parsed_chunks])
 
-                    verified_addresses.add(AbstractHelper.get_binary_prefix(address))
+        # sort by length and value, prune redundant prefixes
+        order = np.lexsort((values, prefix_lens))
+        values = values[order]
+        prefix_lens = prefix_lens[order]
 
-                # Prune invalid prefixes
-                except ipaddress.AddressValueError:
-                    continue
+        unique = np.ones(len(values), dtype=bool)
+        unique[1:] = (values[1:] != values[:-1]) | (prefix_lens[1:] != prefix_lens[:-1])
 
-            # Prune redundant prefixes
-            return sorted(verified_addresses, key=len)
\ No newline at end of file
+        return list(zip(values[unique].tolist(), prefix_lens[unique].tolist()))
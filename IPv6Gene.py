@@ -1,10 +1,13 @@
 # was developed by Utkin Kirill
 
 import argparse
+import os
 import statistics
 import sys
-import time
 
+from Common.Converter.Converter import Converter
+from Common.Metrics.Metrics import Metrics
+from Common.Trie.Compact.Snapshot import Snapshot
 from Common.Validator.Validator import InputArgumentsValidator as validate
 from IPv6Gene.Generator.v6Generator import V6Generator
 
@@ -46,12 +49,63 @@ def parse_args():
 
     parser.add_argument('--stats', action='store_true', required=False, help="Print information during the generating process")
 
+    parser.add_argument('--graph_dpi', type=int, default=statistics.GRAPH_DPI, help="Resolution of output depth, "
+                                                                                    "level and bit distribution graphs")
+
+    parser.add_argument('--report', choices=statistics.REPORT_FORMATS, help="Save depth, level and bit distributions "
+                                                                            "of output prefixes to statistics folder "
+                                                                            "in JSON or CSV format. Graphs aren't "
+                                                                            "created without graph argument")
+
+    parser.add_argument('--compact_trie', action='store_true', required=False, help="Save binary trie nodes in compact "
+                                                                                    "array storage. Uses less memory")
+
+    parser.add_argument('--path_compression', action='store_true', required=False, help="Create one binary trie node "
+                                                                                        "per edge instead of one node "
+                                                                                        "per bit (path compressed "
+                                                                                        "trie)")
+
+    parser.add_argument('--seed_workers', type=validate.validate_workers, default=1, help="Number of processes which "
+                                                                                                  "parse the seed file")
+
+    parser.add_argument('--seed', type=validate.validate_seed, help="Seed of counter-based random generator. Output "
+                                                                    "is the same for the same seed and arguments. "
+                                                                    "Parallel output is the same for any number of "
+                                                                    "workers greater than 1, but differs from "
+                                                                    "sequential output. Python random module is used "
+                                                                    "if not given")
+
+    parser.add_argument('--seed_cache', help="Folder with seed trie snapshots. Seed trie is loaded from the snapshot "
+                                             "of the same seed file if it exists, otherwise snapshot is created")
+
+    parser.add_argument('--seed_mmap', action='store_true', required=False, help="Map seed trie snapshot from "
+                                                                                 "seed_cache folder to memory, so "
+                                                                                 "parallel runs share one copy of seed "
+                                                                                 "trie")
+
+    parser.add_argument('--workers', type=validate.validate_workers, default=1, help="Number of processes which "
+                                                                                      "generate prefixes by trie "
+                                                                                      "traversal")
+
+    parser.add_argument('--bulk', action='store_true', required=False, help="Generate prefixes of random and trie "
+                                                                            "traversal phase by batches of arrays. "
+                                                                            "Bits are sampled from bit model of seed "
+                                                                            "prefixes")
+
+    parser.add_argument('--stream', action='store_true', required=False, help="Convert and write generated prefixes "
+                                                                              "by chunks instead of creating the "
+                                                                              "whole output list in memory")
+
+    parser.add_argument('--metrics_out', help="Path to the JSON file for time of generating phases, number of "
+                                              "allocated nodes, failed attempts to add prefix and exhausted parent "
+                                              "nodes")
+
     return vars(parser.parse_args())
 
 
 def generator_start() -> None:
 
-    start = time.time()
+    metrics = Metrics()
     try:
         parsed_arguments = parse_args()
 
@@ -75,46 +129,105 @@ def generator_start() -> None:
     if parsed_arguments['output'] and not validate.validate_file(parsed_arguments['output'], 'r+'):
         sys.exit("Output file doesn't exist or is not writable")
 
-    input_prefixes = validate.read_seed_file(parsed_arguments['input'])
+    if parsed_arguments['seed_mmap'] and not parsed_arguments['seed_cache']:
+        sys.exit("Argument seed_mmap could be used just with seed_cache argument")
+
+    if parsed_arguments['seed_mmap'] and parsed_arguments['workers'] > 1:
+        sys.exit("Arguments seed_mmap and workers couldn't be combined")
+
+    if parsed_arguments['bulk'] and parsed_arguments['workers'] > 1:
+        sys.exit("Arguments bulk and workers couldn't be combined")
+
+    seed_snapshot = None
+
+    if parsed_arguments['seed_cache']:
+        os.makedirs(parsed_arguments['seed_cache'], exist_ok=True)
+        seed_snapshot = Snapshot.get_snapshot_path(parsed_arguments['seed_cache'], parsed_arguments['input'],
+                                                   parsed_arguments['path_compression'])
+
+    if seed_snapshot and os.path.exists(seed_snapshot):
+        # seed trie is loaded from the snapshot, seed file isn't parsed
+        input_prefixes = list()
+
+    else:
+        with metrics.measure('parse'):
+            input_prefixes = validate.read_seed_file(parsed_arguments['input'], parsed_arguments['seed_workers'])
 
     generator = V6Generator(
         prefix_quantity=parsed_arguments['prefix_quantity'],
         depth_distribution=depth_distribution,
         max_level=parsed_arguments['max_level'],
         input_prefixes=input_prefixes,
-        stats=parsed_arguments['stats']
+        stats=parsed_arguments['stats'],
+        compact_trie=parsed_arguments['compact_trie'],
+        path_compression=parsed_arguments['path_compression'],
+        seed_snapshot=seed_snapshot,
+        memory_map=parsed_arguments['seed_mmap'],
+        seed=parsed_arguments['seed'],
+        workers=parsed_arguments['workers'],
+        bulk=parsed_arguments['bulk'],
+        metrics=metrics
     )
 
     if parsed_arguments['stats']:
-        print(f"[INFO] Number of prefixes in seed input file is {len(set(input_prefixes))}")
+        if input_prefixes:
+            print(f"[INFO] Number of prefixes in seed input file is {len(input_prefixes)}")
+
         print(f"[INFO] Number of prefixes in constructed binary trie is {generator.get_binary_trie_prefixes_num()}")
         print(f"[INFO] Constructed binary trie depth is {generator.get_binary_trie_depth()}")
         print(f"[INFO] Constructed binary trie level is {generator.get_binary_trie_level()}")
 
-    new_prefixes = generator.start_generating()
-
-    if parsed_arguments['graph']:
-        statistics.create_stats(new_prefixes, 'ipv6gene', generator.get_root())
-
-    if not parsed_arguments['output']:
-        for prefix in new_prefixes:
-            print(prefix)
+    if parsed_arguments['stream']:
+        new_prefixes = generator.stream_generating()
+
+        # prefixes are converted while they are written
+        with metrics.measure('output'):
+            if parsed_arguments['output']:
+                with open(parsed_arguments['output'], 'a') as file:
+                    prefixes_num = Converter.write_prefixes(new_prefixes, file)
+
+            else:
+                prefixes_num = Converter.write_prefixes(new_prefixes, sys.stdout)
+
+        if parsed_arguments['graph'] or parsed_arguments['report']:
+            with metrics.measure('report'):
+                statistics.create_stats(generator.get_depth_distribution(), generator.get_level_distribution(), 'ipv6gene',
+                                        generator.iterate_prefixes(),
+                                        parsed_arguments['report'], parsed_arguments['graph'],
+                                        parsed_arguments['graph_dpi'])
+
+    else:
+        new_prefixes = generator.start_generating()
+        prefixes_num = len(new_prefixes)
+
+        if parsed_arguments['graph'] or parsed_arguments['report']:
+            with metrics.measure('report'):
+                statistics.create_stats(generator.get_depth_distribution(), generator.get_level_distribution(), 'ipv6gene',
+                                        generator.iterate_prefixes(),
+                                        parsed_arguments['report'], parsed_arguments['graph'],
+                                        parsed_arguments['graph_dpi'])
+
+        if not parsed_arguments['output']:
+            with metrics.measure('output'):
+                for prefix in new_prefixes:
+                    print(prefix)
 
     if parsed_arguments['stats']:
-        print(f"[INFO] Number of prefixes after generating {len(new_prefixes)}")
+        print(f"[INFO] Number of prefixes after generating {prefixes_num}")
         print(f"[INFO] Number of prefixes in constructed binary trie is {generator.get_binary_trie_prefixes_num()}")
         print(f"[INFO] Binary trie depth after generating is {generator.get_binary_trie_depth()}")
         print(f"[INFO] Binary trie level after generating is {generator.get_binary_trie_level()}")
 
-    if parsed_arguments['output']:
-        with open(parsed_arguments['output'], 'a') as file:
+    if parsed_arguments['output'] and not parsed_arguments['stream']:
+        with metrics.measure('output'), open(parsed_arguments['output'], 'a') as file:
             for prefix in new_prefixes:
                 file.write(prefix + '\n')
 
-    end = time.time()
+    if parsed_arguments['metrics_out']:
+        metrics.save(parsed_arguments['metrics_out'])
 
     if parsed_arguments['stats']:
-        print(f"[INFO] Execution time: {end - start}")
+        print(f"[INFO] Execution time: {metrics.get_wall_time()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,525 @@
+# was developed by Utkin Kirill
+
+import attr
+import numpy as np
+
+from typing import Dict, Iterator, Optional, Tuple
+from Common.Abstract.AbstractTrie import AbstractTrie
+from Common.BitMatrix.BitMatrix import BitMatrix
+from Common.Exceptions.Exceptions import PrefixAlreadyExists, MaximumLevelException, CannotGenerateDueMaximumLevel
+from Common.Metrics.Metrics import Metrics
+from IPv6Gene.Trie import Trie
+from IPv6Gene.Generator.Helper import Helper
+
+
+@attr.s
+class BulkGenerator:
+    """
+    Generate prefixes of random and trie traversal phase by batches of arrays instead of adding them to binary trie one
+    by one.
+
+    Prefixes of the trie are saved to arrays sorted by address for every depth. New prefix is created the same way as
+    in random and trie traversal phase: parent prefix of the previous organisation level (IANA prefix for RIR prefixes)
+    is selected randomly and bits after parent prefix are generated. Bits are sampled from the model of seed prefixes:
+    probability of one on bit position by prefix depth, smoothed by bit frequencies of whole organisation level. Whole
+    batch of candidates is checked at once:
+
+    - candidates which already exist are skipped
+    - number of prefixes which cover the candidate is found in arrays of shorter prefixes and level of the candidate is
+      found from levels of longer prefixes which the candidate covers. Candidate is skipped if the level of some prefix
+      on its path would exceed maximum level, the same condition as Trie.get_new_level uses for trie nodes
+
+    Generated prefixes aren't added to the binary trie, output prefixes and their levels are computed from arrays.
+    """
+    # prefixes are at most 64 bits long, every prefix is saved as 64 bits address aligned to the most significant bit
+    ADDRESS_LEN = 64
+
+    # maximum number of candidates which are sampled at once
+    BATCH_SIZE = 65536
+
+    # weight of organisation level bit frequencies in the model of one depth (number of virtual prefixes)
+    MODEL_PRIOR = 2.0
+
+    # number of batches without new prefix after which bits are sampled uniformly
+    MODEL_ATTEMPTS = 5
+
+    # first 3 bits of RIR prefixes, see RandomGenerator
+    IANA_VALUE = 0b001
+    IANA_LEN = 3
+
+    binary_trie = attr.ib(type=Trie)
+    helper = attr.ib(type=Helper)
+    max_level = attr.ib(type=int)
+    # numpy generator, see Common.Random.RandomStream.get_generator
+    rng = attr.ib(type=np.random.Generator)
+    stats = attr.ib(default=False, type=bool)
+    metrics = attr.ib(factory=Metrics, type=Metrics)
+
+    # prefixes by id: address, depth, level (height in the tree of prefixes), number of prefixes on the path from the
+    # root including prefix (path len) and id of the nearest prefix which covers it (-1 if there isn't any)
+    _addresses = attr.ib(factory=lambda: np.zeros(0, dtype=np.uint64), type=np.ndarray)
+    _depths = attr.ib(factory=lambda: np.zeros(0, dtype=np.int64), type=np.ndarray)
+    _levels = attr.ib(factory=lambda: np.zeros(0, dtype=np.int64), type=np.ndarray)
+    _path_lens = attr.ib(factory=lambda: np.zeros(0, dtype=np.int64), type=np.ndarray)
+    _prefix_parents = attr.ib(factory=lambda: np.zeros(0, dtype=np.int64), type=np.ndarray)
+
+    # depth: (sorted addresses, ids of prefixes) of prefixes with this depth
+    _depth_index = attr.ib(factory=dict, type=Dict[int, Tuple[np.ndarray, np.ndarray]])
+
+    # probability of one by prefix depth and bit position
+    _model = attr.ib(default=None, type=np.ndarray)
+
+    # result arrays sorted in address order
+    prefix_values = attr.ib(default=None, type=np.ndarray)
+    prefix_lens = attr.ib(default=None, type=np.ndarray)
+    prefix_levels = attr.ib(default=None, type=np.ndarray)
+
+    def generate(self) -> None:
+        """Generate new prefixes by the random distribution plan and the distribution plan of trie traversal phase.
+
+        :raises ValueError in case if there are no parent prefixes for some organisation level
+        :raises CannotGenerateDueMaximumLevel in case if new prefix can't be added under any parent prefix
+        :return: None
+        """
+        self.load_trie()
+        self._model = self.fit_model()
+
+        # RIR prefixes are generated under IANA prefix the same way as by RandomGenerator. IANA prefix isn't prefix of
+        # the trie, so prefix path of new prefixes starts by prefixes which cover IANA prefix
+        iana_address = self.get_addresses(np.array([self.IANA_VALUE], dtype=np.uint64), np.array([self.IANA_LEN]))
+        iana_parents = self.find_prefix_parents(iana_address, self.IANA_LEN + 1)
+
+        for plan_entry in self.helper.distribution_random_plan:
+            self.generate_entry(plan_entry, iana_address, np.array([self.IANA_LEN]), iana_parents)
+
+        for plan_entry in self.helper.distribution_plan:
+            if not plan_entry['generated_info']:
+                continue
+
+            # new prefixes are added to the next organisation level, so parent prefixes are the same for whole entry
+            parent_ids = self.get_parent_ids(self.helper.get_organisation_level_by_depth(plan_entry['interval'][0]) - 1)
+            self.generate_entry(plan_entry, self._addresses[parent_ids], self._depths[parent_ids], parent_ids)
+
+        self.create_result()
+
+    def generate_entry(self, plan_entry: Dict, parent_addresses: np.ndarray, parent_depths: np.ndarray,
+                       parent_ids: np.ndarray) -> None:
+        """Generate prefixes of one entry of distribution plan.
+
+        :param plan_entry: dictionary; interval of the organisation level and number of new prefixes by length
+        :param parent_addresses: array of parent prefix addresses
+        :param parent_depths: array of parent prefix depths
+        :param parent_ids: array of ids of parent prefixes, or of the nearest prefixes which cover parent prefix if
+                           parent prefix isn't prefix of the trie. -1 if parent isn't covered
+        :return: None
+        """
+        if not plan_entry['generated_info']:
+            return
+
+        if self.stats:
+            print(f"[BULK GENERATING]: Currently prefixes is being generated on interval:{plan_entry['interval']}")
+
+        for prefix_len, prefix_num in sorted(plan_entry['generated_info'].items()):
+            self.generate_depth(parent_addresses, parent_depths, parent_ids, prefix_len, prefix_num)
+
+    def load_trie(self) -> None:
+        """Save prefixes of binary trie to arrays, find the nearest covering prefix and level of every prefix.
+
+        :return: None
+        """
+        prefixes = AbstractTrie.iterate_prefixes(self.binary_trie.root_node)
+
+        if not self.binary_trie.root_node.prefix_flag:
+            # root node without child nodes is iterated as leaf node, but it isn't a prefix
+            prefixes = (prefix for prefix in prefixes if prefix[1])
+
+        prefix_array = np.array(list(prefixes), dtype=np.uint64).reshape(-1, 2)
+        addresses = self.get_addresses(prefix_array[:, 0], prefix_array[:, 1].astype(np.int64))
+        depths = prefix_array[:, 1].astype(np.int64)
+
+        # covering prefixes are shorter, so prefixes are added by depth
+        for depth in np.unique(depths).tolist():
+            depth_addresses = addresses[depths == depth]
+            self.add_prefixes(depth_addresses, depth, self.find_prefix_parents(depth_addresses, depth),
+                              np.zeros(len(depth_addresses), dtype=np.int64))
+
+    def fit_model(self) -> np.ndarray:
+        """Fit bit model of prefixes in binary trie. Probability of one on bit position of depth is smoothed by
+        frequency of one on the same position of all prefixes of organisation level, so depths with few prefixes get
+        bits similar to their organisation level.
+
+        :return: array of shape (65, 64); probability of one by prefix depth and bit position
+        """
+        shifts = np.where(self._depths > 0, self.ADDRESS_LEN - self._depths, 0).astype(np.uint64)
+        prefix_values = np.where(self._depths > 0, self._addresses >> shifts, np.uint64(0))
+
+        bit_matrix = BitMatrix.from_arrays(prefix_values, self._depths)
+
+        org_levels = np.array([self.helper.get_organisation_level_by_depth(depth) for depth in range(BitMatrix.DEPTHS)])
+        org_levels_num = self.helper.max_organisation_depth() + 1
+
+        # number of prefixes which contain bit position by depth
+        positions = np.arange(BitMatrix.POSITIONS)[np.newaxis, :]
+        prefix_positions = bit_matrix.prefixes_by_depth[:, np.newaxis] * \
+            (positions < np.arange(BitMatrix.DEPTHS)[:, np.newaxis])
+
+        level_ones = np.zeros((org_levels_num, BitMatrix.POSITIONS))
+        level_positions = np.zeros((org_levels_num, BitMatrix.POSITIONS))
+        np.add.at(level_ones, org_levels, bit_matrix.ones_by_depth)
+        np.add.at(level_positions, org_levels, prefix_positions)
+
+        level_frequency = (level_ones + 1) / (level_positions + 2)
+
+        model = (bit_matrix.ones_by_depth + self.MODEL_PRIOR * level_frequency[org_levels]) / \
+            (prefix_positions + self.MODEL_PRIOR)
+
+        # bits after prefix len are never set
+        model[positions >= np.arange(BitMatrix.DEPTHS)[:, np.newaxis]] = 0
+
+        return model
+
+    def get_parent_ids(self, org_level: int) -> np.ndarray:
+        """Get ids of prefixes which could be used as parents of new prefixes on the next organisation level. Prefixes
+        of ISP organisation level are used as parents of EU prefixes as well as prefixes of LIR level.
+
+        :raises ValueError in case if there is no prefix on the organisation level
+        :raises CannotGenerateDueMaximumLevel in case if new prefix can't be added under any prefix
+        :param org_level: int; organisation level of parent prefixes
+        :return: array of parent prefix ids
+        """
+        org_levels = np.array([self.helper.get_organisation_level_by_depth(depth) for depth in range(BitMatrix.DEPTHS)])
+        parent_levels = [org_level, org_level - 1] if org_level == 3 else [org_level]
+        parent_mask = np.isin(org_levels[self._depths], parent_levels)
+
+        if not parent_mask.any():
+            raise ValueError("New prefixes cannot be generated because there is no prefix nodes on the "
+                             "previous organisation level. Please, change depth_distribution")
+
+        # path of new prefix contains all prefixes of parent path
+        parent_mask &= self._path_lens <= self.max_level
+
+        if not parent_mask.any():
+            raise CannotGenerateDueMaximumLevel("Cannot generate prefix from any prefix in trie "
+                                                "(level always is great than maximum possible level)")
+
+        return np.nonzero(parent_mask)[0]
+
+    def generate_depth(self, parent_addresses: np.ndarray, parent_depths: np.ndarray, parent_ids: np.ndarray,
+                       prefix_len: int, prefix_num: int) -> None:
+        """Generate :param prefix_num new prefixes with length :param prefix_len by batches.
+
+        :raises CannotGenerateDueMaximumLevel in case if new prefixes can't be added under parent prefixes
+        :param parent_addresses: array of parent prefix addresses
+        :param parent_depths: array of parent prefix depths
+        :param parent_ids: array of ids of the nearest prefixes which cover or are the same as parent prefixes
+        :param prefix_len: int; length of new prefixes
+        :param prefix_num: int; number of new prefixes
+        :return: None
+        """
+        org_level = self.helper.get_organisation_level_by_depth(prefix_len)
+        model = self._model[prefix_len]
+        failed_batches = 0
+
+        # prefixes between parent prefix and new prefix are searched just from the shortest parent depth
+        start_depth = int(parent_depths.min()) + 1
+
+        while prefix_num > 0:
+            if failed_batches == self.MODEL_ATTEMPTS:
+                # bits which are likely by the model are already used under all parent prefixes
+                model = np.where(np.arange(self.ADDRESS_LEN) < prefix_len, 0.5, 0)
+
+            elif failed_batches == 2 * self.MODEL_ATTEMPTS:
+                raise CannotGenerateDueMaximumLevel(f"Cannot generate prefix with length {prefix_len} from any "
+                                                    f"prefix in trie")
+
+            batch_size = min(max(2 * prefix_num, 1024), self.BATCH_SIZE)
+            parents = self.rng.integers(0, len(parent_addresses), batch_size)
+            candidates = self.sample_addresses(parent_addresses[parents], parent_depths[parents], model)
+
+            new_addresses, prefix_parents, levels = self.filter_candidates(candidates, parent_ids[parents], start_depth,
+                                                                           org_level, prefix_len, prefix_num)
+
+            failed_batches = failed_batches + 1 if not len(new_addresses) else 0
+            prefix_num -= len(new_addresses)
+
+            self.add_prefixes(new_addresses, prefix_len, prefix_parents, levels)
+
+    def sample_addresses(self, parent_addresses: np.ndarray, parent_depths: np.ndarray,
+                         model: np.ndarray) -> np.ndarray:
+        """Sample bits after parent prefixes.
+
+        :param parent_addresses: array of parent prefix addresses
+        :param parent_depths: array of parent prefix depths
+        :param model: array of 64 values; probability of one by bit position
+        :return: array of candidate addresses
+        """
+        positions = np.arange(self.ADDRESS_LEN)[np.newaxis, :]
+        bits = self.rng.random((len(parent_addresses), self.ADDRESS_LEN), dtype=np.float32) < model[np.newaxis, :]
+        bits &= positions >= parent_depths[:, np.newaxis]
+
+        new_bits = np.packbits(bits, axis=1).view('>u8').ravel().astype(np.uint64)
+
+        return parent_addresses | new_bits
+
+    def filter_candidates(self, candidates: np.ndarray, prefix_parents: np.ndarray, start_depth: int, org_level: int,
+                          prefix_len: int, prefix_num: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Skip candidates which already exist or which would make level of some prefix on their path greater than
+        maximum level. Candidates are checked in address order, but the first :param prefix_num candidates are selected
+        in sampled order, so they don't depend on address.
+
+        :param candidates: array of candidate addresses
+        :param prefix_parents: array of ids of the nearest prefixes which cover parent prefixes of candidates
+        :param start_depth: int; prefixes between parent prefix and candidate aren't shorter than this depth
+        :param org_level: int; organisation level of candidates
+        :param prefix_len: int; length of candidates
+        :param prefix_num: int; maximum number of selected candidates
+        :return: tuple; sorted array of new prefix addresses, array of ids of their nearest covering prefixes and array
+                 of their levels
+        """
+        candidates, first_indexes = np.unique(candidates, return_index=True)
+        prefix_parents = prefix_parents[first_indexes]
+
+        existing = self.find_prefixes(candidates, prefix_len) >= 0
+
+        if existing.any():
+            self.metrics.count_exception(PrefixAlreadyExists(), org_level, prefix_len, int(existing.sum()))
+
+        candidates = candidates[~existing]
+        first_indexes = first_indexes[~existing]
+        prefix_parents = self.find_prefix_parents(candidates, prefix_len, start_depth, prefix_parents[~existing])
+        levels = self.get_levels(candidates, prefix_len)
+
+        # every prefix on the path of the candidate is at least one level higher than the next prefix of the path
+        path_lens = np.where(prefix_parents >= 0, self._path_lens[prefix_parents], 0)
+        allowed = levels + path_lens <= self.max_level
+
+        if not allowed.all():
+            self.metrics.count_exception(MaximumLevelException(), org_level, prefix_len, int((~allowed).sum()))
+
+        allowed_indexes = np.nonzero(allowed)[0]
+        selected = np.zeros(len(candidates), dtype=bool)
+        selected[allowed_indexes[np.argsort(first_indexes[allowed_indexes])[:prefix_num]]] = True
+
+        return candidates[selected], prefix_parents[selected], levels[selected]
+
+    def find_prefixes(self, addresses: np.ndarray, depth: int) -> np.ndarray:
+        """Find prefixes with length :param depth and addresses :param addresses.
+
+        :param addresses: sorted array of addresses
+        :param depth: int; prefix length
+        :return: array of prefix ids, -1 if prefix doesn't exist
+        """
+        ids = np.full(len(addresses), -1, dtype=np.int64)
+
+        if depth not in self._depth_index:
+            return ids
+
+        depth_addresses, depth_ids = self._depth_index[depth]
+        positions = np.searchsorted(depth_addresses, addresses)
+        found = positions < len(depth_addresses)
+        found[found] = depth_addresses[positions[found]] == addresses[found]
+        ids[found] = depth_ids[positions[found]]
+
+        return ids
+
+    def find_covered_prefixes(self, addresses: np.ndarray, depth: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Find longer prefixes which are covered by prefixes with length :param depth. Covered prefixes of one depth
+        are consecutive in sorted addresses, so they are found as ranges between the first and the last address of the
+        covering prefix.
+
+        :param addresses: array of covering prefix addresses
+        :param depth: int; length of covering prefixes
+        :return: tuple; array of indexes of covering prefixes in :param addresses and array of covered prefix ids
+        """
+        last_addresses = addresses | ~self.get_mask(depth)
+        indexes = [np.zeros(0, dtype=np.int64)]
+        covered_ids = [np.zeros(0, dtype=np.int64)]
+
+        for longer_depth, (depth_addresses, depth_ids) in self._depth_index.items():
+            if longer_depth <= depth:
+                continue
+
+            starts = np.searchsorted(depth_addresses, addresses)
+            counts = np.searchsorted(depth_addresses, last_addresses, side='right') - starts
+
+            if not counts.any():
+                continue
+
+            # positions of all prefixes inside of the ranges
+            range_starts = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+
+            indexes.append(np.repeat(np.arange(len(addresses)), counts))
+            covered_ids.append(depth_ids[range_starts + np.arange(counts.sum())])
+
+        return np.concatenate(indexes), np.concatenate(covered_ids)
+
+    def get_levels(self, addresses: np.ndarray, depth: int) -> np.ndarray:
+        """Get levels of new prefixes with length :param depth. Level of new prefix is one more than the maximum level
+        of covered prefixes which aren't covered by other covered prefix, zero if new prefix doesn't cover any prefix.
+
+        :param addresses: array of new prefix addresses
+        :param depth: int; length of new prefixes
+        :return: array of levels
+        """
+        levels = np.zeros(len(addresses), dtype=np.int64)
+        indexes, covered_ids = self.find_covered_prefixes(addresses, depth)
+        top = self.get_top_covered(covered_ids, depth)
+
+        np.maximum.at(levels, indexes[top], self._levels[covered_ids[top]] + 1)
+
+        return levels
+
+    def get_top_covered(self, covered_ids: np.ndarray, depth: int) -> np.ndarray:
+        """Check which covered prefixes would be children of covering prefix with length :param depth in the tree of
+        prefixes: their nearest covering prefix is shorter than :param depth.
+
+        :param covered_ids: array of covered prefix ids
+        :param depth: int; length of covering prefix
+        :return: boolean array
+        """
+        prefix_parents = self._prefix_parents[covered_ids]
+
+        return np.where(prefix_parents >= 0, self._depths[prefix_parents], -1) < depth
+
+    def find_prefix_parents(self, addresses: np.ndarray, depth: int, start_depth: int = 0,
+                            prefix_parents: Optional[np.ndarray] = None) -> np.ndarray:
+        """Find the nearest prefix which covers every prefix. Covering prefixes are searched by every shorter depth
+        from :param start_depth.
+
+        :param addresses: sorted array of prefix addresses
+        :param depth: int; prefix length
+        :param start_depth: int; covering prefixes which are shorter than this depth are known
+        :param prefix_parents: array of the nearest covering prefixes which are shorter than :param start_depth
+        :return: array of covering prefix ids, -1 if prefix isn't covered
+        """
+        if prefix_parents is None:
+            prefix_parents = np.full(len(addresses), -1, dtype=np.int64)
+
+        for shorter_depth in sorted(self._depth_index):
+            if shorter_depth >= depth:
+                break
+
+            if shorter_depth < start_depth:
+                continue
+
+            ids = self.find_prefixes(addresses & self.get_mask(shorter_depth), shorter_depth)
+            prefix_parents = np.where(ids >= 0, ids, prefix_parents)
+
+        return prefix_parents
+
+    def add_prefixes(self, addresses: np.ndarray, depth: int, prefix_parents: np.ndarray, levels: np.ndarray) -> None:
+        """Save new prefixes with length :param depth. Path lens and the nearest covering prefixes of covered prefixes
+        are updated and levels of covering prefixes are raised.
+
+        :param addresses: array of prefix addresses
+        :param depth: int; prefix length
+        :param prefix_parents: array of ids of the nearest covering prefixes
+        :param levels: array of prefix levels
+        :return: None
+        """
+        if not len(addresses):
+            return
+
+        ids = np.arange(len(self._addresses), len(self._addresses) + len(addresses))
+        path_lens = np.ones(len(addresses), dtype=np.int64)
+        covered = prefix_parents >= 0
+        path_lens[covered] += self._path_lens[prefix_parents[covered]]
+
+        indexes, covered_ids = self.find_covered_prefixes(addresses, depth)
+        top = self.get_top_covered(covered_ids, depth)
+
+        self._addresses = np.concatenate((self._addresses, addresses))
+        self._depths = np.concatenate((self._depths, np.full(len(addresses), depth, dtype=np.int64)))
+        self._levels = np.concatenate((self._levels, levels))
+        self._path_lens = np.concatenate((self._path_lens, path_lens))
+        self._prefix_parents = np.concatenate((self._prefix_parents, prefix_parents))
+
+        self._path_lens[covered_ids] += 1
+        self._prefix_parents[covered_ids[top]] = ids[indexes[top]]
+
+        depth_addresses, depth_ids = self._depth_index.get(depth, (np.zeros(0, dtype=np.uint64),
+                                                                   np.zeros(0, dtype=np.int64)))
+        depth_addresses = np.concatenate((depth_addresses, addresses))
+        depth_ids = np.concatenate((depth_ids, ids))
+        order = np.argsort(depth_addresses, kind='stable')
+
+        self._depth_index[depth] = (depth_addresses[order], depth_ids[order])
+        self.raise_levels(ids)
+
+    def raise_levels(self, ids: np.ndarray) -> None:
+        """Raise levels of prefixes which cover new prefixes :param ids. Every covering prefix is at least one level
+        higher than prefixes it covers.
+
+        :param ids: array of new prefix ids
+        :return: None
+        """
+        levels = self._levels[ids]
+        prefix_parents = self._prefix_parents[ids]
+
+        while True:
+            covered = prefix_parents >= 0
+
+            if not covered.any():
+                break
+
+            prefix_parents = prefix_parents[covered]
+            levels = levels[covered] + 1
+
+            np.maximum.at(self._levels, prefix_parents, levels)
+            prefix_parents = self._prefix_parents[prefix_parents]
+
+    def create_result(self) -> None:
+        """Sort all prefixes in address order.
+
+        :return: None
+        """
+        # shorter prefix is before longer prefixes with the same address, the same order as trie iteration
+        order = np.lexsort((self._depths, self._addresses))
+        shifts = np.where(self._depths > 0, self.ADDRESS_LEN - self._depths, 0).astype(np.uint64)
+
+        self.prefix_values = np.where(self._depths > 0, self._addresses >> shifts, np.uint64(0))[order]
+        self.prefix_lens = self._depths[order]
+        self.prefix_levels = self._levels[order]
+
+    def iterate_prefixes(self) -> Iterator[Tuple[int, int]]:
+        """Iterate over all prefixes in address order.
+
+        :return: iterator of (prefix value, prefix len) tuples
+        """
+        return zip(self.prefix_values.tolist(), self.prefix_lens.tolist())
+
+    def get_depth_distribution(self) -> Dict[int, int]:
+        """Get number of prefixes by depth.
+
+        :return: dictionary; depth: number of prefixes
+        """
+        return dict(enumerate(np.bincount(self.prefix_lens, minlength=BitMatrix.DEPTHS).tolist()))
+
+    def get_level_distribution(self) -> Dict[int, int]:
+        """Get number of prefixes by level. Levels without prefixes aren't included.
+
+        :return: dictionary; level: number of prefixes
+        """
+        return {level: prefixes_num for level, prefixes_num in enumerate(np.bincount(self.prefix_levels).tolist())
+                if prefixes_num}
+
+    @staticmethod
+    def get_addresses(prefix_values: np.ndarray, prefix_lens: np.ndarray) -> np.ndarray:
+        """Align prefix values to the most significant bit of 64 bits address.
+
+        :param prefix_values: array of prefix values
+        :param prefix_lens: array of prefix lengths
+        :return: array of addresses
+        """
+        shifts = np.where(prefix_lens > 0, BulkGenerator.ADDRESS_LEN - prefix_lens, 0).astype(np.uint64)
+
+        return np.where(prefix_lens > 0, prefix_values << shifts, np.uint64(0))
+
+    @staticmethod
+    def get_mask(depth: int) -> np.uint64:
+        """Get mask of the first :param depth bits of address.
+
+        :param depth: int; prefix length
+        :return: mask
+        """
+        return np.uint64(((1 << depth) - 1) << (BulkGenerator.ADDRESS_LEN - depth))
@@ -1,14 +1,18 @@
 # was developed by Utkin Kirill
 
+import attr
+
+from typing import Dict, List
 from Common.Abstract.AbstractHelper import AbstractHelper
 
 
+@attr.s
 class Helper(AbstractHelper):
 
     # Helper structure which contains a number of prefixes on organisation levels for random generating process
-    distribution_random_plan = [
+    distribution_random_plan = attr.ib(factory=lambda: [
         {'interval': [12, 32], 'generated_info': {}},
-    ]
+    ], type=List[Dict])
 
     def create_distributing_plan(self) -> None:
         """Initialize distribution plan variable.
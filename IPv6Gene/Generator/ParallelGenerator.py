@@ -0,0 +1,230 @@
+# was developed by Utkin Kirill
+
+import attr
+import multiprocessing
+import numpy as np
+
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from IPv6Gene.Trie import Trie
+from IPv6Gene.Generator.Helper import Helper
+from Common.Random.RandomStream import RandomStream
+from Common.Metrics.Metrics import Metrics
+
+# generator which is used by worker processes. Is set before processes are forked, so workers get a copy of the trie
+_parallel_generator: Optional['ParallelGenerator'] = None
+
+
+def _generate_block(task: Tuple[int, Dict]) -> Tuple:
+    return _parallel_generator.generate_block(*task)
+
+
+@attr.s
+class ParallelGenerator:
+    """
+    Generate prefixes by trie traversal in worker processes. Address space is split to blocks by the first BLOCK_LEN
+    bits. Sub-tries of different blocks are disjoint and levels of prefix nodes in one block don't depend on other
+    blocks, so blocks are generated independently. Numbers of prefixes from the distribution plan are split between
+    blocks by number of nodes which could be used as parents, but block never gets more prefixes than could be placed
+    under its parent nodes. Every block has own random stream, so result doesn't
+    depend on number of workers and every block could be generated again separately.
+    """
+    # prefixes with length less than 12 can't be generated (see README), so every generated prefix belongs to one block
+    BLOCK_LEN = 12
+
+    binary_trie = attr.ib(type=Trie)
+    helper = attr.ib(type=Helper)
+    # random streams of blocks are spawned from this stream by block value
+    rng = attr.ib(type=RandomStream)
+    workers = attr.ib(default=2, type=int)
+    stats = attr.ib(default=False, type=bool)
+
+    _blocks = attr.ib(default=None)
+    _block_nodes = attr.ib(factory=dict, type=Dict)
+    _block_indexes = attr.ib(factory=dict, type=Dict)
+    # number of prefix nodes by block and depth
+    _block_prefixes = attr.ib(factory=Counter, type=Counter)
+
+    def generate(self) -> None:
+        """Split distribution plan between blocks, generate blocks in worker processes and merge all new nodes to the
+        binary trie.
+
+        :raises ValueError in case if binary trie isn't compact
+        :return: None
+        """
+        global _parallel_generator
+
+        storage = self.binary_trie.storage
+
+        if storage is None:
+            raise ValueError("Parallel generating is possible just for compact trie")
+
+        self._blocks = storage.get_blocks(self.BLOCK_LEN)
+
+        for block in np.unique(self._blocks[self._blocks >= 0]):
+            self._block_indexes[int(block)] = np.nonzero(self._blocks == block)[0]
+
+        # arrays are copied, storage arrays can't be extended while numpy view exists
+        prefix_flags = np.array(storage.flags, dtype=np.uint8) & storage.PREFIX > 0
+        block_prefixes = prefix_flags & (self._blocks >= 0)
+        depths = np.array(storage.depth, dtype=np.uint8)
+        self._block_prefixes.update(zip(self._blocks[block_prefixes].tolist(), depths[block_prefixes].tolist()))
+
+        for org_level, nodes in self.binary_trie.nodes.items():
+            for node in nodes:
+                block_nodes = self._block_nodes.setdefault(int(self._blocks[node.index]), dict())
+                block_nodes.setdefault(org_level, list()).append(node)
+
+        block_plans = self.split_distribution_plan()
+        tasks = [(block, block_plans[block]) for block in sorted(block_plans)]
+
+        if self.stats:
+            print(f"[PARALLEL GENERATING]: Generate {len(tasks)} blocks by {self.workers} workers")
+
+        _parallel_generator = self
+
+        try:
+            with multiprocessing.get_context('fork').Pool(self.workers) as pool:
+                results = pool.map(_generate_block, tasks, chunksize=1)
+
+        finally:
+            _parallel_generator = None
+
+        for merged_nodes, block_metrics in results:
+            self.binary_trie.merge_nodes(*merged_nodes)
+            self.binary_trie.metrics.merge(block_metrics)
+
+        storage.update_top_levels(self.BLOCK_LEN)
+
+        # levels of nodes above blocks were changed directly in storage
+        self.binary_trie.count_nodes()
+
+        for plan_entry in self.helper.distribution_plan:
+            plan_entry['generated_info'] = dict()
+
+    @staticmethod
+    def split_quota(quota: int, weights: Dict[int, int], capacities: Dict[int, int]) -> Dict[int, int]:
+        """Split number of prefixes proportionally to weights of blocks (largest remainder method). Prefixes which
+        exceed capacity of some block are split again between other blocks.
+
+        :raises ValueError in case if all blocks together don't have enough capacity
+        :param quota: int; number of prefixes
+        :param weights: dictionary; block: weight
+        :param capacities: dictionary; block: maximum number of prefixes
+        :return: dictionary; block: number of prefixes
+        """
+        shares = {block: 0 for block in weights}
+        remaining = quota
+        active = {block: weight for block, weight in weights.items() if weight and capacities[block]}
+
+        while remaining and active:
+            total = sum(active.values())
+            parts = {block: remaining * weight // total for block, weight in active.items()}
+            remainders = sorted(active, key=lambda block: (-(remaining * active[block] % total), block))
+
+            for block in remainders[:remaining - sum(parts.values())]:
+                parts[block] += 1
+
+            for block, part in parts.items():
+                shares[block] += min(part, capacities[block] - shares[block])
+
+            remaining = quota - sum(shares.values())
+            active = {block: weight for block, weight in active.items() if shares[block] < capacities[block]}
+
+        if remaining:
+            raise ValueError("New prefixes cannot be generated because there is no free space under prefix nodes on "
+                             "the previous organisation level. Please, change depth_distribution")
+
+        return shares
+
+    def get_capacity(self, block: int, parent_depths: Counter, prefix_len: int) -> int:
+        """Get maximum number of new prefixes with :param prefix_len which could be placed under parent nodes of
+        :param block. Nested parent nodes are counted separately, so value could be greater than real capacity.
+
+        :param block: int; block value
+        :param parent_depths: Counter; number of parent nodes by depth
+        :param prefix_len: int; length of new prefixes
+        :return: int; number of free prefixes
+        """
+        capacity = sum(nodes_num << (prefix_len - depth) for depth, nodes_num in parent_depths.items()
+                       if depth < prefix_len)
+        capacity = min(capacity, 1 << (prefix_len - self.BLOCK_LEN))
+
+        return max(capacity - self._block_prefixes[(block, prefix_len)], 0)
+
+    def split_distribution_plan(self) -> Dict[int, Dict[int, Dict[int, int]]]:
+        """Split distribution plan between blocks. Parent nodes are selected uniformly in generate_prefixes, so number
+        of prefixes of every block is proportional to number of nodes on parent organisation level in this block. New
+        prefixes are used as parents for the next organisation level.
+
+        :raises ValueError in case if there are no nodes on the parent organisation level
+        :return: dictionary; block: organisation level: prefix len: number of prefixes
+        """
+        # number of parent nodes by organisation level, block and depth
+        candidates = {org_level: dict() for org_level in self.binary_trie.nodes}
+
+        for block, block_nodes in self._block_nodes.items():
+            for org_level, nodes in block_nodes.items():
+                candidates[org_level][block] = Counter(node.depth for node in nodes)
+
+        block_plans = {block: dict() for block in self._block_nodes}
+
+        for org_level, plan_entry in enumerate(self.helper.distribution_plan):
+            parent_node_level = self.helper.get_organisation_level_by_depth(plan_entry['interval'][0]) - 1
+
+            if parent_node_level == 3:
+                for block, parent_depths in candidates[2].items():
+                    candidates[3][block] = candidates[3].get(block, Counter()) + parent_depths
+
+            parents = candidates.get(parent_node_level, dict())
+
+            for prefix_len, prefix_num in plan_entry['generated_info'].items():
+                if not parents:
+                    raise ValueError("New prefixes cannot be generated because there is no prefix nodes on the "
+                                     "previous organisation level. Please, change depth_distribution")
+
+                weights = {block: sum(parent_depths.values()) for block, parent_depths in parents.items()}
+                capacities = {block: self.get_capacity(block, parent_depths, prefix_len)
+                              for block, parent_depths in parents.items()}
+
+                for block, share in self.split_quota(prefix_num, weights, capacities).items():
+                    if share:
+                        block_plans[block].setdefault(org_level, dict())[prefix_len] = share
+                        candidates[org_level].setdefault(block, Counter())[prefix_len] += share
+
+        return {block: plan for block, plan in block_plans.items() if plan}
+
+    def generate_block(self, block: int, block_plan: Dict[int, Dict[int, int]]) -> Tuple:
+        """Generate prefixes of one block. Is called in worker process.
+
+        :param block: int; first BLOCK_LEN bits of all prefixes in the block
+        :param block_plan: dictionary; organisation level: prefix len: number of prefixes
+        :return: tuple; arguments for AbstractTrie.merge_nodes and metrics of the block
+        """
+        storage = self.binary_trie.storage
+        start = len(storage.depth)
+        prefix_nodes = dict(self.binary_trie.full_prefix_nodes)
+
+        # all new nodes have to be placed after start index, so released indexes aren't used again
+        storage.free_nodes.clear()
+        self.binary_trie.rng = self.rng.spawn(block)
+
+        # progress of every block isn't printed, counters of every block are merged by the main process
+        self.binary_trie.stats = False
+        self.binary_trie.metrics = Metrics()
+
+        self.binary_trie.nodes = {org_level: list(self._block_nodes[block].get(org_level, list()))
+                                  for org_level in self.binary_trie.nodes}
+
+        for org_level, plan_entry in enumerate(self.helper.distribution_plan):
+            plan_entry['generated_info'] = dict(block_plan.get(org_level, dict()))
+
+        self.binary_trie.generate_prefixes()
+
+        indexes = self._block_indexes.get(block, np.array(list(), dtype=np.int64))
+        new_nodes = storage.get_columns_data(np.arange(start, len(storage.depth)))
+        new_prefix_nodes = {depth: num - prefix_nodes.get(depth, 0)
+                            for depth, num in self.binary_trie.full_prefix_nodes.items()}
+
+        return ((start, new_nodes, indexes, storage.get_columns_data(indexes), new_prefix_nodes,
+                 self.binary_trie.trie_depth, self.binary_trie.trie_level), self.binary_trie.metrics)
@@ -1,26 +1,33 @@
 # was developed by Utkin Kirill
 
 import attr
+import random
 
 from IPv6Gene.Trie import Trie
-from Common.Exceptions.Exceptions import PrefixAlreadyExists, MaximumLevelException
-from Common.Abstract.AbstractHelper import AbstractHelper
+from Common.Exceptions.Exceptions import MaximumLevelException, NoFreePrefixException, CannotGenerateDueMaximumLevel
 from IPv6Gene.Generator.Helper import Helper
 
 
 @attr.s
 class RandomGenerator:
+    # number of free prefixes which are tried for one new prefix before generating is stopped due to maximum level
+    MAX_ATTEMPTS = 1000
+
     binary_trie = attr.ib(type=Trie)
     helper = attr.ib(type=Helper)
     distribution_plan = attr.ib(factory=dict, type=dict)
     stats = attr.ib(default=False, type=bool)
+    # random module or Common.Random.RandomStream object
+    rng = attr.ib(default=random)
 
     def random_generate(self) -> None:
         """
         Generate new prefixes on RIR organisation level and add them to binary trie
+        :raises CannotGenerateDueMaximumLevel in case if all prefixes with some length already exist or if
+                MAX_ATTEMPTS free prefixes in a row exceed maximum possible level
         :return: None
         """
-        IANA = '001'
+        IANA = 0b001
         generated_randomly = 0
 
         for org_level in self.distribution_plan:
@@ -28,18 +35,29 @@ class RandomGenerator:
 
             for prefix_len, prefix_num in org_level_plan.items():
                 for count in range(prefix_num):
-                    while True:
+                    for attempt in range(self.MAX_ATTEMPTS):
                         try:
-                            # First 4 bits will be IANA part
-                            new_bits = AbstractHelper.generate_new_bits(3, prefix_len)
-                            new_prefix = IANA + new_bits
+                            # First 3 bits will be IANA part. Just prefixes which don't exist yet are selected
+                            new_prefix = self.binary_trie.sample_free_prefix(IANA, 3, prefix_len, self.rng)
 
-                            self.binary_trie.add_node(new_prefix, creating_phase=False)
+                            self.binary_trie.add_node(new_prefix, prefix_len, creating_phase=False)
                             generated_randomly += 1
 
                             break
 
-                        except (PrefixAlreadyExists, MaximumLevelException):
+                        except NoFreePrefixException:
+                            raise CannotGenerateDueMaximumLevel(f"Cannot generate prefix with length {prefix_len} "
+                                                                f"randomly (all prefixes with this length already "
+                                                                f"exist). Please, change depth_distribution")
+
+                        except MaximumLevelException as exc:
+                            self.binary_trie.metrics.count_exception(
+                                exc, self.helper.get_organisation_level_by_depth(prefix_len), prefix_len)
                             continue
+
+                    else:
+                        raise CannotGenerateDueMaximumLevel(f"Cannot generate prefix with length {prefix_len} "
+                                                            f"randomly (level always is great than maximum possible "
+                                                            f"level)")
         if self.stats:
             print(f"[INFO] {generated_randomly} prefixes were generated randomly")
@@ -1,14 +1,20 @@
 # was developed by Utkin Kirill
 
 import attr
+import os
+import random
 
 from Common.Abstract.AbstractHelper import AbstractHelper
 from Common.Abstract.AbstractTrie import AbstractTrie
 from IPv6Gene.Trie import Trie
 from IPv6Gene.Generator.Helper import Helper
 from IPv6Gene.Generator.RandomGenerator import RandomGenerator
+from IPv6Gene.Generator.ParallelGenerator import ParallelGenerator
+from IPv6Gene.Generator.BulkGenerator import BulkGenerator
 from Common.Converter.Converter import Converter
-from typing import Dict, List
+from Common.Random.RandomStream import RandomStream
+from Common.Metrics.Metrics import Metrics
+from typing import Dict, Iterator, List, Optional, Tuple
 
 
 @attr.s
@@ -18,28 +24,60 @@ class V6Generator:
     depth_distribution = attr.ib(factory=dict, type=Dict)
     max_level = attr.ib(default=7, type=int)
     input_prefixes = attr.ib(factory=list, type=list)
-    Help = attr.ib(default=Helper(), type=Helper)
+    Help = attr.ib(factory=Helper, type=Helper)
     stats = attr.ib(default=False, type=bool)
+    compact_trie = attr.ib(default=False, type=bool)
+    path_compression = attr.ib(default=False, type=bool)
+    # path to the seed trie snapshot. Seed trie is loaded from snapshot if it exists and saved to it otherwise
+    seed_snapshot = attr.ib(default=None, type=Optional[str])
+    # map seed trie snapshot to memory instead of reading it, so parallel generators share one copy of seed trie
+    memory_map = attr.ib(default=False, type=bool)
+    # constructed seed trie which is cloned instead of constructing new one, so seed trie could be constructed once for
+    # many generators in one process
+    seed_trie = attr.ib(default=None, type=Optional[Trie.Trie])
+    # number of processes which generate prefixes by trie traversal. Compact trie is used for more than one process
+    workers = attr.ib(default=1, type=int)
+    # seed of counter-based random generator, every generating phase uses own random stream. Random module is used
+    # if seed isn't set
+    seed = attr.ib(default=None, type=Optional[int])
+    # time of generating phases and counters of trie operations. Could be shared with caller which measures other phases
+    metrics = attr.ib(factory=Metrics, type=Metrics)
+    # generate prefixes of random and trie traversal phase by batches of arrays (see BulkGenerator) instead of trie
+    bulk = attr.ib(default=False, type=bool)
 
     # Parameters for generating
-    _binary_trie = attr.ib(default=Trie.Trie(), type=Trie)
+    _binary_trie = attr.ib(factory=Trie.Trie, type=Trie)
     _generated_traversing_trie = attr.ib(default=0, type=int)
 
     # Result prefixes
     _generated_prefixes_list = attr.ib(factory=list, type=list)
+    # prefixes generated in bulk mode, they aren't added to the binary trie
+    _bulk_generator = attr.ib(default=None, type=Optional[BulkGenerator])
 
     def __attrs_post_init__(self) -> None:
         """Initialize other generator class attributes.
         :return: None
         """
+        if self.memory_map and self.workers > 1:
+            raise ValueError("Seed trie snapshot mapped to memory can't be used for parallel generating")
+
+        if self.bulk and self.workers > 1:
+            raise ValueError("Bulk generating can't be combined with parallel generating")
+
+        if self.compact_trie or self.path_compression or self.seed_snapshot or self.workers > 1:
+            # snapshot is created from compact node storage and worker processes return nodes as storage arrays
+            self._binary_trie = Trie.Trie(compact=self.compact_trie or bool(self.seed_snapshot) or self.workers > 1,
+                                          path_compression=self.path_compression)
+
         self._binary_trie.Help = self.Help
+        self._binary_trie.metrics = self.metrics
 
         #  Construct the seed prefix trie
         if self.stats:
             print("[GENERATOR]: Construct binary trie")
 
-        for prefix in self.input_prefixes:
-            self._binary_trie.add_node(prefix)
+        with self.metrics.measure('construct'):
+            self.construct_trie()
 
         if self.stats:
             print("[GENERATOR]: Binary trie was successfully constructed")
@@ -59,6 +97,9 @@ class V6Generator:
 
         :return: int, number of prefixes nodes in trie
         """
+        if self._bulk_generator is not None:
+            return len(self._bulk_generator.prefix_lens)
+
         return sum(self._binary_trie.full_prefix_nodes.values())
 
     def get_binary_trie_level(self) -> int:
@@ -66,6 +107,9 @@ class V6Generator:
 
         :return: int, current binary trie level
         """
+        if self._bulk_generator is not None:
+            return int(self._bulk_generator.prefix_levels.max(initial=0))
+
         return self._binary_trie.trie_level
 
     def get_binary_trie_depth(self) -> int:
@@ -73,8 +117,33 @@ class V6Generator:
 
         :return: int, current binary trie maximum depth
         """
+        if self._bulk_generator is not None:
+            return int(self._bulk_generator.prefix_lens.max(initial=0))
+
         return self._binary_trie.trie_depth
 
+    def construct_trie(self) -> None:
+        """Construct the seed prefix trie from input prefixes, clone it from seed_trie or load it from the seed trie
+        snapshot.
+
+        :return: None
+        """
+        if self.seed_trie is not None:
+            self._binary_trie = self.seed_trie.clone()
+            self._binary_trie.Help = self.Help
+            self._binary_trie.metrics = self.metrics
+            return
+
+        if self.seed_snapshot and os.path.exists(self.seed_snapshot):
+            self._binary_trie.load_snapshot(self.seed_snapshot, self.memory_map)
+            return
+
+        # leaf nodes are counted while trie is constructed
+        self._binary_trie.bulk_load(self.input_prefixes)
+
+        if self.seed_snapshot:
+            self._binary_trie.save_snapshot(self.seed_snapshot, self.input_prefixes)
+
     def help_init(self) -> None:
         """Init helper structure for generating process.
 
@@ -84,22 +153,93 @@ class V6Generator:
         self.Help.final_depth_distribution = self.depth_distribution
         self.Help.create_distributing_plan()
 
+    def get_depth_distribution(self) -> Dict[int, int]:
+        """Get number of prefix nodes by depth. Value is maintained by binary trie.
+
+        :return: dictionary; depth: number of prefix nodes
+        """
+        if self._bulk_generator is not None:
+            return self._bulk_generator.get_depth_distribution()
+
+        return dict(self._binary_trie.full_prefix_nodes)
+
+    def get_level_distribution(self) -> Dict[int, int]:
+        """Get number of prefix nodes by level. Value is maintained by binary trie.
+
+        :return: dictionary; level: number of prefix nodes
+        """
+        if self._bulk_generator is not None:
+            return self._bulk_generator.get_level_distribution()
+
+        return self._binary_trie.level_nodes
+
     def get_root(self):
         return self._binary_trie.root_node
 
+    def iterate_prefixes(self) -> Iterator[Tuple[int, int]]:
+        """Iterate over all prefixes, also prefixes generated in bulk mode.
+
+        :return: iterator of (prefix value, prefix len) tuples in address order
+        """
+        if self._bulk_generator is not None:
+            return self._bulk_generator.iterate_prefixes()
+
+        return AbstractTrie.iterate_prefixes(self._binary_trie.root_node)
+
     def start_generating(self) -> List[str]:
         """Start generating process.
 
         :return: list with generated prefixes
         """
+        self.generate()
+
+        with self.metrics.measure('convert'):
+            if self._bulk_generator is not None:
+                return Converter.format_addresses(*Converter.split_prefix_arrays(self._bulk_generator.prefix_values,
+                                                                                 self._bulk_generator.prefix_lens))
+
+            return self.get_converted_prefixes().convert_prefixes()
+
+    def stream_generating(self) -> Iterator[str]:
+        """Start generating process. Prefixes are converted lazily while result iterator is consumed, so whole output
+        dataset isn't saved in memory.
+
+        :return: iterator of generated prefixes
+        """
+        self.generate()
+
+        if self._bulk_generator is not None:
+            return Converter.iterate_converted_arrays(self._bulk_generator.prefix_values,
+                                                      self._bulk_generator.prefix_lens)
+
+        return self.get_converted_prefixes().iterate_converted_prefixes()
+
+    def get_converted_prefixes(self) -> Converter:
+        """Create converter for all prefixes in binary trie. Prefixes are read from trie just when converter is used.
+
+        :return: Converter object
+        """
+        return Converter(AbstractTrie.iterate_prefixes(self._binary_trie.root_node))
+
+    def generate(self) -> None:
+        """Generate new prefixes into binary trie.
+
+        :return: None
+        """
+        if self.bulk:
+            self.bulk_generate()
+            return
 
         # Generate new RIR nodes and add them to binary trie
-        if Helper.distribution_random_plan:
+        if self.Help.distribution_random_plan:
             if self.stats:
                 print("[RANDOM GENERATING]: Start generating prefixes randomly")
 
-            Randomizer = RandomGenerator(self._binary_trie, self.Help, distribution_plan=Helper.distribution_random_plan, stats=self.stats)
-            Randomizer.random_generate()
+            Randomizer = RandomGenerator(self._binary_trie, self.Help, distribution_plan=self.Help.distribution_random_plan, stats=self.stats,
+                                         rng=RandomStream.create(self.seed, RandomStream.RANDOM_PHASE))
+
+            with self.metrics.measure('random'):
+                Randomizer.random_generate()
 
             if self.stats:
                 print("[RANDOM GENERATING]: Random generating phase successfully done")
@@ -111,17 +251,42 @@ class V6Generator:
         if self.stats:
             print("[TRIE TRAVERSING GENERATING]: Start generating prefixes using constructed trie")
 
-        self._binary_trie.generate_prefixes()
+        if self.workers > 1:
+            # blocks always use random streams, seed of streams is taken from random module if seed isn't set
+            seed = self.seed if self.seed is not None else random.getrandbits(64)
+            rng = RandomStream(seed, (RandomStream.TRAVERSAL_PHASE,))
+
+            with self.metrics.measure('traversal'):
+                ParallelGenerator(self._binary_trie, self.Help, rng, workers=self.workers, stats=self.stats).generate()
+        else:
+            self._binary_trie.rng = RandomStream.create(self.seed, RandomStream.TRAVERSAL_PHASE)
+
+            with self.metrics.measure('traversal'):
+                self._binary_trie.generate_prefixes()
 
         if self.stats:
             print("[TRIE TRAVERSING GENERATING]: Traversing trie generating phase successfully done")
 
-        new_prefixes = set(AbstractTrie.get_prefix_nodes(self._binary_trie.root_node))
+    def bulk_generate(self) -> None:
+        """Generate new prefixes of random and trie traversal phase by batches of arrays. New prefixes aren't added to
+        binary trie.
 
-        output_converter = Converter(new_prefixes)
-        converted_prefixes = output_converter.convert_prefixes()
+        :return: None
+        """
+        if self.stats:
+            print("[BULK GENERATING]: Start generating prefixes by batches")
 
-        return converted_prefixes
+        # numpy generator is always created from random stream, seed is taken from random module if seed isn't set
+        seed = self.seed if self.seed is not None else random.getrandbits(64)
+        rng = RandomStream(seed, (RandomStream.TRAVERSAL_PHASE,)).get_generator()
+        self._bulk_generator = BulkGenerator(self._binary_trie, self.Help, self.max_level, rng, stats=self.stats,
+                                             metrics=self.metrics)
+
+        with self.metrics.measure('bulk'):
+            self._bulk_generator.generate()
+
+        if self.stats:
+            print("[BULK GENERATING]: Bulk generating phase successfully done")
 
     def _check_depth_distribution(self) -> None:
         """Check input parameter depth distribution.
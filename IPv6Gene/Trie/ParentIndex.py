@@ -0,0 +1,75 @@
+# was developed by Utkin Kirill
+
+import attr
+
+from typing import List
+from Common.Trie.Node.Node import Node
+from Common.Abstract.AbstractTrie import AbstractTrie
+from Common.Exceptions.Exceptions import MaximumLevelException
+
+
+@attr.s
+class ParentIndex:
+    """
+    Parent nodes of one organisation level which could be used for generating new prefixes. Nodes whose level
+    headroom doesn't allow to add child prefix node are skipped when index is created, exhausted nodes are removed by
+    moving the last node to their position, so random parent node is selected in constant time.
+
+    Headroom of a node depends just on the length of its prefix path (see has_headroom). New prefixes of one plan entry
+    are longer than all parent nodes of the entry, so prefix paths of parent nodes don't change and the index is
+    filtered just once per entry. New prefix can still exceed maximum level if its bits hit a node above existing prefix
+    nodes, that depends on the bits, not on the parent node
+    """
+    nodes = attr.ib(factory=list, type=List[Node])
+
+    @staticmethod
+    def create(binary_trie: AbstractTrie, nodes: List[Node]) -> 'ParentIndex':
+        """Create index of nodes which could be used as parents of new leaf prefix nodes.
+
+        :param binary_trie: trie which contains :param nodes
+        :param nodes: list; prefix nodes of one organisation level
+        :return: ParentIndex object
+        """
+        return ParentIndex([node for node in nodes if ParentIndex.has_headroom(binary_trie, node)])
+
+    @staticmethod
+    def has_headroom(binary_trie: AbstractTrie, node: Node) -> bool:
+        """Check if new leaf prefix node could be added under :param node without exceeding maximum possible level.
+
+        New leaf raises level of the n-th prefix node on its prefix path (counted from 0) to at least n + 1. Levels
+        of prefix nodes never exceed maximum possible level, so leaf could always be added if prefix path isn't longer
+        than maximum possible level. Longer paths are checked by get_new_level.
+
+        :param binary_trie: trie which contains :param node
+        :param node: prefix node
+        :return: boolean; True if new leaf prefix node could be added under the node
+        """
+        prefix_path = AbstractTrie.get_just_prefix_path(node)
+
+        if len(prefix_path) <= binary_trie.max_possible_level:
+            return True
+
+        try:
+            binary_trie.get_new_level(None, prefix_path)
+
+        except MaximumLevelException:
+            return False
+
+        return True
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __getitem__(self, position: int) -> Node:
+        return self.nodes[position]
+
+    def remove(self, position: int) -> None:
+        """Remove exhausted node from index. Last node is moved to the position of removed node.
+
+        :param position: int; position of the node in index
+        :return: None
+        """
+        last_node = self.nodes.pop()
+
+        if position < len(self.nodes):
+            self.nodes[position] = last_node
@@ -1,15 +1,15 @@
 # was developed by Utkin Kirill
 
 import attr
-import random
 
 from Common.Trie.Node.Node import Node
 from Common.Abstract.AbstractHelper import AbstractHelper
 from Common.Abstract.AbstractTrie import AbstractTrie
 from IPv6Gene.Generator.Helper import Helper
+from IPv6Gene.Trie.ParentIndex import ParentIndex
 from Common.Exceptions.Exceptions import PrefixAlreadyExists, MaximumLevelException, CannotGenerateDueMaximumLevel
 
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 @attr.s
@@ -19,79 +19,83 @@ class Trie(AbstractTrie):
     """
     Help = attr.ib(default=None, type=Helper)
     stats = attr.ib(default=False, type=bool)
-    nodes = {
+    # prefix nodes by organisation level, which are used as parents for generating
+    nodes = attr.ib(factory=lambda: {
         1: [], 2: [], 3: [], 4: [],
-    }
+    }, type=Dict[int, List[Node]])
 
     def __attrs_post_init__(self) -> None:
+        super().__attrs_post_init__()
+
         for value in range(65):
             self._prefix_nodes[value] = 0
             self._prefix_leaf_nodes[value] = 0
 
-    def add_node(self, node_value: str, parent_node: Optional[Node] = None, creating_phase: bool = True) -> Node:
+        # root node without child nodes is a leaf node
+        self._prefix_leaf_nodes[0] = 1
+
+    def add_node(self, node_value: int, node_len: int, parent_node: Optional[Node] = None,
+                 creating_phase: bool = True) -> Node:
         """Add new node to binary trie.
 
         :raises  PrefixAlreadyExists in case if new node already exists in binary trie. Method isn't called in
                     creating phase
         :raises  MaximumLevelException in case if after adding a new node to binary trie level changes and greater than max possible value
 
-        :param node_value: string; string representation of node
+        :param node_value: integer; integer representation of node
+        :param node_len: integer; number of bits in :param node_value
         :param parent_node None or Node; node object which represent the parent for added node
         :param creating_phase boolean; signalize phase of generator when node is added while binary trie is initializing
 
         :return: constructed node object
         """
-        if not parent_node:
-            current_node = self.root_node
-        else:
-            current_node = parent_node
-
-        if not creating_phase and AbstractTrie.is_exist(current_node, node_value):
-            raise PrefixAlreadyExists
-
-        for curr_len, bit in enumerate(node_value, 1):
-
-            if bit == '0':
+        current_node = self.insert_node(node_value, node_len, parent_node, creating_phase)
+        self.register_prefix(current_node, creating_phase)
 
-                if not current_node.left_child:
-                    current_node.left_child = Node(bit, current_node.depth + 1)
-                    current_node.left_child.path = current_node
-
-                current_node = current_node.left_child
-
-            else:
+        return current_node
 
-                if not current_node.right_child:
-                    current_node.right_child = Node(bit, current_node.depth + 1)
-                    current_node.right_child.path = current_node
+    def register_prefix(self, node: Node, creating_phase: bool = True) -> None:
+        """Update number of prefix nodes, trie depth and lists of nodes by organisation level after new prefix node was
+        added.
 
-                current_node = current_node.right_child
+        :param node: new prefix node
+        :param creating_phase: boolean; signalize phase of generator when node is added while binary trie is
+                               initializing
+        :return: None
+        """
+        self._prefix_nodes[node.depth] += 1
 
-        try:
-            self.calculate_level(current_node)
+        node.generated = not creating_phase
 
-        except MaximumLevelException:
+        if node.depth > self._trie_depth:
+            self._trie_depth = node.depth
 
-            if not current_node.right_child and not current_node.left_child:
-                AbstractTrie.delete_node_from_trie(current_node)
-            raise
+        org_level = self.Help.get_organisation_level_by_depth(node.depth)
 
-        current_node.prefix_flag = True
-        self._prefix_nodes[current_node.depth] += 1
+        if org_level == 0 and creating_phase:
+            return
 
-        current_node.generated = not creating_phase
+        self.nodes[org_level].append(node)
 
-        if current_node.depth > self._trie_depth:
-            self._trie_depth = current_node.depth
+    def copy_state(self, trie: AbstractTrie, get_copied_node) -> None:
+        """Copy lists of nodes by organisation level to the clone of this trie.
 
-        org_level = self.Help.get_organisation_level_by_depth(current_node.depth)
+        :param trie: clone of this trie
+        :param get_copied_node: function which returns node of :param trie for node of this trie
+        :return: None
+        """
+        trie.nodes = {org_level: [get_copied_node(node) for node in nodes] for org_level, nodes in self.nodes.items()}
 
-        if org_level == 0 and creating_phase:
-            return current_node
+    def restore_prefix(self, node: Node) -> None:
+        """Add seed prefix node which was loaded from snapshot to the list of nodes by organisation level.
 
-        self.nodes[org_level].append(current_node)
+        :param node: seed prefix node
+        :return: None
+        """
+        org_level = self.Help.get_organisation_level_by_depth(node.depth)
 
-        return current_node
+        if org_level != 0:
+            self.nodes[org_level].append(node)
 
     def generate_prefixes(self, node: Node = None) -> None:
         """Generate new prefixes using constructed binary trie.
@@ -100,10 +104,11 @@ class Trie(AbstractTrie):
 
         2)Try to generate prefixes to the following organisation level.
 
-        3)If generating isn't possible from the currently selected node due to :exception MaximumLevelException, this
-        node will be added to set of already used nodes.
+        3)Parent node is selected randomly from the index of nodes which level headroom allows to add new prefix
+        nodes (see ParentIndex). If generating from the currently selected node fails 5 times due to :exception
+        MaximumLevelException, this node is removed from the index.
 
-        4)In case that all nodes were used and generating process from all of them isn't possible due to :exception
+        4)In case that index is empty and generating process from all nodes isn't possible due to :exception
         MaximumLevelException, end script with the error message.
 
         5) Otherwise, append new node to the particular organisation level in nodes variable and allow generating from
@@ -118,7 +123,6 @@ class Trie(AbstractTrie):
 
         for plan_entry in self.Help.distribution_plan:
 
-            used_nodes = set()
             parent_node_level = self.Help.get_organisation_level_by_depth(plan_entry['interval'][0]) - 1
 
             if parent_node_level == 3:
@@ -132,43 +136,51 @@ class Trie(AbstractTrie):
                     f"[GENERATING PROCESS]: Currently prefixes is being generated on interval:{plan_entry.get('interval')}"
                 )
 
+            # new prefix nodes are added to the next organisation level, so parent nodes are the same for whole entry
+            parent_nodes = ParentIndex.create(self, self.nodes[parent_node_level])
+
             while plan_entry["generated_info"]:
                 new_prefix_len = list(plan_entry["generated_info"].keys())[0]
 
                 if not len(self.nodes[parent_node_level]):
                     raise ValueError("New prefixes cannot be generated because there is no prefix nodes on the "
                                      "previous organisation level. Please, change depth_distribution")
+
+                if not len(parent_nodes):
+                    raise CannotGenerateDueMaximumLevel("Cannot generate prefix from any prefix in trie "
+                                                        "(level always is great than maximum possible level)")
                 attempts = 0
                 node_added = False
 
-                node_index = random.randint(0, len(self.nodes[parent_node_level]) - 1)
-
-                while node_index in used_nodes:
-                    node_index = random.randint(0, len(self.nodes[parent_node_level]) - 1)
+                node_index = self.rng.randint(0, len(parent_nodes) - 1)
+                parent_node = parent_nodes[node_index]
 
                 while attempts < 5:
 
                     try:
 
-                        new_bits = AbstractHelper.generate_new_bits(self.nodes[parent_node_level][node_index].depth, new_prefix_len)
-                        self.add_node(new_bits, parent_node=self.nodes[parent_node_level][node_index], creating_phase=False)
+                        new_bits = AbstractHelper.generate_new_bits(parent_node.depth, new_prefix_len, self.rng)
+                        self.add_node(new_bits, new_prefix_len - parent_node.depth, parent_node=parent_node,
+                                      creating_phase=False)
                         node_added = True
 
                         break
 
-                    except PrefixAlreadyExists:
+                    except PrefixAlreadyExists as exc:
+                        self.metrics.count_exception(exc, parent_node_level + 1, new_prefix_len)
                         break
 
-                    except MaximumLevelException:
+                    except MaximumLevelException as exc:
+                        self.metrics.count_exception(exc, parent_node_level + 1, new_prefix_len)
                         attempts += 1
 
+                        # new node could be placed above existing prefix nodes, other bits are tried in this case.
+                        # Headroom of the parent node itself doesn't change during the entry (see ParentIndex)
                         if attempts >= 5:
-                            used_nodes.add(node_index)
+                            parent_nodes.remove(node_index)
+                            self.metrics.exhausted_parents[parent_node_level] += 1
                             break
 
-                        if len(used_nodes) == len(self.nodes[parent_node_level]):
-                            raise CannotGenerateDueMaximumLevel("Cannot generate prefix from any prefix in trie "
-                                                                "(level always is great than maximum possible level)")
                         continue
 
                 if node_added:
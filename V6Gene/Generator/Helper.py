@@ -6,26 +6,27 @@ from typing import Dict, List
 from Common.Abstract.AbstractHelper import AbstractHelper
 
 
+@attr.s
 class Helper(AbstractHelper):
 
     leafs_prefixes = attr.ib(factory=dict, type=dict)
 
     # Helper structure which contains a number of prefixes on organisation levels for random generating process
-    distribution_random_plan = [
+    distribution_random_plan = attr.ib(factory=lambda: [
         {'interval': [0, 12], 'generated_info': {}},
         {'interval': [12, 32], 'generated_info': {}},
         {'interval': [32, 48], 'generated_info': {}},
         {'interval': [48, 64], 'generated_info': {}},
         {'interval': [64, 65], 'generated_info': {}}
-    ]
+    ], type=List[Dict])
 
     # Helper structure which contains a maximum number of prefixes that could be generated by selected node
-    generating_strategy = [
+    generating_strategy = attr.ib(factory=lambda: [
         {'interval': [12, 32], 'generating_strategy': None},
         {'interval': [32, 48], 'generating_strategy': None},
         {'interval': [48, 64], 'generating_strategy': None},
         {'interval': [64, 65], 'generating_strategy': None}
-    ]
+    ], type=List[Dict])
 
     def create_distributing_plan(self) -> None:
         """Initialize distribution plan variable.
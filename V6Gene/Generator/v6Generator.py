@@ -1,27 +1,48 @@
 # was developed by Utkin Kirill
 
 import attr
+import os
+import random
 
-from typing import Dict
+from typing import Dict, Iterator, List, Optional
 from V6Gene.Trie import Trie
 from V6Gene.Generator.Helper import Helper
 from Common.Converter.Converter import Converter
+from Common.Random.RandomStream import RandomStream
+from Common.Metrics.Metrics import Metrics
 from Common.Abstract.AbstractTrie import AbstractTrie
-from Common.Exceptions.Exceptions import MaximumLevelException, PrefixAlreadyExists
+from Common.Exceptions.Exceptions import MaximumLevelException, NoFreePrefixException, CannotGenerateDueMaximumLevel
 
 
 @attr.s
 class V6Generator:
+    # number of free prefixes which are tried for one new prefix before generating is stopped due to maximum level
+    MAX_ATTEMPTS = 1000
+
     # Helper parameters
     prefix_quantity = attr.ib(type=int)
     rgr = attr.ib(type=float)
     depth_distribution = attr.ib(factory=dict, type=Dict)
     level_distribution = attr.ib(factory=dict, type=Dict)
     input_prefixes = attr.ib(factory=list, type=list)
-    Help = attr.ib(default=Helper(), type=Helper)
+    Help = attr.ib(factory=Helper, type=Helper)
+    compact_trie = attr.ib(default=False, type=bool)
+    path_compression = attr.ib(default=False, type=bool)
+    # path to the seed trie snapshot. Seed trie is loaded from snapshot if it exists and saved to it otherwise
+    seed_snapshot = attr.ib(default=None, type=Optional[str])
+    # map seed trie snapshot to memory instead of reading it, so parallel generators share one copy of seed trie
+    memory_map = attr.ib(default=False, type=bool)
+    # constructed seed trie which is cloned instead of constructing new one, so seed trie could be constructed once for
+    # many generators in one process
+    seed_trie = attr.ib(default=None, type=Optional[Trie.Trie])
+    # seed of counter-based random generator, every generating phase uses own random stream. Random module is used
+    # if seed isn't set
+    seed = attr.ib(default=None, type=Optional[int])
+    # time of generating phases and counters of trie operations. Could be shared with caller which measures other phases
+    metrics = attr.ib(factory=Metrics, type=Metrics)
 
     # Parameters for generating
-    _binary_trie = attr.ib(default=Trie.Trie(), type=Trie)
+    _binary_trie = attr.ib(factory=Trie.Trie, type=Trie)
     _randomly_generated_prefixes = attr.ib(default=0, type=int)
     _generated_traversing_trie = attr.ib(default=0, type=int)
 
@@ -32,12 +53,17 @@ class V6Generator:
         """Initialize other generator class attributes.
         :return: None
         """
+        if self.compact_trie or self.path_compression or self.seed_snapshot:
+            # snapshot is created from compact node storage
+            self._binary_trie = Trie.Trie(compact=self.compact_trie or bool(self.seed_snapshot),
+                                          path_compression=self.path_compression)
+
+        self._binary_trie.metrics = self.metrics
+
         #  Construct the seed prefix trie
-        for prefix in self.input_prefixes:
-            self._binary_trie.add_node(prefix)
+        with self.metrics.measure('construct'):
+            self.construct_trie()
 
-        # Check leaf nodes in binary trie
-        self._binary_trie.trie_traversal("statistic")
         # Check if generating based on depth and level parameter is even possible
         self._check_depth_distribution()
         self._check_level_distribution()
@@ -63,6 +89,28 @@ class V6Generator:
 
         self._binary_trie._maximum_trie_traversal_generated = self._generated_traversing_trie
 
+    def construct_trie(self) -> None:
+        """Construct the seed prefix trie from input prefixes, clone it from seed_trie or load it from the seed trie
+        snapshot.
+
+        :return: None
+        """
+        if self.seed_trie is not None:
+            self._binary_trie = self.seed_trie.clone()
+            self._binary_trie.Help = self.Help
+            self._binary_trie.metrics = self.metrics
+            return
+
+        if self.seed_snapshot and os.path.exists(self.seed_snapshot):
+            self._binary_trie.load_snapshot(self.seed_snapshot, self.memory_map)
+            return
+
+        # leaf nodes are counted while trie is constructed
+        self._binary_trie.bulk_load(self.input_prefixes)
+
+        if self.seed_snapshot:
+            self._binary_trie.save_snapshot(self.seed_snapshot, self.input_prefixes)
+
     def help_init(self) -> None:
         """
         Initialize all helper structures which will be used during the generating process
@@ -70,11 +118,26 @@ class V6Generator:
         """
         self.Help.start_depth_distribution = self._binary_trie.full_prefix_nodes
         self.Help.final_depth_distribution = self.depth_distribution
-        self.Help.leafs_prefixes = self._binary_trie.prefix_leaf_nodes
+        # leaf nodes are updated by the trie while prefixes are generated, plan uses leaf nodes of the seed trie
+        self.Help.leafs_prefixes = dict(self._binary_trie.prefix_leaf_nodes)
 
         self.Help.create_distributing_plan()
         self.Help.create_distributing_strategy(self._binary_trie.prefix_leaf_nodes)
 
+    def get_depth_distribution(self) -> Dict[int, int]:
+        """Get number of prefix nodes by depth. Value is maintained by binary trie.
+
+        :return: dictionary; depth: number of prefix nodes
+        """
+        return dict(self._binary_trie.full_prefix_nodes)
+
+    def get_level_distribution(self) -> Dict[int, int]:
+        """Get number of prefix nodes by level. Value is maintained by binary trie.
+
+        :return: dictionary; level: number of prefix nodes
+        """
+        return self._binary_trie.level_nodes
+
     def get_root(self):
         """
         Return the root node of constructed binary trie
@@ -82,35 +145,66 @@ class V6Generator:
         """
         return self._binary_trie.root_node
 
-    def start_generating(self):
+    def start_generating(self) -> List[str]:
+        """Start generating process.
 
-        if self.rgr != 1:
-            self._binary_trie.trie_traversal("generate")
+        :return: list with generated prefixes
+        """
+        self.generate()
 
-        # second phase of generating - random generating
-        if self.rgr != 0:
+        with self.metrics.measure('convert'):
+            return self.get_converted_prefixes().convert_prefixes()
 
-            # Generate prefixes that couldn't be added to trie by generating process
-            self._random_generate(self.Help.distribution_random_plan)
+    def stream_generating(self) -> Iterator[str]:
+        """Start generating process. Prefixes are converted lazily while result iterator is consumed, so whole output
+        dataset isn't saved in memory.
 
-            if self.Help.distribution_plan:
-                self._random_generate(self.Help.distribution_plan, True)
+        :return: iterator of generated prefixes
+        """
+        self.generate()
 
-        new_prefixes = set(AbstractTrie.get_prefix_nodes(self._binary_trie.root_node))
+        return self.get_converted_prefixes().iterate_converted_prefixes()
 
-        output_converter = Converter(new_prefixes)
-        converted_prefixes = output_converter.convert_prefixes()
+    def get_converted_prefixes(self) -> Converter:
+        """Create converter for all prefixes in binary trie. Prefixes are read from trie just when converter is used.
+
+        :return: Converter object
+        """
+        return Converter(AbstractTrie.iterate_prefixes(self._binary_trie.root_node))
 
-        return converted_prefixes
+    def generate(self) -> None:
+        """Generate new prefixes into binary trie.
+
+        :return: None
+        """
+        if self.rgr != 1:
+            self._binary_trie.rng = RandomStream.create(self.seed, RandomStream.TRAVERSAL_PHASE)
 
-    def _random_generate(self, distribution_plan: Dict, additional_generate: bool = False) -> None:
+            with self.metrics.measure('traversal'):
+                self._binary_trie.trie_traversal("generate")
+
+        # second phase of generating - random generating
+        if self.rgr != 0:
+            rng = RandomStream.create(self.seed, RandomStream.RANDOM_PHASE)
+
+            with self.metrics.measure('random'):
+                # Generate prefixes that couldn't be added to trie by generating process
+                self._random_generate(self.Help.distribution_random_plan, rng=rng)
+
+                if self.Help.distribution_plan:
+                    self._random_generate(self.Help.distribution_plan, True, rng)
+
+    def _random_generate(self, distribution_plan: Dict, additional_generate: bool = False, rng=random) -> None:
         """Randomly generate new prefixes.
 
         :param distribution_plan: len of prefixes, which should be generated.
         :param additional_generate: signalize if some number of prefixes wasn't generated after first phase.
+        :param rng: random generator; random module or Common.Random.RandomStream object
+        :raises CannotGenerateDueMaximumLevel in case if all prefixes with some length already exist or if
+                MAX_ATTEMPTS free prefixes in a row exceed maximum possible level
         :return: None
         """
-        IANA = '001'
+        IANA = 0b001
 
         for org_level in distribution_plan:
             org_level_plan = org_level['generated_info']
@@ -121,23 +215,31 @@ class V6Generator:
                     if self._randomly_generated_prefixes == 0 and not additional_generate:
                         return
 
-                    while True:
+                    for attempt in range(self.MAX_ATTEMPTS):
                         try:
-                            # First 4 bits will be IANA part
-                            new_bits = Helper.generate_new_bits(3, prefix_len)
-                            new_prefix = IANA + new_bits
-                            self._binary_trie.add_node(new_prefix, creating_phase=False)
+                            # First 3 bits will be IANA part. Just prefixes which don't exist yet are selected
+                            new_prefix = self._binary_trie.sample_free_prefix(IANA, 3, prefix_len, rng)
+                            self._binary_trie.add_node(new_prefix, prefix_len, creating_phase=False)
 
                             self._randomly_generated_prefixes -= 1
 
                             break
 
-                        except PrefixAlreadyExists:
-                            continue
+                        except NoFreePrefixException:
+                            raise CannotGenerateDueMaximumLevel(f"Cannot generate prefix with length {prefix_len} "
+                                                                f"randomly (all prefixes with this length already "
+                                                                f"exist). Please, change depth_distribution")
 
-                        except MaximumLevelException:
+                        except MaximumLevelException as exc:
+                            self.metrics.count_exception(exc, self.Help.get_organisation_level_by_depth(prefix_len),
+                                                         prefix_len)
                             continue
 
+                    else:
+                        raise CannotGenerateDueMaximumLevel(f"Cannot generate prefix with length {prefix_len} "
+                                                            f"randomly (level always is great than maximum possible "
+                                                            f"level)")
+
     def _check_depth_distribution(self) -> None:
         """Check input parameter depth distribution.
         Check input parameter and control if generating is even possible
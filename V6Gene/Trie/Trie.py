@@ -17,10 +17,15 @@ class Trie(AbstractTrie):
     Help = attr.ib(default=None, type=Helper)
 
     def __attrs_post_init__(self):
+        super().__attrs_post_init__()
+
         for value in range(65):
             self._prefix_nodes[value] = 0
             self._prefix_leaf_nodes[value] = 0
 
+        # root node without child nodes is a leaf node
+        self._prefix_leaf_nodes[0] = 1
+
         for value in range(6):
             self._level_distribution[value] = 0
 
@@ -36,15 +41,6 @@ class Trie(AbstractTrie):
         """
         return self._generated_prefixes
 
-    @property
-    def prefix_leaf_nodes(self) -> Dict:
-        """Return all leaf prefixes.
-        For set this parameter call a preorder method with :param action as 'statistic'
-
-        :return: dictionary; dict in format {depth: num. leaf node prefixes}
-        """
-        return self._prefix_leaf_nodes
-
     @property
     def init_max_level(self) -> int:
 
@@ -64,68 +60,54 @@ class Trie(AbstractTrie):
         self.root_node.prefix_flag = True
         self._prefix_nodes[0] += 1
 
-    def add_node(self, node_value: str, parent_node: Optional[Node] = None, creating_phase: bool = True) -> Node:
+    def add_node(self, node_value: int, node_len: int, parent_node: Optional[Node] = None,
+                 creating_phase: bool = True) -> Node:
         """Add new node to binary trie.
 
         :raises  PrefixAlreadyExists in case if new node already exists in binary trie. Method isn't called in
                     creating phase
         :raises  MaximumLevelException in case if after adding a new node to binary trie level changes and greater than max possible value
 
-        :param node_value: string; string representation of node
+        :param node_value: integer; integer representation of node
+        :param node_len: integer; number of bits in :param node_value
         :param parent_node None or Node; node object which represent the parent for added node
         :param creating_phase boolean; signalize phase of generator when node is added while binary trie is initializing
 
         :return: constructed node object
         """
-        if not parent_node:
-            current_node = self.root_node
-        else:
-            current_node = parent_node
-
-        if not creating_phase and AbstractTrie.is_exist(current_node, node_value):
-            raise PrefixAlreadyExists
-
-        for curr_len, bit in enumerate(node_value, 1):
-
-            if bit == '0':
-
-                if not current_node.left_child:
-                    current_node.left_child = Node(bit, current_node.depth + 1)
-                    current_node.left_child.path = current_node
-
-                current_node = current_node.left_child
-
-            else:
-
-                if not current_node.right_child:
-                    current_node.right_child = Node(bit, current_node.depth + 1)
-                    current_node.right_child.path = current_node
-
-                current_node = current_node.right_child
+        current_node = self.insert_node(node_value, node_len, parent_node, creating_phase)
+        self.register_prefix(current_node, creating_phase)
 
-        try:
-            self.calculate_level(current_node)
-
-        except MaximumLevelException:
-
-            if not current_node.right_child and not current_node.left_child:
-                AbstractTrie.delete_node_from_trie(current_node)
+        return current_node
 
-            raise
+    def register_prefix(self, node: Node, creating_phase: bool = True) -> None:
+        """Update number of prefix nodes and trie depth after new prefix node was added.
 
-        current_node.prefix_flag = True
-        self._prefix_nodes[current_node.depth] += 1
+        :param node: new prefix node
+        :param creating_phase: boolean; signalize phase of generator when node is added while binary trie is
+                               initializing
+        :return: None
+        """
+        self._prefix_nodes[node.depth] += 1
 
         if not creating_phase:
-            current_node.allow_generate = False
+            node.allow_generate = False
 
-        if current_node.depth > self._trie_depth:
-            self._trie_depth = current_node.depth
+        if node.depth > self._trie_depth:
+            self._trie_depth = node.depth
 
-        return current_node
+    def copy_state(self, trie: AbstractTrie, get_copied_node) -> None:
+        """Copy level distribution to the clone of this trie.
+
+        :param trie: clone of this trie
+        :param get_copied_node: function which returns node of :param trie for node of this trie
+        :return: None
+        """
+        trie._level_distribution = dict(self._level_distribution)
 
     def trie_traversal(self, action: str) -> None:
-        """Traversal binary trie and run particular action if leaf node is found
+        """Traversal binary trie and run particular action if leaf node is found. Leaf nodes are maintained by the trie,
+        so 'statistic' action counts them again instead of adding them to current numbers
 
         :param action: name of action which should be start
         :return: None
@@ -134,6 +116,10 @@ class Trie(AbstractTrie):
         if not self.root_node:
             return
 
+        if action == 'statistic':
+            self.count_nodes()
+            return
+
         node_path = list()
         node_path.append(self.root_node)
 
@@ -148,10 +134,7 @@ class Trie(AbstractTrie):
                 node_path.append(node.left_child)
 
             if not node.left_child and not node.right_child:
-                if action == 'statistic':
-                    self.prefix_leaf_nodes[node.depth] += 1
-                else:
-                    self.generate_prefixes(node)
+                self.generate_prefixes(node)
 
     def generate_prefixes(self, node: Node) -> None:
         """Generate new prefixes from selected node :param node
@@ -179,8 +162,8 @@ class Trie(AbstractTrie):
             number_of_generated_prefixes = self.Help.get_plan_values(prefix_depth_level + 1, new_prefix_depth)
 
             try:
-                new_bits = Helper.generate_new_bits(node.depth, new_prefix_depth)
-                self.add_node(new_bits, parent_node=node, creating_phase=False)
+                new_bits = Helper.generate_new_bits(node.depth, new_prefix_depth, self.rng)
+                self.add_node(new_bits, new_prefix_depth - node.depth, parent_node=node, creating_phase=False)
 
                 if number_of_generated_prefixes - 1 == 0:
                     self.Help.remove_from_plan(prefix_depth_level + 1, new_prefix_depth)
@@ -191,7 +174,12 @@ class Trie(AbstractTrie):
                 used_strategy -= 1
                 self._trie_traversal_generated += 1
 
-            except (PrefixAlreadyExists, MaximumLevelException):
+            except (PrefixAlreadyExists, MaximumLevelException) as exc:
+                self.metrics.count_exception(exc, prefix_depth_level + 1, new_prefix_depth)
+
+                if node.allow_generate:
+                    self.metrics.exhausted_parents[prefix_depth_level] += 1
+
                 self._trie_traversal_generated += 1
                 used_strategy -= 1
                 node.allow_generate = False
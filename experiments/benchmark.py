@@ -0,0 +1,157 @@
+# was developed by Utkin Kirill
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import random
+import resource
+import statistics
+import tempfile
+
+from typing import Dict, List
+from Common.Converter.Converter import Converter
+from Common.Metrics.Metrics import Metrics
+from Common.Validator.Validator import InputArgumentsValidator
+from IPv6Gene.Generator.v6Generator import V6Generator as IPv6GeneGenerator
+from V6Gene.Generator.v6Generator import V6Generator as V6GeneGenerator
+
+MAIN_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GENERATORS = ('v6gene', 'ipv6gene')
+PHASES = ('parse', 'construct', 'random', 'traversal', 'bulk', 'convert', 'output')
+
+# V6Gene uses just the maximum level with non-zero number of prefixes from level distribution
+LEVEL_DISTRIBUTION = {0: 63754, 1: 4582, 2: 655, 3: 101, 4: 12, 5: 3, 6: 0}
+MAX_LEVEL = 5
+RGR = 0.05
+
+
+def run_case(case: Dict) -> Dict:
+    """
+    Generate prefixes of one benchmark case and measure time of every phase. Is called in separate process, so peak
+    memory belongs just to this case
+    :param case: dictionary; generator, seed file, depth distribution file and parameters of the generator
+    :return: dictionary; case with measured values. Error is set if prefixes couldn't be generated for this case
+    """
+    random.seed(case['seed'])
+
+    metrics = Metrics()
+    depth_distribution = InputArgumentsValidator.parse_depth_distribution_file(os.path.join(MAIN_PATH,
+                                                                                            case['distribution']))
+    prefix_quantity = sum(depth_distribution.values())
+    result = dict(case, prefix_quantity=prefix_quantity, generated=0, error=None)
+
+    try:
+        with metrics.measure('parse'):
+            input_prefixes = InputArgumentsValidator.read_seed_file(os.path.join(MAIN_PATH, case['seed_file']))
+
+        if case['generator'] == 'ipv6gene':
+            generator = IPv6GeneGenerator(prefix_quantity=prefix_quantity, depth_distribution=depth_distribution,
+                                          max_level=MAX_LEVEL, input_prefixes=input_prefixes,
+                                          compact_trie=case['compact_trie'], bulk=case['bulk'], metrics=metrics)
+
+        else:
+            generator = V6GeneGenerator(prefix_quantity=prefix_quantity, rgr=RGR, depth_distribution=depth_distribution,
+                                        level_distribution=LEVEL_DISTRIBUTION, input_prefixes=input_prefixes,
+                                        compact_trie=case['compact_trie'], metrics=metrics)
+
+        new_prefixes = generator.start_generating()
+
+        with metrics.measure('output'), tempfile.TemporaryFile('w') as file:
+            result['generated'] = Converter.write_prefixes(new_prefixes, file)
+
+    except Exception as exc:
+        result['error'] = str(exc)
+
+    result['metrics'] = metrics.to_dict()
+    result['phases'] = {phase: metrics.phases.get(phase, dict()).get('wall_time', 0.0) for phase in PHASES}
+    result['total_time'] = sum(result['phases'].values())
+
+    # maximum resident set size is in kilobytes on Linux
+    result['peak_memory'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    return result
+
+
+def get_cases(parsed_arguments: Dict) -> List[Dict]:
+    """
+    Create benchmark case for every generator, seed file and depth distribution file
+    :param parsed_arguments: dictionary with input arguments
+    :return: list of cases
+    """
+    return [{'generator': generator, 'seed_file': os.path.relpath(seed_file, MAIN_PATH),
+             'distribution': os.path.relpath(distribution, MAIN_PATH), 'seed': parsed_arguments['seed'],
+             'compact_trie': parsed_arguments['compact_trie'], 'bulk': parsed_arguments['bulk']}
+            for generator in parsed_arguments['generators']
+            for seed_file in parsed_arguments['seed_files']
+            for distribution in parsed_arguments['distributions']]
+
+
+def parse_args() -> Dict:
+    """
+    Prepare argparse object for working with input arguments
+    :return: dictionary which has a following format -> input_argument_name: argument_value
+    """
+    parser = argparse.ArgumentParser(description="Benchmark of V6Gene and IPv6Gene generators")
+
+    parser.add_argument('--generators', nargs='+', choices=GENERATORS, default=list(GENERATORS),
+                        help="Benchmarked generators")
+
+    parser.add_argument('--seed_files', nargs='+',
+                        default=sorted(glob.glob(os.path.join(MAIN_PATH, 'formated_datasets', '*'))),
+                        help="Seed prefix files. All files from formated_datasets folder are used by default")
+
+    parser.add_argument('--distributions', nargs='+',
+                        default=[os.path.join(MAIN_PATH, 'distributions', 'depth_distribution', '2019_dataset.in')] +
+                        sorted(glob.glob(os.path.join(MAIN_PATH, 'distributions', 'depth_distribution', 'big_datasets',
+                                                      '*'))),
+                        help="Depth distribution files. Number of generated prefixes is given by depth distribution")
+
+    parser.add_argument('--seed', type=int, default=1, help="Seed of random module, so every run generates the same "
+                                                            "prefixes")
+
+    parser.add_argument('--compact_trie', action='store_true', required=False, help="Save binary trie nodes in "
+                                                                                    "compact array storage")
+
+    parser.add_argument('--bulk', action='store_true', required=False, help="Generate prefixes of ipv6gene in bulk "
+                                                                            "mode")
+
+    parser.add_argument('--output', default=os.path.join(MAIN_PATH, 'experiments', 'output', 'benchmark.json'),
+                        help="Path to the JSON file with results")
+
+    parser.add_argument('--graph', action='store_true', required=False, help="Create time and memory comparison "
+                                                                             "graphs from results. Graphs will be "
+                                                                             "saved to statistics folder")
+
+    return vars(parser.parse_args())
+
+
+if __name__ == '__main__':
+    parsed_arguments = parse_args()
+    results = list()
+
+    for case in get_cases(parsed_arguments):
+        # every case is run by new process, so memory of previous cases isn't counted
+        with multiprocessing.get_context('fork').Pool(1) as pool:
+            result = pool.apply(run_case, (case,))
+
+        results.append(result)
+
+        if result['error'] is None:
+            print(f"[BENCHMARK]: {result['generator']} {result['seed_file']} {result['distribution']}: "
+                  f"{result['generated']} prefixes in {result['total_time']:.2f} s, {result['peak_memory']:.1f} MB")
+
+        else:
+            print(f"[BENCHMARK]: {result['generator']} {result['seed_file']} {result['distribution']}: "
+                  f"skipped, {result['error']}")
+
+        # results are saved after every case, so finished cases aren't lost if benchmark is stopped
+        with open(parsed_arguments['output'], 'w') as file:
+            json.dump(results, file, indent=4)
+
+    if parsed_arguments['graph']:
+        os.chdir(MAIN_PATH)
+        statistics.time_complexity(results)
+        statistics.compare_memory(results)
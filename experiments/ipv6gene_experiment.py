@@ -28,6 +28,6 @@ if __name__ == '__main__':
         for prefix in new_prefixes:
             file.write(prefix + '\n')
 
-    statistics.create_stats(new_prefixes, 'ipv6gene', generator.get_root())
+    statistics.create_stats(generator.get_depth_distribution(), generator.get_level_distribution(), 'ipv6gene')
 
 
@@ -30,4 +30,4 @@ if __name__ == '__main__':
         for prefix in new_prefixes:
             file.write(prefix + '\n')
 
-    statistics.create_stats(new_prefixes, 'v6gene', generator.get_root())
\ No newline at end of file
+    statistics.create_stats(generator.get_depth_distribution(), generator.get_level_distribution(), 'v6gene')
\ No newline at end of file
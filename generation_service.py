@@ -0,0 +1,54 @@
+# was developed by Utkin Kirill
+
+import argparse
+import sys
+
+from Common.Service.GenerationService import GenerationService
+from Common.Validator.Validator import InputArgumentsValidator as validate
+
+
+def parse_args():
+    """
+    Prepare argparse object for working with input arguments
+    :return: dictionary which has a following format -> input_argument_name: argument_value
+    """
+
+    parser = argparse.ArgumentParser(description="Long-running service which generates prefixes by V6Gene and "
+                                                 "IPv6Gene generators from warm seed tries")
+
+    parser.add_argument('--socket', required=True, help="Path to the Unix socket which accepts generating jobs")
+
+    parser.add_argument('--workers', type=validate.validate_workers, default=1, help="Maximum number of jobs which "
+                                                                                      "are generated concurrently")
+
+    parser.add_argument('--input', nargs='*', default=list(), help="Seed files which tries are constructed when the "
+                                                                   "service is started")
+
+    parser.add_argument('--stats', action='store_true', required=False, help="Print information about accepted jobs")
+
+    return vars(parser.parse_args())
+
+
+def service_start() -> None:
+    try:
+        parsed_arguments = parse_args()
+
+    except Exception as exc:
+        sys.exit(str(exc))
+
+    for seed_file in parsed_arguments['input']:
+        if not validate.validate_file(seed_file, 'r'):
+            sys.exit(f"Input seed file {seed_file} doesn't exist or is not readable")
+
+    service = GenerationService(socket_path=parsed_arguments['socket'], workers=parsed_arguments['workers'],
+                                stats=parsed_arguments['stats'])
+
+    try:
+        service.start(tuple(parsed_arguments['input']))
+
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    service_start()
@@ -1,111 +1,97 @@
 # was developed by Utkin Kirill
 
-import Common.Abstract.AbstractHelper as tt
+import argparse
+import csv
+import json
 import matplotlib.pyplot as plt
+import multiprocessing
 import numpy as np
+import os
 
 from Common.Abstract.AbstractTrie import AbstractTrie
+from Common.BitMatrix.BitMatrix import BitMatrix
 from IPv6Gene.Generator.Helper import Helper
 
 from V6Gene.Trie.Trie import Trie
 from Common.Validator.Validator import InputArgumentsValidator
-from typing import List, Dict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
+# resolution of output graphs
+GRAPH_DPI = 850
+REPORT_FORMATS = ('json', 'csv')
 
-def bit_distribution(bit_value, prefix_set, set_name) -> None:
+
+def bit_distribution(distribution: Dict[int, float], set_name: str, dpi: int = GRAPH_DPI) -> None:
     """
-    Create graphs according to bit distribution for particular dataset. More info could be found in
-    Abstract.AbstractHelper.get_bit_position. Same as method in abstract trie class this method is unused
-    :param bit_value: analysing bit value
-    :param prefix_set: input prefix set with prefixes which will be used for analysing process
+    Create graphs according to bit distribution for particular dataset. Distribution is calculated by
+    Common.BitMatrix.BitMatrix.get_position_frequency
+    :param distribution: how often (in %) analysing bit could be found on particular position
     :param set_name: folder name which will be used for storing output graph
+    :param dpi: resolution of output graph
     :return: None
     """
     fig = plt.figure()
     ax1 = fig.add_subplot(1, 1, 1)
 
-    result = tt.AbstractHelper.get_bit_position(bit_value, prefix_set)
-
-    xs = []
-    ys = []
-
-    for key, value in result.items():
-        xs.append(key)
-        ys.append(value)
-
-    ax1.clear()
-    ax1.plot(xs, ys, marker='x', mew=0.4, linewidth=0.6, color='b')
-    plt.grid(linewidth=0.3)
-    plt.xticks(np.arange(0, 65, 4))
-    plt.yticks(np.arange(0, 105, 5))
+    ax1.plot(list(distribution.keys()), list(distribution.values()), marker='x', mew=0.4, linewidth=0.6, color='b')
+    ax1.grid(linewidth=0.3)
+    ax1.set_xticks(np.arange(0, 65, 4))
+    ax1.set_yticks(np.arange(0, 105, 5))
 
-    plt.xlabel("Pozice bitu")
-    plt.ylabel("Pravděpodobnost výskytu [%]")
+    ax1.set_xlabel("Pozice bitu")
+    ax1.set_ylabel("Pravděpodobnost výskytu [%]")
 
-    plt.savefig(f"statistics/{set_name}/bit_distribution.png", format='png', dpi=850)
+    fig.savefig(f"statistics/{set_name}/bit_distribution.png", format='png', dpi=dpi)
+    plt.close(fig)
 
 
-def level_distribution(distribution, set_name) -> None:
+def level_distribution(distribution: Dict[int, int], set_name: str, dpi: int = GRAPH_DPI) -> None:
     """
     Create graphs according to level distribution for particular dataset.
     :param distribution: level distribution in trie structure for particular nodes
     :param set_name: folder name which will be used for storing output graph
+    :param dpi: resolution of output graph
     :return: None
     """
     fig = plt.figure()
     ax = fig.add_subplot(1, 1, 1)
-    xs = list(distribution.keys())
-    ys = list(distribution.values())
-    ax.bar(xs, ys, color='blue')
+    ax.bar(list(distribution.keys()), list(distribution.values()), color='blue')
 
-    plt.ylabel("Počet prefixů")
-    plt.xlabel("Hodnota úrovně prefixového uzlu")
+    ax.set_ylabel("Počet prefixů")
+    ax.set_xlabel("Hodnota úrovně prefixového uzlu")
 
-    plt.grid(linewidth=0.3)
+    ax.grid(linewidth=0.3)
 
     ax.set_yscale('log')
 
-    plt.savefig(f"statistics/{set_name}/level_distribution.png", format='png', dpi=850)
+    fig.savefig(f"statistics/{set_name}/level_distribution.png", format='png', dpi=dpi)
+    plt.close(fig)
 
 
-def depth_distribution_graph(distribution: Dict, set_name: str) -> None:
+def depth_distribution_graph(distribution: Dict[int, int], set_name: str, dpi: int = GRAPH_DPI) -> None:
     """
     Get statistics and create output graph according to depth distribution of prefix nodes
     :param distribution: output distribution
     :param set_name: path to the folder for saving output graph
+    :param dpi: resolution of output graph
     :return: None
     """
     fig = plt.figure()
     ax1 = fig.add_subplot(1, 1, 1)
 
-    xs = []
-    ys = []
+    prefixes_num = np.array([distribution.get(depth, 0) for depth in range(65)], dtype=np.float64)
+    all_prefixes = prefixes_num.sum()
 
-    convert_to_percent = {key: 0 for key in range(0, 65)}
-    all_prefixes = sum(distribution.values())
+    ax1.bar(np.arange(65), prefixes_num / all_prefixes * 100 if all_prefixes else prefixes_num, color='b')
+    ax1.grid(linewidth=0.3)
+    ax1.set_xticks(np.arange(0, 65, 4))
+    ax1.set_yticks(np.arange(0, 105, 5))
 
-    for i in range(len(convert_to_percent)):
-        number_of_prefixes = distribution[i]
-        convert_to_percent[i] = number_of_prefixes / all_prefixes * 100
+    ax1.set_xlabel("Délka prefixu")
+    ax1.set_ylabel("Počet prefixů [%]")
 
-    # small_range = {}
-
-    for key, value in convert_to_percent.items():
-        # if value < 0.2 and value > 0:
-        #     small_range[key] = value
-        xs.append(key)
-        ys.append(value)
-
-    ax1.clear()
-    ax1.bar(xs, ys, color='b')
-    plt.grid(linewidth=0.3)
-    plt.xticks(np.arange(0, 65, 4))
-    plt.yticks(np.arange(0, 105, 5))
-
-    plt.xlabel("Délka prefixu")
-    plt.ylabel("Počet prefixů [%]")
-    # small_percent_value_part(small_range, set_name)
-    plt.savefig(f"statistics/{set_name}/depth_distribution.png", format='png', dpi=850)
+    fig.savefig(f"statistics/{set_name}/depth_distribution.png", format='png', dpi=dpi)
+    plt.close(fig)
 
 
 def small_percent_value_part(dist, set_name) -> None:
@@ -184,101 +170,219 @@ def get_prefix_nodes_info(root_node) -> None:
     print(f"Number of nodes were allocated incorrectly: {incorrect_nodes}")
 
 
-def create_stats(output_prefixes: List[str], name: str, root_node) -> None:
+def create_report(depth_distribution: Dict[int, int], level_distribution_stats: Dict[int, int],
+                  prefixes: Optional[Iterable[Tuple[int, int]]] = None) -> Dict:
+    """
+    Create report of dataset: depth, level and (if :param prefixes are given) bit distributions. Depth and level
+    distributions are maintained by binary trie, so output prefixes aren't parsed again
+    :param depth_distribution: number of prefix nodes by depth
+    :param level_distribution_stats: number of prefix nodes by level
+    :param prefixes: iterable of (prefix value, prefix len) tuples of dataset for bit distributions
+    :return: dictionary; distribution name: distribution
+    """
+    report = {
+        'depth_distribution': {depth: depth_distribution.get(depth, 0) for depth in range(65)},
+        'level_distribution': {level: level_distribution_stats.get(level, 0)
+                               for level in range(max([6] + list(level_distribution_stats)) + 1)},
+    }
+
+    if prefixes is not None:
+        bit_matrix = BitMatrix.create(prefixes)
+
+        for bit_value in (0, 1):
+            report[f'bit_{bit_value}_distribution'] = dict(enumerate(
+                bit_matrix.get_position_frequency(bit_value).tolist()))
+
+    return report
+
+
+def save_report(report: Dict, name: str, report_format: str) -> str:
+    """
+    Save report to statistics/:param name/report.json or statistics/:param name/report.csv. CSV file contains one
+    row per distribution value
+    :param report: report created by create_report
+    :param name: path to the output folder
+    :param report_format: json or csv
+    :return: string; path to the saved report
+    """
+    os.makedirs(f"statistics/{name}", exist_ok=True)
+    path = f"statistics/{name}/report.{report_format}"
+
+    with open(path, 'w', newline='') as file:
+        if report_format == 'json':
+            json.dump(report, file, indent=4)
+
+        else:
+            writer = csv.writer(file)
+            writer.writerow(('distribution', 'key', 'value'))
+
+            for distribution_name, distribution in report.items():
+                writer.writerows((distribution_name, key, value) for key, value in distribution.items())
+
+    return path
+
+
+def render_graph(graph: Callable, distribution: Dict, name: str, dpi: int) -> None:
     """
-    This method used for creating statistic information about dataset and run the same tests as __main__
-    :param output_prefixes: prefix dataset which will be tested
+    Render one graph. Is called in worker process, so Agg backend is used and no window is opened
+    :param graph: graph function
+    :param distribution: distribution for the graph
+    :param name: path to the output folder
+    :param dpi: resolution of output graph
+    :return: None
+    """
+    plt.switch_backend('Agg')
+    graph(distribution, name, dpi)
+
+
+def render_graphs(report: Dict, name: str, dpi: int = GRAPH_DPI) -> None:
+    """
+    Create graphs of all distributions in report. Every graph is rendered by separate worker process
+    :param report: report created by create_report
     :param name: path to the output folder which will be used for saving graphs
-    :param root_node: pointer to the root node
+    :param dpi: resolution of output graphs
     :return: None
     """
-    depth_distribution = {key: 0 for key in range(65)}
+    os.makedirs(f"statistics/{name}", exist_ok=True)
+    graphs = [(depth_distribution_graph, report['depth_distribution'], name, dpi),
+              (level_distribution, report['level_distribution'], name, dpi)]
 
-    # get_prefix_nodes_info(root_node)
+    if 'bit_1_distribution' in report:
+        graphs.append((bit_distribution, report['bit_1_distribution'], name, dpi))
 
-    for single_prefix in output_prefixes:
-        prefix_len = int(single_prefix.split('/')[1])
-        depth_distribution[prefix_len] += 1
+    workers = min(len(graphs), os.cpu_count() or 1)
 
-    depth_distribution_graph(depth_distribution, name)
+    if workers == 1:
+        for graph in graphs:
+            render_graph(*graph)
 
-    level_distribution_stats = AbstractTrie.level_stats(root_node)
-    level_distribution(level_distribution_stats, name)
+        return
+
+    with multiprocessing.get_context('fork').Pool(workers) as pool:
+        pool.starmap(render_graph, graphs)
 
 
-def compare_memory() -> None:
+def create_stats(depth_distribution: Dict[int, int], level_distribution_stats: Dict[int, int], name: str,
+                 prefixes: Optional[Iterable[Tuple[int, int]]] = None, report_format: Optional[str] = None,
+                 graph: bool = True, dpi: int = GRAPH_DPI) -> Dict:
     """
-    Create graphs for comparing used memory by generators.
-    Data used for creating graphs were got by memory_profiler library.
+    This method used for creating depth and level distribution graphs of dataset and run the same tests as __main__.
+    Distributions are maintained by binary trie, so output prefixes aren't parsed again
+    :param depth_distribution: number of prefix nodes by depth
+    :param level_distribution_stats: number of prefix nodes by level
+    :param name: path to the output folder which will be used for saving graphs and report
+    :param prefixes: iterable of (prefix value, prefix len) tuples of dataset for bit distribution
+    :param report_format: json or csv; report isn't saved if None
+    :param graph: create graphs of distributions
+    :param dpi: resolution of output graphs
+    :return: report created by create_report
+    """
+    report = create_report(depth_distribution, level_distribution_stats, prefixes)
+
+    if report_format:
+        save_report(report, name, report_format)
+
+    if graph:
+        render_graphs(report, name, dpi)
+
+    return report
+
+
+# names of generators in comparison graphs
+GENERATOR_NAMES = {'v6gene': 'V6Gene', 'ipv6gene': 'Vlastní implementace'}
+
+
+def plot_benchmark(results: List[Dict], value: str) -> None:
+    """
+    Plot measured value of successful benchmark cases by number of prefixes. Every generator and seed file is plotted
+    by separate line.
+    :param results: benchmark results created by experiments.benchmark
+    :param value: name of measured value in benchmark result
     :return: None
     """
-    number_of_prefixes = [68750, 150000, 250000, 450000]
-    memory_v6Gene = [0.215, 0.470, 0.808, 1.41]
-    memory_own = [0.490, 0.920, 1.55, 2.52]
+    lines = dict()
 
-    plt.plot(number_of_prefixes, memory_v6Gene, color='red', linewidth=1,
-             marker='x', markerfacecolor='blue', markersize=12, label='V6Gene')
+    for result in results:
+        if result.get('error') is None:
+            lines.setdefault((result['generator'], result['seed_file']), list()).append(
+                (result['prefix_quantity'], result[value]))
 
-    plt.plot(number_of_prefixes, memory_own, color='blue', linewidth=1,
-             marker='x', markerfacecolor='blue', markersize=12, label='Vlastní implementace')
+    for (generator, seed_file), points in sorted(lines.items()):
+        points.sort()
+        plt.plot([point[0] for point in points], [point[1] for point in points],
+                 color='red' if generator == 'v6gene' else 'blue', linewidth=1, marker='x', markerfacecolor='blue',
+                 markersize=12, label=f"{GENERATOR_NAMES[generator]} ({seed_file})")
 
-    plt.xlim(0, 500000)
-    plt.ylim(0, 3.5)
+    plt.xlim(left=0)
+    plt.ylim(bottom=0)
 
     plt.grid(linewidth=0.3)
 
     plt.xlabel('Počet adres')
 
-    plt.ylabel('Spotřebovaná paměť [Gb]')
+
+def compare_memory(results: List[Dict]) -> None:
+    """
+    Create graphs for comparing used memory by generators.
+    Data used for creating graphs are measured by experiments.benchmark.
+    :param results: benchmark results created by experiments.benchmark
+    :return: None
+    """
+    plt.figure()
+    plot_benchmark(results, 'peak_memory')
+
+    plt.ylabel('Spotřebovaná paměť [MB]')
     plt.legend()
     plt.savefig(f"statistics/memory_usage.png", format='png', dpi=850)
 
 
-def time_complexity() -> None:
+def time_complexity(results: List[Dict]) -> None:
     """
     Create graphs for comparing time complexity of generators.
+    Data used for creating graphs are measured by experiments.benchmark.
+    :param results: benchmark results created by experiments.benchmark
     :return: None
    """
-    number_of_prefixes = [68750, 150000, 250000, 450000]
-    v6gene_time = [5.20, 12.34, 21.11, 38.6]
-    own_time = [6.06, 16.34, 28.1,47.42]
+    plt.figure()
+    plot_benchmark(results, 'total_time')
 
-    plt.plot(number_of_prefixes, v6gene_time, color='red', linewidth=1,
-             marker='x', markerfacecolor='blue', markersize=12, label='V6Gene')
+    plt.ylabel('Spotřebovaný čas [s]')
 
-    plt.plot(number_of_prefixes, own_time, color='blue', linewidth=1,
-             marker='x', markerfacecolor='blue', markersize=12, label='Vlastní implementace')
+    plt.legend()
+    plt.savefig(f"statistics/time.png", format='png', dpi=850)
 
-    plt.xlim(0, 500000)
-    plt.ylim(0, 60)
 
-    plt.grid(linewidth=0.3)
+def parse_args() -> Dict:
+    """
+    Prepare argparse object for working with input arguments
+    :return: dictionary which has a following format -> input_argument_name: argument_value
+    """
+    parser = argparse.ArgumentParser(description="Depth, level and bit distributions of seed datasets")
 
-    plt.xlabel('Počet adres')
-    plt.ylabel('Spotřebovaný čas [s]')
+    parser.add_argument('--datasets', nargs='+', default=['dataset2007', 'dataset2019'], help="Names of datasets from "
+                                                                                              "formated_datasets folder")
 
-    plt.legend()
-    plt.savefig(f"statistics/time.png", format='png', dpi=850)
+    parser.add_argument('--report', choices=REPORT_FORMATS, help="Save distributions to statistics/<dataset>/report "
+                                                                 "file in JSON or CSV format")
+
+    parser.add_argument('--no_graph', action='store_true', required=False, help="Don't create graphs, just report")
+
+    parser.add_argument('--graph_dpi', type=int, default=GRAPH_DPI, help="Resolution of output graphs")
+
+    return vars(parser.parse_args())
 
 
 if __name__ == '__main__':
-    prefix_sets = ['dataset2007', 'dataset2019']
+    parsed_arguments = parse_args()
 
-    for current_set in prefix_sets:
+    for current_set in parsed_arguments['datasets']:
         path = f"formated_datasets/{current_set}"
 
         prefixes = InputArgumentsValidator.read_seed_file(path)
         print(f"Number of uniq prefixes which could be generated or used for generating process {len(prefixes)}")
 
         binary_trie = Trie()
-        depth_distribution_stats = {key: 0 for key in range(65)}
-
-        for prefix in prefixes:
-            depth_distribution_stats[len(prefix)] += 1
-            binary_trie.add_node(prefix)
-
-        depth_distribution_graph(depth_distribution_stats, current_set)
-
-        level_distribution_stats = AbstractTrie.level_stats(binary_trie.root_node)
-        level_distribution(level_distribution_stats, current_set)
+        binary_trie.bulk_load(prefixes)
 
+        create_stats(binary_trie.full_prefix_nodes, binary_trie.level_nodes, current_set, prefixes,
+                     parsed_arguments['report'], not parsed_arguments['no_graph'], parsed_arguments['graph_dpi'])
@@ -0,0 +1,80 @@
+# was developed by Utkin Kirill
+
+import collections
+import os
+import pytest
+
+from typing import Callable, Dict, List, Tuple
+from Common.Validator.Validator import InputArgumentsValidator
+from IPv6Gene.Generator.v6Generator import V6Generator as IPv6GeneGenerator
+from V6Gene.Generator.v6Generator import V6Generator as V6GeneGenerator
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_FILE = os.path.join(REPOSITORY_DIR, 'formated_datasets', 'dataset2007')
+DEPTH_DISTRIBUTION_FILE = os.path.join(REPOSITORY_DIR, 'distributions', 'depth_distribution', '2019_dataset.in')
+LEVEL_DISTRIBUTION_FILE = os.path.join(REPOSITORY_DIR, 'distributions', 'level_distribution',
+                                       'V6Gene_level_2019.in')
+
+# new prefixes of the bundled depth distribution are scaled down, so one generator runs in about one second
+DISTRIBUTION_SCALE = 8
+
+
+@pytest.fixture(scope='session')
+def repository_dir() -> str:
+    return REPOSITORY_DIR
+
+
+@pytest.fixture(scope='session')
+def seed_file() -> str:
+    return SEED_FILE
+
+
+@pytest.fixture(scope='session')
+def seed_prefixes() -> List[Tuple[int, int]]:
+    return InputArgumentsValidator.read_seed_file(SEED_FILE)
+
+
+@pytest.fixture
+def depth_distribution(seed_prefixes) -> Dict[int, int]:
+    """Depth distribution which contains all seed prefixes and scaled down number of new prefixes of the bundled
+    distribution.
+    """
+    seed_depths = collections.Counter(prefix_len for _, prefix_len in seed_prefixes)
+    full_distribution = InputArgumentsValidator.parse_depth_distribution_file(DEPTH_DISTRIBUTION_FILE)
+
+    return {depth: seed_depths[depth] + full_distribution[depth] // DISTRIBUTION_SCALE for depth in range(65)}
+
+
+@pytest.fixture
+def level_distribution() -> Dict[int, int]:
+    with open(LEVEL_DISTRIBUTION_FILE) as file:
+        lines = [line.strip().strip(',') for line in file if line.strip()]
+
+    return {int(level): int(prefixes_num) for level, prefixes_num in (line.split(':') for line in lines)}
+
+
+@pytest.fixture
+def create_ipv6gene(seed_prefixes, depth_distribution) -> Callable[..., IPv6GeneGenerator]:
+    """Return function which creates seeded IPv6Gene generator, keyword arguments replace default arguments."""
+    def create(**kwargs) -> IPv6GeneGenerator:
+        arguments = dict(prefix_quantity=sum(depth_distribution.values()), depth_distribution=dict(depth_distribution),
+                         max_level=5, input_prefixes=seed_prefixes, seed=1)
+        arguments.update(kwargs)
+
+        return IPv6GeneGenerator(**arguments)
+
+    return create
+
+
+@pytest.fixture
+def create_v6gene(seed_prefixes, depth_distribution, level_distribution) -> Callable[..., V6GeneGenerator]:
+    """Return function which creates seeded V6Gene generator, keyword arguments replace default arguments."""
+    def create(**kwargs) -> V6GeneGenerator:
+        arguments = dict(prefix_quantity=sum(depth_distribution.values()), rgr=0.1,
+                         depth_distribution=dict(depth_distribution), level_distribution=dict(level_distribution),
+                         input_prefixes=seed_prefixes, seed=1)
+        arguments.update(kwargs)
+
+        return V6GeneGenerator(**arguments)
+
+    return create
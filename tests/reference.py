@@ -0,0 +1,182 @@
+# was developed by Utkin Kirill
+
+"""Straightforward recomputation of trie properties from the set of prefixes and trie state, which are compared by
+tests. Check functions compare trie with the recomputed values."""
+
+import collections
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from Common.Abstract.AbstractTrie import AbstractTrie
+from Common.Trie.Compact.CompactNode import CompactNode
+
+
+def get_address_key(prefix: Tuple[int, int]) -> Tuple[int, int]:
+    value, prefix_len = prefix
+
+    return value << (64 - prefix_len), prefix_len
+
+
+def is_covered(prefix: Tuple[int, int], parent: Tuple[int, int]) -> bool:
+    return parent[1] < prefix[1] and prefix[0] >> (prefix[1] - parent[1]) == parent[0]
+
+
+def get_prefix_parents(prefixes: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Optional[Tuple[int, int]]]:
+    """Return the nearest covering prefix of every prefix, None if prefix isn't covered.
+
+    :param prefixes: (prefix value, prefix len) tuples
+    :return: dictionary in format {prefix: parent prefix}
+    """
+    parents = dict()
+    covering_prefixes = list()
+
+    for prefix in sorted(set(prefixes), key=get_address_key):
+        while covering_prefixes and not is_covered(prefix, covering_prefixes[-1]):
+            covering_prefixes.pop()
+
+        parents[prefix] = covering_prefixes[-1] if covering_prefixes else None
+        covering_prefixes.append(prefix)
+
+    return parents
+
+
+def get_levels(prefixes: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], int]:
+    """Return level of every prefix, which is the height of prefix in the tree of covering prefixes.
+
+    :param prefixes: (prefix value, prefix len) tuples
+    :return: dictionary in format {prefix: level}
+    """
+    parents = get_prefix_parents(prefixes)
+    levels = {prefix: 0 for prefix in parents}
+
+    for prefix in sorted(parents, key=lambda prefix: prefix[1], reverse=True):
+        parent = parents[prefix]
+
+        if parent is not None:
+            levels[parent] = max(levels[parent], levels[prefix] + 1)
+
+    return levels
+
+
+def get_level_histogram(prefixes: Iterable[Tuple[int, int]]) -> Dict[int, int]:
+    return dict(sorted(collections.Counter(get_levels(prefixes).values()).items()))
+
+
+def walk_nodes(root_node) -> List[tuple]:
+    """Return all nodes of trie in preorder.
+
+    :param root_node: root node of binary trie
+    :return: list of (node, (node value, node depth), position of parent node in the list) tuples
+    """
+    nodes = list()
+    node_stack = [(root_node, 0, -1)]
+
+    while node_stack:
+        node, value, parent_position = node_stack.pop()
+        nodes.append((node, (value, node.depth), parent_position))
+
+        for child in (node.right_child, node.left_child):
+            if child is not None:
+                node_stack.append((child, (value << (child.depth - node.depth)) | child.node_value, len(nodes) - 1))
+
+    return nodes
+
+
+def get_child_levels(nodes: List[tuple]) -> List[int]:
+    """Return maximum level of prefix nodes under every node, -1 for nodes without prefix nodes under them.
+
+    :param nodes: nodes returned by walk_nodes
+    :return: list of maximum levels in the same order as :param nodes
+    """
+    child_levels = [-1] * len(nodes)
+
+    for position in range(len(nodes) - 1, 0, -1):
+        node, _, parent_position = nodes[position]
+        node_level = node.level if node.prefix_flag else -1
+
+        child_levels[parent_position] = max(child_levels[parent_position], child_levels[position], node_level)
+
+    return child_levels
+
+
+def is_same_node(node, other_node) -> bool:
+    """Check if both objects represent the same trie node. Compact nodes are created for every access, so they are
+    compared by storage index.
+    """
+    if isinstance(node, CompactNode):
+        return node == other_node
+
+    return node is other_node
+
+
+def get_state(binary_trie: AbstractTrie) -> tuple:
+    """Return all nodes with their levels and all values maintained by the trie."""
+    nodes = [(prefix, node.level, node.max_child_level, node.prefix_flag)
+             for node, prefix, _ in walk_nodes(binary_trie.root_node)]
+    nodes_num = binary_trie.storage.nodes_num if binary_trie.storage else None
+
+    return (nodes, nodes_num, binary_trie.level_nodes, dict(binary_trie.full_prefix_nodes),
+            dict(binary_trie.prefix_leaf_nodes), binary_trie.trie_level, binary_trie.trie_depth)
+
+
+def check_levels(binary_trie: AbstractTrie) -> None:
+    """Compare levels and maximum child levels of all nodes with recomputed ones."""
+    nodes = walk_nodes(binary_trie.root_node)
+    prefixes = [prefix for node, prefix, _ in nodes[1:] if node.prefix_flag]
+    levels = get_levels(prefixes)
+
+    assert [node.level for node, prefix, _ in nodes[1:] if node.prefix_flag] == [levels[prefix] for prefix in prefixes]
+    assert [node.max_child_level for node, _, _ in nodes] == get_child_levels(nodes)
+    assert binary_trie.level_nodes == get_level_histogram(prefixes)
+    assert binary_trie.trie_level == max(levels.values())
+
+
+def check_prefix_parents(binary_trie: AbstractTrie) -> None:
+    """Compare prefix parent links and prefix paths of all prefix nodes with the nearest covering prefixes."""
+    nodes = walk_nodes(binary_trie.root_node)
+    prefixes = [prefix for node, prefix, _ in nodes[1:] if node.prefix_flag]
+    parents = get_prefix_parents(prefixes)
+
+    # position of the nearest prefix node above every node, root node isn't prefix parent
+    parent_positions = [None] * len(nodes)
+
+    for position in range(1, len(nodes)):
+        path_position = nodes[position][2]
+        path_node, _, path_parent_position = nodes[path_position]
+
+        if path_node.prefix_flag and path_parent_position >= 0:
+            parent_positions[position] = path_position
+        else:
+            parent_positions[position] = parent_positions[path_position]
+
+    for position, (node, prefix, _) in enumerate(nodes[1:], start=1):
+        if not node.prefix_flag:
+            continue
+
+        parent_position = parent_positions[position]
+
+        if parent_position is None:
+            assert parents[prefix] is None
+            assert node.prefix_parent is None
+            continue
+
+        parent_node, parent_prefix, _ = nodes[parent_position]
+
+        assert parent_prefix == parents[prefix]
+        assert is_same_node(node.prefix_parent, parent_node)
+        assert [path_node.depth for path_node in AbstractTrie.get_just_prefix_path(node)[1:]] == \
+               [path_node.depth for path_node in AbstractTrie.get_just_prefix_path(parent_node)]
+
+
+def check_histograms(binary_trie: AbstractTrie) -> None:
+    """Compare depth, level and leaf histograms maintained by the trie with the histograms of traversed nodes."""
+    nodes = walk_nodes(binary_trie.root_node)
+    prefixes = [prefix for node, prefix, _ in nodes[1:] if node.prefix_flag]
+    leaf_depths = collections.Counter(node.depth for node, _, _ in nodes
+                                      if node.left_child is None and node.right_child is None)
+
+    assert {depth: prefixes_num for depth, prefixes_num in binary_trie.full_prefix_nodes.items() if prefixes_num} == \
+           collections.Counter(prefix_len for _, prefix_len in prefixes)
+    assert {depth: leafs_num for depth, leafs_num in binary_trie.prefix_leaf_nodes.items() if leafs_num} == leaf_depths
+    assert {level: prefixes_num for level, prefixes_num in binary_trie.level_nodes.items() if prefixes_num} == \
+           get_level_histogram(prefixes)
+    assert binary_trie.trie_depth == max(prefix_len for _, prefix_len in prefixes)
@@ -0,0 +1,70 @@
+# was developed by Utkin Kirill
+
+import os
+import pytest
+
+from experiments import benchmark
+
+
+@pytest.fixture
+def distribution_file(tmp_path, depth_distribution) -> str:
+    distribution_file = os.path.join(str(tmp_path), 'depth_distribution.in')
+
+    with open(distribution_file, 'w') as file:
+        file.write(',\n'.join(f'{depth}:{prefixes_num}' for depth, prefixes_num in depth_distribution.items()))
+
+    return distribution_file
+
+
+def create_case(seed_file, distribution_file, **kwargs) -> dict:
+    case = dict(generator='ipv6gene', seed_file=seed_file, distribution=distribution_file, seed=1, compact_trie=False,
+                bulk=False)
+    case.update(kwargs)
+
+    return case
+
+
+@pytest.mark.parametrize('generator, bulk, measured_phases', [
+    ('ipv6gene', False, {'parse', 'construct', 'random', 'traversal', 'convert', 'output'}),
+    ('ipv6gene', True, {'parse', 'construct', 'bulk', 'convert', 'output'}),
+    ('v6gene', False, {'parse', 'construct', 'random', 'traversal', 'convert', 'output'}),
+])
+def test_case_is_measured(seed_file, distribution_file, depth_distribution, generator, bulk, measured_phases):
+    result = benchmark.run_case(create_case(seed_file, distribution_file, generator=generator, bulk=bulk))
+
+    assert result['error'] is None
+    assert result['generated'] == result['prefix_quantity'] == sum(depth_distribution.values())
+    assert set(result['phases']) == set(benchmark.PHASES)
+    assert {phase for phase, wall_time in result['phases'].items() if wall_time > 0} == measured_phases
+    assert result['total_time'] == pytest.approx(sum(result['phases'].values()))
+    assert result['peak_memory'] > 0
+    assert result['metrics']['phases']['construct']['wall_time'] == result['phases']['construct']
+
+
+def test_error_of_case_is_saved(seed_file, distribution_file, depth_distribution):
+    # IPv6Gene can't generate new prefixes shorter than 12 bits
+    with open(distribution_file, 'w') as file:
+        file.write(',\n'.join(f'{depth}:{prefixes_num + 5 if depth == 1 else prefixes_num}'
+                              for depth, prefixes_num in depth_distribution.items()))
+
+    result = benchmark.run_case(create_case(seed_file, distribution_file))
+
+    assert 'less than 12' in result['error']
+    assert result['generated'] == 0
+    assert result['total_time'] == pytest.approx(sum(result['phases'].values()))
+
+
+def test_cases_are_created_for_all_combinations(repository_dir):
+    seed_files = [os.path.join(repository_dir, 'formated_datasets', name) for name in ('dataset2007', 'dataset2015')]
+    distributions = [os.path.join(repository_dir, 'distributions', 'depth_distribution', '2019_dataset.in')]
+    parsed_arguments = dict(generators=list(benchmark.GENERATORS), seed_files=seed_files, distributions=distributions,
+                            seed=3, compact_trie=True, bulk=False)
+
+    cases = benchmark.get_cases(parsed_arguments)
+
+    assert [(case['generator'], case['seed_file']) for case in cases] == [
+        (generator, os.path.join('formated_datasets', name))
+        for generator in benchmark.GENERATORS for name in ('dataset2007', 'dataset2015')]
+    assert {case['distribution'] for case in cases} == {os.path.join('distributions', 'depth_distribution',
+                                                                     '2019_dataset.in')}
+    assert all(case['seed'] == 3 and case['compact_trie'] and not case['bulk'] for case in cases)
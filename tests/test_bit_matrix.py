@@ -0,0 +1,93 @@
+# was developed by Utkin Kirill
+
+import numpy as np
+import pytest
+
+from typing import List, Tuple
+from Common.Abstract.AbstractHelper import AbstractHelper
+from Common.BitMatrix.BitMatrix import BitMatrix
+
+
+def get_bit_strings(prefixes: List[Tuple[int, int]]) -> List[str]:
+    return [format(value, f'0{prefix_len}b') if prefix_len else '' for value, prefix_len in prefixes]
+
+
+def count_bit_positions(bit_value: str, prefixes: List[Tuple[int, int]]) -> List[float]:
+    """Count bit value on every position of prefix bit strings, the same way as bit distribution was counted before
+    BitMatrix.
+    """
+    counts = [0] * BitMatrix.POSITIONS
+
+    for bit_string in get_bit_strings(prefixes):
+        for position, char in enumerate(bit_string):
+            if char == bit_value:
+                counts[position] += 1
+
+    return [count / len(prefixes) * 100 for count in counts]
+
+
+@pytest.fixture
+def generated_prefixes(create_ipv6gene) -> List[Tuple[int, int]]:
+    generator = create_ipv6gene()
+    generator.start_generating()
+
+    return list(generator.iterate_prefixes())
+
+
+@pytest.mark.parametrize('bit_value', ['0', '1'])
+def test_position_frequency_is_same_as_string_count(seed_prefixes, generated_prefixes, bit_value):
+    for prefixes in (seed_prefixes, generated_prefixes):
+        expected_frequency = count_bit_positions(bit_value, prefixes)
+
+        assert BitMatrix.create(prefixes).get_position_frequency(int(bit_value)).tolist() == \
+            pytest.approx(expected_frequency)
+        assert list(AbstractHelper.get_bit_position(bit_value, prefixes).values()) == pytest.approx(expected_frequency)
+
+
+def test_depth_frequency_is_same_as_string_count(generated_prefixes):
+    bit_matrix = BitMatrix.create(generated_prefixes)
+    expected_frequency = np.zeros((BitMatrix.DEPTHS, BitMatrix.POSITIONS))
+
+    for depth in range(BitMatrix.DEPTHS):
+        depth_prefixes = [prefix for prefix in generated_prefixes if prefix[1] == depth]
+
+        if depth_prefixes:
+            expected_frequency[depth] = np.array(count_bit_positions('1', depth_prefixes)) / 100
+
+    assert bit_matrix.get_depth_frequency() == pytest.approx(expected_frequency)
+
+
+def test_bits_are_counted_by_chunks(monkeypatch, generated_prefixes):
+    bit_matrix = BitMatrix.create(generated_prefixes)
+    monkeypatch.setattr(BitMatrix, 'CHUNK_SIZE', 1000)
+    chunked_matrix = BitMatrix.create(generated_prefixes)
+
+    assert np.array_equal(chunked_matrix.ones_by_depth, bit_matrix.ones_by_depth)
+    assert np.array_equal(chunked_matrix.prefixes_by_depth, bit_matrix.prefixes_by_depth)
+
+
+def test_prefixes_are_packed():
+    prefixes = [(0, 0), (0b1, 1), (0b0110, 4), ((1 << 64) - 1, 64)]
+    bit_matrix = BitMatrix.from_arrays(np.array([value for value, _ in prefixes], dtype=np.uint64),
+                                       np.array([prefix_len for _, prefix_len in prefixes]))
+
+    unpacked_bits = np.unpackbits(bit_matrix.bits, axis=1)
+
+    assert [''.join(map(str, row[:prefix_len])) for row, (_, prefix_len) in zip(unpacked_bits, prefixes)] == \
+        get_bit_strings(prefixes)
+    # bits after prefix len are zero
+    assert all(not row[prefix_len:].any() for row, (_, prefix_len) in zip(unpacked_bits, prefixes))
+    assert bit_matrix.prefixes_by_depth.tolist() == [int(depth in (0, 1, 4, 64)) for depth in range(BitMatrix.DEPTHS)]
+
+
+def test_empty_prefix_set():
+    bit_matrix = BitMatrix.create([])
+
+    assert len(bit_matrix) == 0
+    assert not bit_matrix.get_position_frequency(1).any()
+    assert not bit_matrix.get_position_frequency(0).any()
+
+
+def test_long_prefix_is_rejected():
+    with pytest.raises(ValueError):
+        BitMatrix.create([(1, 65)])
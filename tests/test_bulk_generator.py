@@ -0,0 +1,60 @@
+# was developed by Utkin Kirill
+
+import pytest
+
+from Common.Converter.Converter import Converter
+from Common.Exceptions.Exceptions import CannotGenerateDueMaximumLevel
+from IPv6Gene.Generator.v6Generator import V6Generator as IPv6GeneGenerator
+from tests import reference
+
+
+@pytest.mark.parametrize('max_level', [3, 5])
+def test_bulk_output_follows_plan(create_ipv6gene, seed_prefixes, depth_distribution, max_level):
+    generator = create_ipv6gene(bulk=True, max_level=max_level)
+    converted_prefixes = generator.start_generating()
+    prefixes = list(generator.iterate_prefixes())
+
+    assert generator.get_depth_distribution() == depth_distribution
+    assert len(set(prefixes)) == len(prefixes) == sum(depth_distribution.values())
+    assert set(seed_prefixes) <= set(prefixes)
+
+    # levels are recomputed from the set of generated prefixes
+    levels = reference.get_level_histogram(prefixes)
+
+    assert generator.get_level_distribution() == levels
+    assert max(levels) <= max_level
+    assert generator.get_binary_trie_level() == max(levels)
+
+    assert Converter(prefixes).convert_prefixes() == converted_prefixes
+
+
+def test_bulk_trie_is_consistent(create_ipv6gene):
+    generator = create_ipv6gene(bulk=True)
+    generator.start_generating()
+
+    reference.check_levels(generator._binary_trie)
+    reference.check_prefix_parents(generator._binary_trie)
+
+
+def test_bulk_output_is_seeded(create_ipv6gene):
+    converted_prefixes = create_ipv6gene(bulk=True).start_generating()
+
+    assert create_ipv6gene(bulk=True).start_generating() == converted_prefixes
+    assert list(create_ipv6gene(bulk=True).stream_generating()) == converted_prefixes
+    assert create_ipv6gene(bulk=True, seed=2).start_generating() != converted_prefixes
+
+
+def test_bulk_generating_reports_maximum_level():
+    # every prefix with len 12 under IANA part 001/3 covers one seed prefix, so new prefix with len 12 would raise
+    # level of covered seed prefix
+    seed_prefixes = [((0b001 << 9 | block) << 20, 32) for block in range(512)]
+    depth_distribution = {depth: 0 for depth in range(65)}
+    depth_distribution[12] = 1
+    depth_distribution[32] = len(seed_prefixes)
+
+    generator = IPv6GeneGenerator(prefix_quantity=sum(depth_distribution.values()),
+                                  depth_distribution=depth_distribution, max_level=0, input_prefixes=seed_prefixes,
+                                  seed=1, bulk=True)
+
+    with pytest.raises(CannotGenerateDueMaximumLevel):
+        generator.start_generating()
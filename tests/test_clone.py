@@ -0,0 +1,70 @@
+# was developed by Utkin Kirill
+
+import pytest
+
+from IPv6Gene.Generator.Helper import Helper as IPv6GeneHelper
+from IPv6Gene.Trie.Trie import Trie as IPv6GeneTrie
+from V6Gene.Trie.Trie import Trie as V6GeneTrie
+from tests import reference
+
+TRIE_VARIANTS = [
+    dict(),
+    dict(compact=True),
+    dict(path_compression=True),
+]
+
+
+def get_generator_arguments(trie_variant) -> dict:
+    return dict(compact_trie=trie_variant.get('compact', False),
+                path_compression=trie_variant.get('path_compression', False))
+
+
+def get_organisation_nodes(binary_trie) -> dict:
+    return {org_level: [node.depth for node in nodes] for org_level, nodes in binary_trie.nodes.items()}
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_ipv6gene_generates_from_clone(seed_prefixes, create_ipv6gene, trie_variant):
+    seed_trie = IPv6GeneTrie(Help=IPv6GeneHelper(), **trie_variant)
+    seed_trie.bulk_load(seed_prefixes)
+
+    state = reference.get_state(seed_trie)
+    organisation_nodes = get_organisation_nodes(seed_trie)
+    prefixes = create_ipv6gene(**get_generator_arguments(trie_variant)).start_generating()
+
+    # every generator uses own clone, so seed trie could be used again
+    assert create_ipv6gene(seed_trie=seed_trie).start_generating() == prefixes
+    assert create_ipv6gene(seed_trie=seed_trie).start_generating() == prefixes
+
+    assert reference.get_state(seed_trie) == state
+    assert get_organisation_nodes(seed_trie) == organisation_nodes
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_v6gene_generates_from_clone(seed_prefixes, create_v6gene, trie_variant):
+    seed_trie = V6GeneTrie(**trie_variant)
+    seed_trie.bulk_load(seed_prefixes)
+
+    state = reference.get_state(seed_trie)
+    prefixes = create_v6gene(**get_generator_arguments(trie_variant)).start_generating()
+
+    assert create_v6gene(seed_trie=seed_trie).start_generating() == prefixes
+    assert create_v6gene(seed_trie=seed_trie).start_generating() == prefixes
+
+    assert reference.get_state(seed_trie) == state
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_clone_is_independent(seed_prefixes, trie_variant):
+    seed_trie = IPv6GeneTrie(Help=IPv6GeneHelper(), max_possible_level=64, **trie_variant)
+    seed_trie.bulk_load(seed_prefixes[:100])
+    state = reference.get_state(seed_trie)
+
+    binary_trie = seed_trie.clone()
+    binary_trie.bulk_load(seed_prefixes[100:])
+
+    full_trie = IPv6GeneTrie(Help=IPv6GeneHelper(), max_possible_level=64, **trie_variant)
+    full_trie.bulk_load(seed_prefixes)
+
+    assert reference.get_state(seed_trie) == state
+    assert reference.get_state(binary_trie) == reference.get_state(full_trie)
@@ -0,0 +1,62 @@
+# was developed by Utkin Kirill
+
+from Common.Trie.Compact.NodeStorage import NodeStorage
+from IPv6Gene.Generator.Helper import Helper
+from IPv6Gene.Trie.Trie import Trie
+
+
+def walk_nodes(root_node):
+    """Iterate over (node value, depth, level, maximum child level, prefix flag) of all nodes in preorder."""
+    node_stack = [root_node]
+
+    while node_stack:
+        node = node_stack.pop()
+
+        if node is None:
+            continue
+
+        yield node.node_value, node.depth, node.level, node.max_child_level, node.prefix_flag
+
+        node_stack.append(node.right_child)
+        node_stack.append(node.left_child)
+
+
+def test_compact_trie_contains_same_nodes(seed_prefixes):
+    binary_trie = Trie(Help=Helper(), max_possible_level=64)
+    compact_trie = Trie(Help=Helper(), max_possible_level=64, compact=True)
+
+    for prefix in sorted(seed_prefixes, key=lambda prefix: prefix[1]):
+        binary_trie.add_node(*prefix)
+        compact_trie.add_node(*prefix)
+
+    assert list(walk_nodes(compact_trie.root_node)) == list(walk_nodes(binary_trie.root_node))
+    assert compact_trie.level_nodes == binary_trie.level_nodes
+    assert compact_trie.prefix_leaf_nodes == binary_trie.prefix_leaf_nodes
+
+
+def test_released_node_is_reused():
+    storage = NodeStorage()
+    index = storage.allocate(1, 1, 0)
+    nodes_num = storage.nodes_num
+
+    storage.release(index)
+
+    assert storage.allocate(0, 1, 0) == index
+    assert storage.nodes_num == nodes_num
+    assert storage.node(index).node_value == 0
+
+
+def test_ipv6gene_compact_trie_generates_same_prefixes(create_ipv6gene):
+    generator = create_ipv6gene()
+    compact_generator = create_ipv6gene(compact_trie=True)
+
+    assert compact_generator.start_generating() == generator.start_generating()
+    assert compact_generator.get_level_distribution() == generator.get_level_distribution()
+
+
+def test_v6gene_compact_trie_generates_same_prefixes(create_v6gene):
+    generator = create_v6gene()
+    compact_generator = create_v6gene(compact_trie=True)
+
+    assert compact_generator.start_generating() == generator.start_generating()
+    assert compact_generator.get_level_distribution() == generator.get_level_distribution()
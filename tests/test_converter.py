@@ -0,0 +1,85 @@
+# was developed by Utkin Kirill
+
+import io
+import ipaddress
+import numpy as np
+import pytest
+import random
+
+from typing import List, Tuple
+from Common.Converter.Converter import Converter
+
+
+def to_network(prefix) -> ipaddress.IPv6Network:
+    value, prefix_len = prefix
+
+    return ipaddress.IPv6Network((value << (ipaddress.IPV6LENGTH - prefix_len), prefix_len))
+
+
+@pytest.fixture
+def seed_networks(seed_file) -> List[ipaddress.IPv6Network]:
+    """Seed prefixes parsed by ipaddress in the same order as seed file parser returns them."""
+    with open(seed_file) as file:
+        networks = {ipaddress.IPv6Network(line.strip()) for line in file if line.strip()}
+
+    return sorted(networks, key=lambda network: (network.prefixlen, int(network.network_address)))
+
+
+def test_seed_prefixes_are_parsed_to_integers(seed_prefixes, seed_networks):
+    assert [to_network(prefix) for prefix in seed_prefixes] == seed_networks
+
+
+def test_converted_prefixes_are_same_as_seed(seed_prefixes, seed_networks):
+    assert Converter(seed_prefixes).convert_prefixes() == [str(network) for network in seed_networks]
+
+
+def test_prefixes_are_written_by_chunks(seed_prefixes):
+    converted_prefixes = Converter(seed_prefixes).convert_prefixes()
+    file = io.StringIO()
+
+    assert Converter.write_prefixes(iter(converted_prefixes), file, buffer_size=100) == len(converted_prefixes)
+    assert file.getvalue() == ''.join(prefix + '\n' for prefix in converted_prefixes)
+
+
+def test_prefixes_are_converted_by_chunks(seed_prefixes, monkeypatch):
+    converted_prefixes = Converter(seed_prefixes).convert_prefixes()
+    monkeypatch.setattr(Converter, 'WRITE_BUFFER_SIZE', 100)
+
+    assert list(Converter(iter(seed_prefixes)).iterate_converted_prefixes()) == converted_prefixes
+
+
+def get_address_prefixes(prefixes_num: int) -> List[Tuple[int, int]]:
+    """Return full 128 bits prefixes whose hextets are often zero, so all kinds of zero runs are converted."""
+    rng = random.Random(1)
+    prefixes = [(0, 128), ((1 << 128) - 1, 128), (1, 128), (1 << 112, 128), (0x10001 << 32, 128)]
+
+    for _ in range(prefixes_num):
+        hextets = [rng.choice((0, 0, 1, 0xFFFF, rng.getrandbits(16))) for _ in range(8)]
+        prefixes.append((int(''.join('%04x' % hextet for hextet in hextets), 16), rng.randint(0, 128)))
+
+    return prefixes
+
+
+def test_addresses_are_formatted_same_as_ipaddress():
+    prefixes = get_address_prefixes(20000)
+    high_bits = np.array([value >> 64 for value, _ in prefixes], dtype=np.uint64)
+    low_bits = np.array([value & 0xFFFFFFFFFFFFFFFF for value, _ in prefixes], dtype=np.uint64)
+    prefix_lens = np.array([prefix_len for _, prefix_len in prefixes], dtype=np.uint8)
+
+    assert Converter.format_addresses(high_bits, low_bits, prefix_lens) == \
+        [f'{ipaddress.IPv6Address(value)}/{prefix_len}' for value, prefix_len in prefixes]
+
+
+def test_prefix_arrays_are_split_same_as_prefixes():
+    rng = random.Random(1)
+    prefix_lens = [0, 64] + [rng.randint(0, 64) for _ in range(1000)]
+    prefixes = [(rng.getrandbits(prefix_len) if prefix_len else 0, prefix_len) for prefix_len in prefix_lens]
+
+    values = np.array([value for value, _ in prefixes], dtype=np.uint64)
+    split_arrays = Converter.split_prefix_arrays(values, np.array(prefix_lens))
+
+    for array, expected_array in zip(split_arrays, Converter.split_prefixes(prefixes)):
+        assert array.tolist() == expected_array.tolist()
+
+    assert list(Converter.iterate_converted_arrays(values, np.array(prefix_lens), chunk_size=100)) == \
+        Converter(prefixes).convert_prefixes()
@@ -0,0 +1,232 @@
+# was developed by Utkin Kirill
+
+import asyncio
+import attr
+import concurrent.futures
+import io
+import json
+import os
+import pytest
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from typing import Iterator
+from Common.Converter.Converter import Converter
+from Common.Service.GenerationService import GenerationService
+
+
+@pytest.fixture
+def service_socket(tmp_path, repository_dir, seed_file):
+    """Start generation service in own process and return path to its socket."""
+    socket_path = str(tmp_path / 'service.sock')
+    service = subprocess.Popen([sys.executable, os.path.join(repository_dir, 'generation_service.py'),
+                                '--socket', socket_path, '--workers', '2', '--input', seed_file], cwd=repository_dir)
+
+    try:
+        # seed tries are constructed before the socket is created
+        for _ in range(300):
+            if os.path.exists(socket_path) or service.poll() is not None:
+                break
+
+            time.sleep(0.1)
+
+        assert os.path.exists(socket_path)
+
+        yield socket_path
+
+    finally:
+        service.terminate()
+        service.wait()
+
+
+@pytest.fixture
+def ipv6gene_job(seed_file, depth_distribution) -> dict:
+    # keys of JSON objects are strings
+    return {'generator': 'ipv6gene', 'input': seed_file, 'prefix_quantity': sum(depth_distribution.values()),
+            'depth_distribution': {str(depth): prefixes_num for depth, prefixes_num in depth_distribution.items()},
+            'max_level': 5, 'seed': 1}
+
+
+def test_status_line():
+    assert json.loads(GenerationService.get_status_line()) == {'status': 'ok'}
+    assert json.loads(GenerationService.get_status_line(ValueError('Wrong job'))) == \
+        {'status': 'error', 'message': 'Wrong job'}
+    assert json.loads(GenerationService.get_status_line(KeyError('rgr'))) == \
+        {'status': 'error', 'message': "Job parameter 'rgr' is required"}
+    assert json.loads(GenerationService.get_status_line(OSError())) == {'status': 'error', 'message': 'OSError'}
+    assert GenerationService.get_status_line().endswith(b'\n')
+
+
+def test_distribution_keys_are_converted():
+    assert GenerationService.get_distribution({'0': 5, '2': '3'}, 4) == {0: 5, 1: 0, 2: 3, 3: 0}
+
+
+def read_response(response: str) -> list:
+    return list(GenerationService.read_response(io.StringIO(response)))
+
+
+def test_response_is_read_until_end_line():
+    ok_line = GenerationService.get_status_line().decode()
+    end_line = GenerationService.get_end_line(2).decode()
+    error_line = GenerationService.get_status_line(ValueError('Broken job')).decode()
+
+    assert read_response(ok_line + '2001:db8::/32\n2001:db9::/32\n' + end_line) == ['2001:db8::/32', '2001:db9::/32']
+
+    with pytest.raises(ValueError, match='Broken job'):
+        read_response(ok_line + '2001:db8::/32\n' + error_line)
+
+    with pytest.raises(ValueError, match='before the job was finished'):
+        read_response(ok_line + '2001:db8::/32\n')
+
+    with pytest.raises(ValueError, match='Job generated 2 prefixes, 1 were received'):
+        read_response(ok_line + '2001:db8::/32\n' + end_line)
+
+    with pytest.raises(ValueError, match='Connection closed'):
+        read_response('')
+
+
+@attr.s
+class FailingGenerator:
+    prefixes = attr.ib(type=list)
+
+    def stream_generating(self) -> Iterator[str]:
+        yield from self.prefixes
+        raise RuntimeError('Broken job')
+
+
+def test_job_error_after_status_line_is_sent(monkeypatch):
+    prefixes = ['2001:db8::/32'] * (Converter.WRITE_BUFFER_SIZE + 1)
+    monkeypatch.setattr(GenerationService, 'create_generator', lambda job, seed_trie: FailingGenerator(prefixes))
+    read_fd, write_fd = os.pipe()
+
+    # pipe is read by other thread, so job isn't blocked by full pipe
+    with os.fdopen(read_fd) as response, concurrent.futures.ThreadPoolExecutor(1) as executor:
+        response_lines = executor.submit(response.readlines)
+        GenerationService.generate(dict(), None, write_fd)
+        response_lines = response_lines.result()
+
+    # just whole chunks of prefixes are written before the error
+    assert len(response_lines) == Converter.WRITE_BUFFER_SIZE + 2
+
+    with pytest.raises(ValueError, match='Broken job'):
+        read_response(''.join(response_lines))
+
+
+@attr.s
+class ResponseWriter:
+    response = attr.ib(default=b'', type=bytes)
+
+    def write(self, data: bytes) -> None:
+        self.response += data
+
+    async def drain(self) -> None:
+        pass
+
+
+def kill_job(job, seed_trie, write_fd) -> None:
+    os.write(write_fd, GenerationService.get_status_line() + b'2001:db8::/32\n2001:')
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def test_killed_job_is_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr(GenerationService, 'generate', staticmethod(kill_job))
+    service = GenerationService(socket_path=str(tmp_path / 'service.sock'))
+    writer = ResponseWriter()
+
+    asyncio.new_event_loop().run_until_complete(service.run_job({'generator': 'ipv6gene'}, None, writer))
+
+    with pytest.raises(ValueError, match=f'killed by signal {signal.SIGKILL}'):
+        read_response(writer.response.decode())
+
+
+def test_job_process_is_forked_after_constructions(tmp_path, monkeypatch, seed_file):
+    constructed = threading.Event()
+
+    def construct_seed_trie(generator, seed_file):
+        time.sleep(0.5)
+        constructed.set()
+
+    def generate(job, seed_trie, write_fd):
+        os.write(write_fd, b'constructed' if constructed.is_set() else b'constructing')
+
+    monkeypatch.setattr(GenerationService, 'construct_seed_trie', staticmethod(construct_seed_trie))
+    monkeypatch.setattr(GenerationService, 'generate', staticmethod(generate))
+    service = GenerationService(socket_path=str(tmp_path / 'service.sock'))
+    writer = ResponseWriter()
+
+    async def run() -> None:
+        construction = asyncio.ensure_future(service.get_seed_trie('ipv6gene', seed_file))
+        # construction is started before the job
+        await asyncio.sleep(0.1)
+        await service.run_job({'generator': 'ipv6gene'}, None, writer)
+        await construction
+
+    asyncio.new_event_loop().run_until_complete(run())
+
+    assert writer.response == b'constructed'
+
+
+def test_job_generator_uses_warm_seed_trie(seed_file, ipv6gene_job, create_ipv6gene):
+    seed_trie = GenerationService.construct_seed_trie('ipv6gene', seed_file)
+
+    assert list(GenerationService.create_generator(ipv6gene_job, seed_trie).stream_generating()) == \
+        create_ipv6gene().start_generating()
+
+
+def test_seed_trie_of_modified_file_is_replaced(tmp_path, seed_file):
+    seed_path = str(tmp_path / 'seed')
+
+    with open(seed_file) as file:
+        seed_lines = file.readlines()
+
+    with open(seed_path, 'w') as file:
+        file.writelines(seed_lines[:100])
+
+    service = GenerationService(socket_path=str(tmp_path / 'service.sock'))
+    first_time = os.stat(seed_path).st_mtime_ns
+    second_time = first_time + 10 ** 9
+    loop = asyncio.new_event_loop()
+
+    try:
+        first_trie = loop.run_until_complete(service.get_seed_trie('ipv6gene', seed_path))
+        loop.run_until_complete(service.get_seed_trie('v6gene', seed_path))
+
+        assert loop.run_until_complete(service.get_seed_trie('ipv6gene', seed_path)) is first_trie
+
+        with open(seed_path, 'w') as file:
+            file.writelines(seed_lines[:200])
+
+        os.utime(seed_path, ns=(second_time, second_time))
+        second_trie = loop.run_until_complete(service.get_seed_trie('ipv6gene', seed_path))
+
+    finally:
+        loop.close()
+
+    assert second_trie is not first_trie
+    assert sum(second_trie.full_prefix_nodes.values()) == 200
+    # just the trie of current file version is kept for every generator
+    assert sorted((generator, seed_time) for generator, _, seed_time in service._seed_tries) == \
+        [('ipv6gene', second_time), ('v6gene', first_time)]
+
+
+def test_service_generates_jobs(service_socket, ipv6gene_job, level_distribution, create_ipv6gene, create_v6gene):
+    prefixes = create_ipv6gene().start_generating()
+
+    # warm seed trie isn't changed by jobs
+    assert list(GenerationService.request(service_socket, ipv6gene_job)) == prefixes
+    assert list(GenerationService.request(service_socket, ipv6gene_job)) == prefixes
+
+    job_level_distribution = {str(level): prefixes_num for level, prefixes_num in level_distribution.items()}
+    v6gene_job = dict(ipv6gene_job, generator='v6gene', rgr=0.1, level_distribution=job_level_distribution)
+
+    assert list(GenerationService.request(service_socket, v6gene_job)) == create_v6gene().start_generating()
+
+    with pytest.raises(ValueError, match='Unknown generator'):
+        list(GenerationService.request(service_socket, dict(ipv6gene_job, generator='v7gene')))
+
+    with pytest.raises(ValueError, match="Job parameter 'max_level' is required"):
+        list(GenerationService.request(service_socket, {key: value for key, value in ipv6gene_job.items()
+                                                        if key != 'max_level'}))
@@ -0,0 +1,114 @@
+# was developed by Utkin Kirill
+
+import os
+import pytest
+import subprocess
+import sys
+
+from typing import Dict, List, Tuple
+from Common.Exceptions.Exceptions import CannotGenerateDueMaximumLevel
+from IPv6Gene.Generator.v6Generator import V6Generator as IPv6GeneGenerator
+from V6Gene.Generator.v6Generator import V6Generator as V6GeneGenerator
+
+
+def test_ipv6gene_stream_is_same_as_list(create_ipv6gene):
+    assert list(create_ipv6gene().stream_generating()) == create_ipv6gene().start_generating()
+
+
+def test_v6gene_stream_is_same_as_list(create_v6gene):
+    assert list(create_v6gene().stream_generating()) == create_v6gene().start_generating()
+
+
+def test_stream_output_is_same_as_printed_output(tmp_path, repository_dir, seed_file, depth_distribution):
+    depth_distribution_path = str(tmp_path / 'depth_distribution.in')
+    output_path = str(tmp_path / 'output.txt')
+
+    with open(depth_distribution_path, 'w') as file:
+        file.write(',\n'.join(f'{depth}:{prefixes_num}' for depth, prefixes_num in depth_distribution.items()))
+
+    # output file is opened for appending, so it has to exist
+    open(output_path, 'w').close()
+
+    arguments = [sys.executable, os.path.join(repository_dir, 'IPv6Gene.py'), '--input', seed_file,
+                 '--prefix_quantity', str(sum(depth_distribution.values())), '--max_level', '5',
+                 '--depth_distribution_path', depth_distribution_path, '--seed', '1']
+
+    printed_output = subprocess.run(arguments, cwd=repository_dir, stdout=subprocess.PIPE, check=True).stdout
+    subprocess.run(arguments + ['--stream', '--output', output_path], cwd=repository_dir, check=True)
+
+    with open(output_path) as file:
+        assert file.read() == printed_output.decode()
+
+
+@pytest.fixture
+def covering_seed_prefixes() -> List[Tuple[int, int]]:
+    # every prefix with len 12 under IANA part 001/3 covers one seed prefix
+    return [((0b001 << 9 | block) << 20, 32) for block in range(512)]
+
+
+def create_random_generator(seed_prefixes, new_prefixes_num: int, max_level: int) -> IPv6GeneGenerator:
+    depth_distribution = {depth: 0 for depth in range(65)}
+    depth_distribution[12] = new_prefixes_num
+    depth_distribution[32] = len(seed_prefixes)
+
+    return IPv6GeneGenerator(prefix_quantity=sum(depth_distribution.values()), depth_distribution=depth_distribution,
+                             max_level=max_level, input_prefixes=seed_prefixes, seed=1)
+
+
+def test_random_phase_reports_full_space(covering_seed_prefixes):
+    with pytest.raises(CannotGenerateDueMaximumLevel, match='all prefixes with this length already exist'):
+        create_random_generator(covering_seed_prefixes, 513, 5).start_generating()
+
+
+def test_random_phase_reports_maximum_level(covering_seed_prefixes):
+    with pytest.raises(CannotGenerateDueMaximumLevel, match='level always is great than maximum possible level'):
+        create_random_generator(covering_seed_prefixes, 1, 0).start_generating()
+
+
+def test_random_phase_generates_free_prefixes(covering_seed_prefixes):
+    generator = create_random_generator(covering_seed_prefixes, 512, 1)
+    generator.start_generating()
+
+    assert generator.get_depth_distribution()[12] == 512
+    assert generator.get_level_distribution() == {0: 512, 1: 512}
+
+
+def create_v6gene_random_generator(seed_prefixes, new_prefixes: Dict[int, int],
+                                   level_distribution: Dict[int, int]) -> V6GeneGenerator:
+    # V6Gene generates prefixes randomly just when some prefixes are planned under leaf prefixes with len 32 - 48, so
+    # one leaf prefix with len 40 outside of IANA part 001/3 is added
+    seed_prefixes = seed_prefixes + [(0b010 << 37, 40)]
+    depth_distribution = {depth: 0 for depth in range(65)}
+
+    for _, prefix_len in seed_prefixes:
+        depth_distribution[prefix_len] += 1
+
+    for prefix_len, prefixes_num in new_prefixes.items():
+        depth_distribution[prefix_len] += prefixes_num
+
+    return V6GeneGenerator(prefix_quantity=sum(depth_distribution.values()), rgr=1.0,
+                           depth_distribution=depth_distribution, level_distribution=level_distribution,
+                           input_prefixes=seed_prefixes, seed=1)
+
+
+def test_v6gene_random_phase_reports_full_space(covering_seed_prefixes):
+    generator = create_v6gene_random_generator(covering_seed_prefixes, {12: 513, 48: 600}, {0: 1200, 1: 513})
+
+    with pytest.raises(CannotGenerateDueMaximumLevel, match='all prefixes with this length already exist'):
+        generator.start_generating()
+
+
+def test_v6gene_random_phase_reports_maximum_level():
+    # every new prefix under the seed prefix 001/3 would raise its level above maximum level 0
+    generator = create_v6gene_random_generator([(0b001, 3)], {48: 5}, {0: 7})
+
+    with pytest.raises(CannotGenerateDueMaximumLevel, match='level always is great than maximum possible level'):
+        generator.start_generating()
+
+
+def test_v6gene_random_phase_generates_free_prefixes(covering_seed_prefixes):
+    generator = create_v6gene_random_generator(covering_seed_prefixes, {12: 512, 48: 600}, {0: 1200, 1: 512})
+    generator.start_generating()
+
+    assert generator.get_depth_distribution()[12] == 512
+    assert generator.get_level_distribution()[1] == 512
@@ -0,0 +1,72 @@
+# was developed by Utkin Kirill
+
+import pytest
+
+from Common.Exceptions.Exceptions import MaximumLevelException
+from IPv6Gene.Generator.Helper import Helper
+from IPv6Gene.Trie.Trie import Trie
+from tests import reference
+
+TRIE_VARIANTS = [
+    dict(),
+    dict(compact=True),
+    dict(path_compression=True),
+    dict(compact=True, path_compression=True),
+]
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_empty_trie_histograms(trie_variant):
+    binary_trie = Trie(Help=Helper(), max_possible_level=64, **trie_variant)
+
+    assert not any(binary_trie.full_prefix_nodes.values())
+    assert {depth: leafs_num for depth, leafs_num in binary_trie.prefix_leaf_nodes.items() if leafs_num} == {0: 1}
+    assert binary_trie.trie_depth == 0
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_histograms_after_inserts(seed_prefixes, trie_variant, reverse):
+    binary_trie = Trie(Help=Helper(), max_possible_level=64, **trie_variant)
+
+    for prefix_num, prefix in enumerate(sorted(seed_prefixes, key=lambda prefix: prefix[1], reverse=reverse), 1):
+        binary_trie.add_node(*prefix)
+
+        # histograms are maintained by every insert, so they can be read at any time
+        if prefix_num % 100 == 0:
+            reference.check_histograms(binary_trie)
+
+    reference.check_histograms(binary_trie)
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_histograms_after_failed_inserts(seed_prefixes, trie_variant):
+    binary_trie = Trie(Help=Helper(), max_possible_level=64, **trie_variant)
+    binary_trie.bulk_load(seed_prefixes)
+    binary_trie.max_possible_level = binary_trie.trie_level
+
+    for value, prefix_len in seed_prefixes:
+        if prefix_len <= 56:
+            try:
+                binary_trie.add_node((value << 8) | 0xAB, prefix_len + 8, creating_phase=False)
+            except MaximumLevelException:
+                pass
+
+    reference.check_histograms(binary_trie)
+
+
+@pytest.mark.parametrize('generator_variant', [dict(), dict(compact_trie=True), dict(path_compression=True),
+                                               dict(workers=2), dict(bulk=True)])
+def test_ipv6gene_histograms_after_generating(create_ipv6gene, generator_variant):
+    generator = create_ipv6gene(**generator_variant)
+    generator.start_generating()
+
+    reference.check_histograms(generator._binary_trie)
+
+
+@pytest.mark.parametrize('generator_variant', [dict(), dict(compact_trie=True)])
+def test_v6gene_histograms_after_generating(create_v6gene, generator_variant):
+    generator = create_v6gene(**generator_variant)
+    generator.start_generating()
+
+    reference.check_histograms(generator._binary_trie)
@@ -0,0 +1,109 @@
+# was developed by Utkin Kirill
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+from Common.Exceptions.Exceptions import MaximumLevelException, PrefixAlreadyExists
+from Common.Metrics.Metrics import Metrics
+from IPv6Gene.Generator.Helper import Helper
+from IPv6Gene.Trie.Trie import Trie
+from tests import reference
+
+
+def test_phase_time_is_added():
+    metrics = Metrics()
+
+    with metrics.measure('random'):
+        sum(range(100000))
+
+    first_time = dict(metrics.phases['random'])
+
+    with pytest.raises(ValueError):
+        with metrics.measure('random'):
+            raise ValueError
+
+    assert metrics.phases['random']['wall_time'] >= first_time['wall_time'] > 0
+    assert metrics.phases['random']['cpu_time'] >= first_time['cpu_time']
+    assert metrics.get_wall_time() >= metrics.phases['random']['wall_time']
+
+
+def test_exceptions_are_grouped():
+    metrics = Metrics()
+    metrics.count_exception(PrefixAlreadyExists(), 1, 48)
+    metrics.count_exception(PrefixAlreadyExists(), 1, 48, 3)
+    metrics.count_exception(PrefixAlreadyExists(), 2, 48)
+    metrics.count_exception(MaximumLevelException(), 1, 40)
+    metrics.exhausted_parents[2] += 5
+
+    metrics_dict = json.loads(json.dumps(metrics.to_dict()))
+
+    assert metrics_dict['exceptions'] == {'MaximumLevelException': {'1': {'40': 1}},
+                                          'PrefixAlreadyExists': {'1': {'48': 4}, '2': {'48': 1}}}
+    assert metrics_dict['exhausted_parents'] == {'2': 5}
+
+
+def test_counters_are_merged():
+    metrics = Metrics(nodes_allocated=10)
+    metrics.count_exception(PrefixAlreadyExists(), 1, 48)
+
+    with metrics.measure('random'):
+        pass
+
+    worker_metrics = Metrics(nodes_allocated=5)
+    worker_metrics.count_exception(PrefixAlreadyExists(), 1, 48, 2)
+    worker_metrics.exhausted_parents[0] += 1
+
+    with worker_metrics.measure('traversal'):
+        pass
+
+    metrics.merge(worker_metrics)
+
+    assert metrics.nodes_allocated == 15
+    assert metrics.exceptions == {('PrefixAlreadyExists', 1, 48): 3}
+    assert metrics.exhausted_parents == {0: 1}
+    # phases of workers are measured by the main process
+    assert set(metrics.phases) == {'random'}
+
+
+@pytest.mark.parametrize('trie_variant', [dict(), dict(compact=True), dict(path_compression=True)])
+def test_allocated_nodes_are_counted(seed_prefixes, trie_variant):
+    binary_trie = Trie(Help=Helper(), max_possible_level=64, **trie_variant)
+
+    for prefix in sorted(seed_prefixes, key=lambda prefix: prefix[1]):
+        binary_trie.add_node(*prefix)
+
+    # nodes aren't deleted while seed prefixes are added, root node is created with the trie
+    assert binary_trie.metrics.nodes_allocated == len(reference.walk_nodes(binary_trie.root_node)) - 1
+
+
+def test_generator_metrics(create_ipv6gene, create_v6gene):
+    for generator in (create_ipv6gene(), create_v6gene()):
+        generator.start_generating()
+        metrics_dict = generator.metrics.to_dict()
+
+        assert {'construct', 'random', 'traversal', 'convert'} <= set(metrics_dict['phases'])
+        assert metrics_dict['nodes_allocated'] >= len(reference.walk_nodes(generator._binary_trie.root_node)) - 1
+        assert set(metrics_dict['exceptions']) <= {'PrefixAlreadyExists', 'MaximumLevelException'}
+
+
+def test_metrics_are_saved_by_cli(tmp_path, repository_dir, seed_file, depth_distribution):
+    metrics_path = str(tmp_path / 'metrics.json')
+    depth_distribution_path = str(tmp_path / 'depth_distribution.in')
+
+    with open(depth_distribution_path, 'w') as file:
+        file.write(',\n'.join(f'{depth}:{prefixes_num}' for depth, prefixes_num in depth_distribution.items()))
+
+    arguments = [sys.executable, os.path.join(repository_dir, 'IPv6Gene.py'), '--input', seed_file,
+                 '--prefix_quantity', str(sum(depth_distribution.values())), '--max_level', '5',
+                 '--depth_distribution_path', depth_distribution_path, '--seed', '1', '--metrics_out', metrics_path]
+    subprocess.run(arguments, cwd=repository_dir, stdout=subprocess.PIPE, check=True)
+
+    with open(metrics_path) as file:
+        metrics_dict = json.load(file)
+
+    assert {'parse', 'construct', 'output'} <= set(metrics_dict['phases'])
+    assert metrics_dict['nodes_allocated'] > 0
+    assert metrics_dict['wall_time'] >= sum(phase['wall_time'] for phase in metrics_dict['phases'].values())
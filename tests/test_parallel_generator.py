@@ -0,0 +1,38 @@
+# was developed by Utkin Kirill
+
+import pytest
+
+from Common.Abstract.AbstractTrie import AbstractTrie
+from IPv6Gene.Generator.ParallelGenerator import ParallelGenerator
+from tests import reference
+
+
+def test_output_does_not_depend_on_workers(create_ipv6gene):
+    assert create_ipv6gene(workers=3).start_generating() == create_ipv6gene(workers=2).start_generating()
+
+
+def test_merged_trie_is_consistent(create_ipv6gene, depth_distribution):
+    generator = create_ipv6gene(workers=2)
+    generator.start_generating()
+    binary_trie = generator._binary_trie
+
+    assert generator.get_depth_distribution() == depth_distribution
+
+    reference.check_levels(binary_trie)
+    reference.check_prefix_parents(binary_trie)
+
+    # random phase collects occupied prefixes before worker nodes are merged
+    prefixes = list(AbstractTrie.iterate_prefixes(binary_trie.root_node))
+
+    for prefix_len in range(binary_trie.trie_depth + 1):
+        assert binary_trie.get_occupied_prefixes(prefix_len) == \
+               sorted(value for value, value_len in prefixes if value_len == prefix_len)
+
+
+def test_quota_is_split_by_weights_and_capacities():
+    assert ParallelGenerator.split_quota(10, {1: 1, 2: 1, 3: 2}, {1: 10, 2: 10, 3: 10}) == {1: 3, 2: 2, 3: 5}
+    # prefixes which exceed capacity are moved to other blocks
+    assert ParallelGenerator.split_quota(10, {1: 1, 2: 1, 3: 8}, {1: 10, 2: 10, 3: 4}) == {1: 3, 2: 3, 3: 4}
+
+    with pytest.raises(ValueError):
+        ParallelGenerator.split_quota(10, {1: 1, 2: 1}, {1: 4, 2: 5})
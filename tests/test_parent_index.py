@@ -0,0 +1,87 @@
+# was developed by Utkin Kirill
+
+import pytest
+
+from Common.Exceptions.Exceptions import MaximumLevelException
+from IPv6Gene.Generator.Helper import Helper
+from IPv6Gene.Trie.ParentIndex import ParentIndex
+from IPv6Gene.Trie.Trie import Trie
+from tests import reference
+
+
+@pytest.fixture
+def seed_trie(seed_prefixes) -> Trie:
+    seed_trie = Trie(Help=Helper(), max_possible_level=64)
+    seed_trie.bulk_load(seed_prefixes)
+    seed_trie.max_possible_level = seed_trie.trie_level
+
+    return seed_trie
+
+
+def get_prefix_nodes(binary_trie: Trie) -> list:
+    return [(node, prefix) for node, prefix, _ in reference.walk_nodes(binary_trie.root_node)[1:] if node.prefix_flag]
+
+
+@pytest.mark.parametrize('max_level_increase', [0, 1])
+def test_headroom_follows_levels_of_prefix_path(seed_trie, seed_prefixes, max_level_increase):
+    seed_trie.max_possible_level += max_level_increase
+    parents = reference.get_prefix_parents(seed_prefixes)
+    levels = reference.get_levels(seed_prefixes)
+    headroom_nodes = 0
+
+    for node, prefix in get_prefix_nodes(seed_trie):
+        prefix_path = [prefix]
+
+        while parents[prefix_path[-1]] is not None:
+            prefix_path.append(parents[prefix_path[-1]])
+
+        # new leaf raises level of the n-th prefix on the path to at least n + 1
+        expected_headroom = all(levels[path_prefix] >= position + 1 or position + 1 <= seed_trie.max_possible_level
+                                for position, path_prefix in enumerate(prefix_path))
+
+        assert ParentIndex.has_headroom(seed_trie, node) == expected_headroom
+        assert expected_headroom or len(prefix_path) > seed_trie.max_possible_level
+
+        headroom_nodes += expected_headroom
+
+    # some nodes are skipped just for the maximum level of the trie
+    assert 0 < headroom_nodes
+    assert max_level_increase or headroom_nodes < len(seed_prefixes)
+
+
+def test_leaf_is_added_just_under_node_with_headroom(seed_trie):
+    # new leaf has the node as the nearest prefix parent
+    leaf_parents = [(node, prefix) for node, prefix in get_prefix_nodes(seed_trie)
+                    if prefix[1] < 64 and node.left_child is None]
+    headroom_parents = [prefix for node, prefix in leaf_parents if ParentIndex.has_headroom(seed_trie, node)]
+
+    assert 20 <= len(headroom_parents) < len(leaf_parents)
+
+    # failed insert doesn't change the trie, so leaf is added to the seed trie
+    for node, (value, prefix_len) in leaf_parents:
+        if not ParentIndex.has_headroom(seed_trie, node):
+            with pytest.raises(MaximumLevelException):
+                seed_trie.add_node(value << 1, prefix_len + 1, creating_phase=False)
+
+    for value, prefix_len in headroom_parents[::len(headroom_parents) // 20]:
+        seed_trie.clone().add_node(value << 1, prefix_len + 1, creating_phase=False)
+
+
+def test_index_contains_nodes_with_headroom(seed_trie):
+    nodes = [node for node, _ in get_prefix_nodes(seed_trie)]
+    parent_index = ParentIndex.create(seed_trie, nodes)
+
+    assert [node.depth for node in parent_index.nodes] == \
+           [node.depth for node in nodes if ParentIndex.has_headroom(seed_trie, node)]
+
+
+def test_removed_node_is_replaced_by_last_node():
+    parent_index = ParentIndex(['first', 'second', 'third', 'fourth'])
+
+    parent_index.remove(1)
+    assert parent_index.nodes == ['first', 'fourth', 'third']
+
+    parent_index.remove(2)
+    assert parent_index.nodes == ['first', 'fourth']
+    assert len(parent_index) == 2
+    assert parent_index[1] == 'fourth'
@@ -0,0 +1,60 @@
+# was developed by Utkin Kirill
+
+import pytest
+
+from Common.Abstract.AbstractTrie import AbstractTrie
+from IPv6Gene.Generator.Helper import Helper
+from IPv6Gene.Trie.Trie import Trie
+
+
+def create_trie(prefixes, **kwargs) -> Trie:
+    binary_trie = Trie(Help=Helper(), max_possible_level=64, **kwargs)
+
+    for prefix in sorted(prefixes, key=lambda prefix: prefix[1]):
+        binary_trie.add_node(*prefix)
+
+    return binary_trie
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_compressed_trie_contains_same_prefixes(seed_prefixes, compact):
+    binary_trie = create_trie(seed_prefixes)
+    compressed_trie = create_trie(seed_prefixes, compact=compact, path_compression=True)
+
+    assert (list(AbstractTrie.iterate_prefixes(compressed_trie.root_node)) ==
+            list(AbstractTrie.iterate_prefixes(binary_trie.root_node)))
+    assert compressed_trie.level_nodes == binary_trie.level_nodes
+    assert compressed_trie.trie_depth == binary_trie.trie_depth
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_internal_nodes_are_compressed(seed_prefixes, compact):
+    compressed_trie = create_trie(seed_prefixes, compact=compact, path_compression=True)
+    node_stack = [compressed_trie.root_node.left_child, compressed_trie.root_node.right_child]
+
+    while node_stack:
+        node = node_stack.pop()
+
+        if node is None:
+            continue
+
+        # node which isn't prefix node is kept just if it splits the path
+        assert node.prefix_flag or (node.left_child is not None and node.right_child is not None)
+
+        node_stack.extend((node.left_child, node.right_child))
+
+
+def test_ipv6gene_compressed_trie_generates_same_prefixes(create_ipv6gene):
+    generator = create_ipv6gene()
+    compressed_generator = create_ipv6gene(path_compression=True)
+
+    assert compressed_generator.start_generating() == generator.start_generating()
+    assert compressed_generator.get_level_distribution() == generator.get_level_distribution()
+
+
+def test_v6gene_compressed_trie_generates_same_prefixes(create_v6gene):
+    generator = create_v6gene()
+    compressed_generator = create_v6gene(path_compression=True)
+
+    assert compressed_generator.start_generating() == generator.start_generating()
+    assert compressed_generator.get_level_distribution() == generator.get_level_distribution()
@@ -0,0 +1,92 @@
+# was developed by Utkin Kirill
+
+import random
+import pytest
+
+from Common.Random.RandomStream import RandomStream
+
+
+def get_values(stream: RandomStream, values_num: int = 100) -> list:
+    return [stream.getrandbits(64) for _ in range(values_num)]
+
+
+def test_stream_is_identified_by_seed_and_key():
+    values = get_values(RandomStream(1, (2, 3)))
+
+    assert get_values(RandomStream.create(1, 2, 3)) == values
+    assert get_values(RandomStream(1, (2, 4))) != values
+    assert get_values(RandomStream(2, (2, 3))) != values
+    # values are taken from buffer of generated words, buffer refill doesn't change values
+    assert get_values(RandomStream(1, (2, 3)), RandomStream.BUFFER_SIZE + 100)[:100] == values
+
+
+def test_spawned_stream_does_not_depend_on_used_values():
+    stream = RandomStream(1, (2,))
+    child_values = get_values(stream.spawn(3))
+    generator_values = stream.get_generator().integers(0, 1 << 32, 100).tolist()
+
+    get_values(stream, 10)
+
+    assert get_values(stream.spawn(3)) == child_values
+    assert get_values(RandomStream(1, (2, 3))) == child_values
+    assert stream.get_generator().integers(0, 1 << 32, 100).tolist() == generator_values
+
+
+@pytest.mark.parametrize('bits_num', [0, 1, 7, 63, 64, 65, 128])
+def test_random_bits_have_requested_width(bits_num):
+    stream = RandomStream(1)
+    values = [stream.getrandbits(bits_num) for _ in range(2000)]
+
+    assert all(0 <= value < 1 << bits_num for value in values)
+
+    if bits_num:
+        # the highest bit is set in about half of values
+        assert any(value >> (bits_num - 1) for value in values)
+
+
+def test_random_integers_cover_interval():
+    stream = RandomStream(1)
+    values = [stream.randint(-3, 5) for _ in range(2000)]
+
+    assert set(values) == set(range(-3, 6))
+    assert stream.randint(7, 7) == 7
+
+
+@pytest.mark.parametrize('values_num', [1, 2, 8, 9, 1 << 16])
+def test_random_integers_use_fewest_bits(monkeypatch, values_num):
+    stream = RandomStream(1)
+    drawn_bits = list()
+    getrandbits = stream.getrandbits
+
+    def count_bits(bits_num: int) -> int:
+        drawn_bits.append(bits_num)
+        return getrandbits(bits_num)
+
+    monkeypatch.setattr(stream, 'getrandbits', count_bits)
+    values = [stream.randint(10, 10 + values_num - 1) for _ in range(1000)]
+    bits_num = (values_num - 1).bit_length()
+
+    assert all(10 <= value < 10 + values_num for value in values)
+    assert set(drawn_bits) <= {bits_num}
+
+    if values_num & (values_num - 1) == 0:
+        # values of interval with power of two values are never rejected, single value doesn't need any bits
+        assert len(drawn_bits) == (1000 if bits_num else 0)
+
+    else:
+        # (1 << bits_num) / values_num draws are expected for one value
+        assert len(drawn_bits) < 1000 * (1 << bits_num) / values_num * 1.1
+
+
+def test_random_module_is_used_without_seed():
+    assert RandomStream.create(None, RandomStream.RANDOM_PHASE) is random
+
+
+def test_seeded_generators_do_not_use_random_module(create_ipv6gene, create_v6gene):
+    for create_generator in (create_ipv6gene, create_v6gene):
+        random.seed(1)
+        prefixes = create_generator().start_generating()
+        random.seed(2)
+
+        assert create_generator().start_generating() == prefixes
+        assert create_generator(seed=2).start_generating() != prefixes
@@ -0,0 +1,134 @@
+# was developed by Utkin Kirill
+
+import copy
+import os
+import pytest
+
+from array import array
+from Common.Trie.Compact.OverlayColumn import OverlayColumn
+from Common.Trie.Compact.Snapshot import Snapshot
+from IPv6Gene.Generator.Helper import Helper
+from IPv6Gene.Trie.Trie import Trie
+from tests import reference
+
+COMPACT_VARIANTS = [
+    dict(compact=True),
+    dict(compact=True, path_compression=True),
+]
+
+
+def create_seed_trie(seed_prefixes, **kwargs) -> Trie:
+    seed_trie = Trie(Help=Helper(), max_possible_level=64, **kwargs)
+    seed_trie.bulk_load(seed_prefixes)
+
+    return seed_trie
+
+
+def get_organisation_nodes(binary_trie: Trie) -> dict:
+    return {org_level: [node.index for node in nodes] for org_level, nodes in binary_trie.nodes.items()}
+
+
+@pytest.mark.parametrize('trie_variant', COMPACT_VARIANTS)
+def test_snapshot_contains_same_trie(tmp_path, seed_prefixes, trie_variant):
+    snapshot_path = str(tmp_path / 'seed.trie')
+    seed_trie = create_seed_trie(seed_prefixes, **trie_variant)
+    seed_trie.save_snapshot(snapshot_path, seed_prefixes)
+
+    loaded_trie = Trie(Help=Helper(), max_possible_level=64, **trie_variant)
+    loaded_trie.load_snapshot(snapshot_path)
+
+    assert reference.get_state(loaded_trie) == reference.get_state(seed_trie)
+    assert get_organisation_nodes(loaded_trie) == get_organisation_nodes(seed_trie)
+
+
+def test_snapshot_is_used_just_for_same_compact_trie(tmp_path, seed_prefixes):
+    snapshot_path = str(tmp_path / 'seed.trie')
+
+    with pytest.raises(ValueError):
+        create_seed_trie(seed_prefixes).save_snapshot(snapshot_path, seed_prefixes)
+
+    create_seed_trie(seed_prefixes, compact=True).save_snapshot(snapshot_path, seed_prefixes)
+
+    with pytest.raises(ValueError):
+        Trie(Help=Helper()).load_snapshot(snapshot_path)
+
+    with pytest.raises(ValueError):
+        Trie(Help=Helper(), compact=True, path_compression=True).load_snapshot(snapshot_path)
+
+    with open(snapshot_path, 'r+b') as file:
+        file.write(b'NOTRIE')
+
+    with pytest.raises(ValueError):
+        Trie(Help=Helper(), compact=True).load_snapshot(snapshot_path)
+
+
+def test_snapshot_path_depends_on_seed_content(tmp_path, seed_file):
+    other_seed_file = tmp_path / 'seed'
+    other_seed_file.write_text('2001:db8::/32\n')
+
+    snapshot_path = Snapshot.get_snapshot_path(str(tmp_path), seed_file, False)
+
+    assert Snapshot.get_snapshot_path(str(tmp_path), seed_file, False) == snapshot_path
+    assert Snapshot.get_snapshot_path(str(tmp_path), seed_file, True) != snapshot_path
+    assert Snapshot.get_snapshot_path(str(tmp_path), str(other_seed_file), False) != snapshot_path
+
+
+def test_generators_use_snapshot(tmp_path, create_ipv6gene, create_v6gene):
+    for name, create_generator in (('ipv6gene', create_ipv6gene), ('v6gene', create_v6gene)):
+        snapshot_path = str(tmp_path / f'{name}.trie')
+        prefixes = create_generator().start_generating()
+
+        # snapshot is created by the first generator and loaded by the second one
+        assert create_generator(seed_snapshot=snapshot_path).start_generating() == prefixes
+        assert os.path.exists(snapshot_path)
+        assert create_generator(seed_snapshot=snapshot_path).start_generating() == prefixes
+
+
+@pytest.mark.parametrize('trie_variant', COMPACT_VARIANTS)
+def test_mapped_snapshot_contains_same_trie(tmp_path, seed_prefixes, trie_variant):
+    snapshot_path = str(tmp_path / 'seed.trie')
+    seed_trie = create_seed_trie(seed_prefixes, **trie_variant)
+    seed_trie.save_snapshot(snapshot_path, seed_prefixes)
+
+    mapped_trie = Trie(Help=Helper(), max_possible_level=64, **trie_variant)
+    mapped_trie.load_snapshot(snapshot_path, memory_map=True)
+
+    assert isinstance(mapped_trie.storage.depth, OverlayColumn)
+    assert reference.get_state(mapped_trie) == reference.get_state(seed_trie)
+    assert get_organisation_nodes(mapped_trie) == get_organisation_nodes(seed_trie)
+
+
+def test_mapped_snapshot_file_is_not_changed(tmp_path, create_ipv6gene, create_v6gene):
+    for name, create_generator in (('ipv6gene', create_ipv6gene), ('v6gene', create_v6gene)):
+        snapshot_path = str(tmp_path / f'{name}.trie')
+        prefixes = create_generator().start_generating()
+        create_generator(seed_snapshot=snapshot_path)
+
+        with open(snapshot_path, 'rb') as file:
+            snapshot_data = file.read()
+
+        # levels of seed nodes are changed and new nodes are added while prefixes are generated
+        assert create_generator(seed_snapshot=snapshot_path, memory_map=True).start_generating() == prefixes
+
+        with open(snapshot_path, 'rb') as file:
+            assert file.read() == snapshot_data
+
+
+def test_overlay_column_keeps_mapped_values():
+    mapped_values = array('i', [1, 2, 3])
+    column = OverlayColumn(memoryview(mapped_values), 'i')
+
+    column.append(4)
+    column[3] = 5
+    column[0] = 0
+
+    assert len(column) == 4
+    assert list(column) == [0, 2, 3, 5]
+    assert copy.copy(column) == array('i', [0, 2, 3, 5])
+    # mapped values are changed in place (in private copy-on-write pages), appended values are saved in private array
+    assert mapped_values == array('i', [0, 2, 3])
+
+
+def test_mapped_snapshot_is_not_used_by_workers(tmp_path, create_ipv6gene):
+    with pytest.raises(ValueError):
+        create_ipv6gene(seed_snapshot=str(tmp_path / 'seed.trie'), memory_map=True, workers=2)
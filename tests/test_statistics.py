@@ -0,0 +1,101 @@
+# was developed by Utkin Kirill
+
+import collections
+import csv
+import json
+import os
+import pytest
+import statistics
+
+from Common.BitMatrix.BitMatrix import BitMatrix
+from V6Gene.Trie.Trie import Trie
+from tests import reference
+
+DATASET_NAME = 'dataset2007'
+
+
+@pytest.fixture
+def seed_report(seed_prefixes) -> dict:
+    binary_trie = Trie()
+    binary_trie.bulk_load(seed_prefixes)
+
+    return statistics.create_report(binary_trie.full_prefix_nodes, binary_trie.level_nodes, seed_prefixes)
+
+
+def test_report_of_seed_prefixes(seed_prefixes, seed_report):
+    depths = collections.Counter(prefix_len for _, prefix_len in seed_prefixes)
+    levels = seed_report['level_distribution']
+    bit_matrix = BitMatrix.create(seed_prefixes)
+
+    assert seed_report['depth_distribution'] == {depth: depths[depth] for depth in range(65)}
+    assert {level: prefixes_num for level, prefixes_num in levels.items() if prefixes_num} == \
+        reference.get_level_histogram(seed_prefixes)
+    assert list(seed_report['bit_1_distribution'].values()) == bit_matrix.get_position_frequency(1).tolist()
+    assert list(seed_report['bit_0_distribution'].values()) == bit_matrix.get_position_frequency(0).tolist()
+
+
+def test_report_of_generated_prefixes(create_ipv6gene):
+    generator = create_ipv6gene()
+    generator.start_generating()
+    binary_trie = generator._binary_trie
+    prefixes = list(generator.iterate_prefixes())
+
+    report = statistics.create_report(binary_trie.full_prefix_nodes, binary_trie.level_nodes)
+
+    assert report['depth_distribution'] == {depth: generator.get_depth_distribution().get(depth, 0)
+                                            for depth in range(65)}
+    assert {level: prefixes_num for level, prefixes_num in report['level_distribution'].items() if prefixes_num} == \
+        reference.get_level_histogram(prefixes)
+    assert 'bit_1_distribution' not in report
+
+
+def test_report_contains_all_levels():
+    # every prefix covers the next one, so levels are 0 - 9
+    prefixes = [(0x2001 << (depth - 16), depth) for depth in range(16, 26)]
+    binary_trie = Trie(max_possible_level=64)
+    binary_trie.bulk_load(prefixes)
+
+    report = statistics.create_report(binary_trie.full_prefix_nodes, binary_trie.level_nodes)
+
+    assert report['level_distribution'] == {level: 1 for level in range(10)}
+
+
+def test_json_report_is_saved(tmp_path, monkeypatch, seed_report):
+    monkeypatch.chdir(tmp_path)
+    path = statistics.save_report(seed_report, DATASET_NAME, 'json')
+
+    with open(path) as file:
+        saved_report = json.load(file)
+
+    assert path == f'statistics/{DATASET_NAME}/report.json'
+    assert saved_report == {distribution_name: {str(key): value for key, value in distribution.items()}
+                            for distribution_name, distribution in seed_report.items()}
+
+
+def test_csv_report_is_saved(tmp_path, monkeypatch, seed_report):
+    monkeypatch.chdir(tmp_path)
+    path = statistics.save_report(seed_report, DATASET_NAME, 'csv')
+
+    with open(path, newline='') as file:
+        rows = list(csv.reader(file))
+
+    assert rows[0] == ['distribution', 'key', 'value']
+    assert rows[1:] == [[distribution_name, str(key), str(value)]
+                        for distribution_name, distribution in seed_report.items()
+                        for key, value in distribution.items()]
+
+
+def test_graphs_are_rendered_just_when_requested(tmp_path, monkeypatch, seed_prefixes, seed_report):
+    monkeypatch.chdir(tmp_path)
+    output_dir = os.path.join('statistics', DATASET_NAME)
+
+    report = statistics.create_stats(seed_report['depth_distribution'], seed_report['level_distribution'],
+                                     DATASET_NAME, seed_prefixes, 'json', graph=False)
+
+    assert report == seed_report
+    assert os.listdir(output_dir) == ['report.json']
+
+    statistics.render_graphs(report, DATASET_NAME, dpi=20)
+
+    assert sorted(os.listdir(output_dir)) == ['bit_distribution.png', 'depth_distribution.png',
+                                              'level_distribution.png', 'report.json']
@@ -0,0 +1,215 @@
+# was developed by Utkin Kirill
+
+import collections
+import pytest
+
+from Common.Abstract.AbstractTrie import AbstractTrie
+from Common.Converter.Converter import Converter
+from Common.Exceptions.Exceptions import MaximumLevelException, NoFreePrefixException, PrefixAlreadyExists
+from Common.Random.RandomStream import RandomStream
+from IPv6Gene.Generator.Helper import Helper
+from IPv6Gene.Trie.Trie import Trie
+from tests import reference
+
+TRIE_VARIANTS = [
+    dict(),
+    dict(compact=True),
+    dict(path_compression=True),
+    dict(compact=True, path_compression=True),
+]
+
+GENERATOR_VARIANTS = [
+    dict(),
+    dict(compact_trie=True),
+    dict(path_compression=True),
+]
+
+
+def create_trie(prefixes, **kwargs) -> Trie:
+    binary_trie = Trie(Help=Helper(), max_possible_level=64, **kwargs)
+
+    for prefix in sorted(prefixes, key=lambda prefix: prefix[1]):
+        binary_trie.add_node(*prefix)
+
+    return binary_trie
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_levels_after_inserts(seed_prefixes, trie_variant):
+    reference.check_levels(create_trie(seed_prefixes, **trie_variant))
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_levels_after_inserts_above_existing_prefixes(seed_prefixes, trie_variant):
+    # the longest prefixes are added first, so levels of existing prefixes are raised by every shorter prefix
+    binary_trie = Trie(Help=Helper(), max_possible_level=64, **trie_variant)
+
+    for prefix in sorted(seed_prefixes, key=lambda prefix: prefix[1], reverse=True):
+        binary_trie.add_node(*prefix)
+
+    reference.check_levels(binary_trie)
+
+
+@pytest.mark.parametrize('generator_variant', GENERATOR_VARIANTS)
+def test_levels_after_generating(create_ipv6gene, generator_variant):
+    generator = create_ipv6gene(**generator_variant)
+    generator.start_generating()
+
+    reference.check_levels(generator._binary_trie)
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_prefix_parents_after_inserts(seed_prefixes, trie_variant):
+    reference.check_prefix_parents(create_trie(seed_prefixes, **trie_variant))
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_prefix_parents_after_inserts_above_existing_prefixes(seed_prefixes, trie_variant):
+    binary_trie = Trie(Help=Helper(), max_possible_level=64, **trie_variant)
+
+    for prefix in sorted(seed_prefixes, key=lambda prefix: prefix[1], reverse=True):
+        binary_trie.add_node(*prefix)
+
+    reference.check_prefix_parents(binary_trie)
+
+
+@pytest.mark.parametrize('generator_variant', GENERATOR_VARIANTS)
+def test_prefix_parents_after_generating(create_ipv6gene, generator_variant):
+    generator = create_ipv6gene(**generator_variant)
+    generator.start_generating()
+
+    reference.check_prefix_parents(generator._binary_trie)
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_failed_insert_does_not_change_trie(seed_prefixes, trie_variant):
+    binary_trie = create_trie(seed_prefixes, **trie_variant)
+    binary_trie.max_possible_level = binary_trie.trie_level
+
+    parents = reference.get_prefix_parents(seed_prefixes)
+    covering_prefixes = set(parents.values())
+
+    def get_path_len(prefix) -> int:
+        return 1 + (get_path_len(parents[prefix]) if parents[prefix] else 0)
+
+    # new prefix under the leaf prefix of the longest prefix path would raise level of the top prefix above maximum
+    leaf_value, leaf_len = next(prefix for prefix in seed_prefixes if prefix not in covering_prefixes and
+                                prefix[1] <= 56 and get_path_len(prefix) == binary_trie.trie_level + 1)
+    state = reference.get_state(binary_trie)
+
+    with pytest.raises(MaximumLevelException):
+        binary_trie.add_node((leaf_value << 8) | 0xAB, leaf_len + 8, creating_phase=False)
+
+    assert reference.get_state(binary_trie) == state
+
+    with pytest.raises(PrefixAlreadyExists):
+        binary_trie.add_node(leaf_value, leaf_len, creating_phase=False)
+
+    assert reference.get_state(binary_trie) == state
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_prefixes_are_iterated_in_address_order(seed_prefixes, trie_variant):
+    binary_trie = create_trie(seed_prefixes, **trie_variant)
+    prefixes = list(AbstractTrie.iterate_prefixes(binary_trie.root_node))
+
+    assert prefixes == sorted(seed_prefixes, key=reference.get_address_key)
+    # iterating doesn't change the trie, so next iterator returns the same prefixes
+    assert list(AbstractTrie.iterate_prefixes(binary_trie.root_node)) == prefixes
+    assert AbstractTrie.get_prefix_nodes(binary_trie.root_node) == prefixes
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_prefixes_of_sub_trie_are_iterated(seed_prefixes, trie_variant):
+    binary_trie = create_trie(seed_prefixes, **trie_variant)
+    nodes = reference.walk_nodes(binary_trie.root_node)
+
+    def get_covered_num(node_prefix) -> int:
+        return sum(reference.is_covered(prefix, node_prefix) for prefix in seed_prefixes)
+
+    # the first internal node in address order which covers several prefixes
+    node, node_prefix, parent_position = next(node for node in nodes[1:]
+                                              if not node[0].prefix_flag and get_covered_num(node[1]) > 2)
+    parent_value, parent_depth = nodes[parent_position][1]
+
+    # prefix lens are counted from the parent node, so the edge to the sub-trie root is included
+    prefixes = [((parent_value << prefix_len) | value, parent_depth + prefix_len)
+                for value, prefix_len in AbstractTrie.iterate_prefixes(node)]
+
+    assert prefixes == sorted((prefix for prefix in seed_prefixes if reference.is_covered(prefix, node_prefix)),
+                              key=reference.get_address_key)
+
+
+@pytest.mark.parametrize('generator_variant', GENERATOR_VARIANTS)
+def test_generated_prefixes_are_iterated(create_ipv6gene, generator_variant):
+    generator = create_ipv6gene(**generator_variant)
+    converted_prefixes = generator.start_generating()
+
+    assert Converter(generator.iterate_prefixes()).convert_prefixes() == converted_prefixes
+    assert Converter(generator.iterate_prefixes()).convert_prefixes() == converted_prefixes
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_bulk_load_is_same_as_inserts(seed_prefixes, trie_variant):
+    binary_trie = create_trie(seed_prefixes, **trie_variant)
+    loaded_trie = Trie(Help=Helper(), max_possible_level=64, **trie_variant)
+    loaded_trie.bulk_load(seed_prefixes)
+
+    assert reference.get_state(loaded_trie) == reference.get_state(binary_trie)
+    assert {org_level: len(nodes) for org_level, nodes in loaded_trie.nodes.items()} == \
+           {org_level: len(nodes) for org_level, nodes in binary_trie.nodes.items()}
+
+    reference.check_prefix_parents(loaded_trie)
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_bulk_load_into_not_empty_trie(seed_prefixes, trie_variant):
+    loaded_trie = Trie(Help=Helper(), max_possible_level=64, **trie_variant)
+    loaded_trie.bulk_load(seed_prefixes[:100])
+    loaded_trie.bulk_load(seed_prefixes[100:])
+
+    assert reference.get_state(loaded_trie)[0] == reference.get_state(create_trie(seed_prefixes, **trie_variant))[0]
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_bulk_load_checks_maximum_level(seed_prefixes, trie_variant):
+    trie_level = create_trie(seed_prefixes, **trie_variant).trie_level
+    loaded_trie = Trie(Help=Helper(), max_possible_level=trie_level - 1, **trie_variant)
+
+    with pytest.raises(MaximumLevelException):
+        loaded_trie.bulk_load(seed_prefixes)
+
+
+# prefixes with len 16 under the prefix with len 12 are sampled, generated prefixes are at least 12 bits long
+SAMPLED_PREFIX = (0x201, 12)
+SAMPLED_VALUES = set(range(0x2010, 0x2020))
+
+
+@pytest.mark.parametrize('trie_variant', TRIE_VARIANTS)
+def test_free_prefixes_are_sampled_until_space_is_full(trie_variant):
+    occupied_values = {0x2011, 0x2017, 0x201F}
+    binary_trie = create_trie([(value, 16) for value in occupied_values | {0x2020}], **trie_variant)
+    rng = RandomStream(1)
+    sampled_values = list()
+
+    for _ in range(len(SAMPLED_VALUES - occupied_values)):
+        value = binary_trie.sample_free_prefix(*SAMPLED_PREFIX, 16, rng)
+        binary_trie.add_node(value, 16, creating_phase=False)
+        sampled_values.append(value)
+
+    assert sorted(sampled_values) == sorted(SAMPLED_VALUES - occupied_values)
+
+    with pytest.raises(NoFreePrefixException):
+        binary_trie.sample_free_prefix(*SAMPLED_PREFIX, 16, rng)
+
+
+def test_free_prefixes_are_sampled_uniformly():
+    occupied_values = {0x2010, 0x2011, 0x2012, 0x2013, 0x2014, 0x2016, 0x201A, 0x201F}
+    binary_trie = create_trie([(value, 16) for value in occupied_values])
+    rng = RandomStream(1)
+
+    counts = collections.Counter(binary_trie.sample_free_prefix(*SAMPLED_PREFIX, 16, rng) for _ in range(16000))
+
+    assert set(counts) == SAMPLED_VALUES - occupied_values
+    # every of 8 free prefixes is expected 2000 times
+    assert all(1700 < count < 2300 for count in counts.values())
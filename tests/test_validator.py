@@ -0,0 +1,48 @@
+# was developed by Utkin Kirill
+
+import ipaddress
+import pytest
+
+from Common.Validator.Validator import InputArgumentsValidator
+
+
+@pytest.fixture
+def seed_lines(seed_file):
+    with open(seed_file) as file:
+        lines = file.read().splitlines()
+
+    # duplicates, invalid addresses and prefixes with not allowed length are pruned by parser
+    return lines + lines[:50] + ['', 'not a prefix', 'zzzz::/32', '2001:db8::/8', '2001:db8::/65', '2001:db8::/64']
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_seed_file_is_parsed_by_chunks(tmp_path, monkeypatch, seed_lines, workers):
+    seed_file = str(tmp_path / 'seed')
+
+    with open(seed_file, 'w') as file:
+        file.write('\n'.join(seed_lines) + '\n')
+
+    networks = set()
+
+    for line in seed_lines:
+        try:
+            network = ipaddress.IPv6Network(line)
+        except ValueError:
+            continue
+
+        if InputArgumentsValidator.MIN_SEED_PREFIX_LEN <= network.prefixlen <= \
+                InputArgumentsValidator.MAX_SEED_PREFIX_LEN:
+            networks.add((int(network.network_address) >> (128 - network.prefixlen), network.prefixlen))
+
+    # several chunks are parsed
+    monkeypatch.setattr(InputArgumentsValidator, 'SEED_CHUNK_SIZE', 1000)
+
+    assert InputArgumentsValidator.read_seed_file(seed_file, workers) == \
+        sorted(networks, key=lambda prefix: (prefix[1], prefix[0]))
+
+
+def test_empty_seed_file_is_parsed(tmp_path):
+    seed_file = tmp_path / 'seed'
+    seed_file.write_text('')
+
+    assert InputArgumentsValidator.read_seed_file(str(seed_file)) == []